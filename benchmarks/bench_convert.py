@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark for the Markdown converters and the executive slide
+
+Generates synthetic corpora (see corpus.py) and times:
+  * each converter on mixed documents of every --sizes size
+  * parsing and rendering of each block type on its own
+  * inline formatting (tokenizing and building runs) on inline-heavy prose
+  * create_executive_slide()
+
+Results are printed and, with --output, saved as JSON; --compare prints the
+speed ratio of each timing against an earlier results file.
+
+    python benchmarks/bench_convert.py --output results.json
+    python benchmarks/bench_convert.py --sizes 100KB --compare results.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import docx  # noqa: E402
+
+from benchmarks.corpus import BLOCK_TYPES, DEFAULT_MIX, parse_size, write_corpus  # noqa: E402
+from mdconvert import docx_render, ooxml_render  # noqa: E402
+from mdconvert.blocks import parse_blocks  # noqa: E402
+from mdconvert.docx_render import DocxRenderer  # noqa: E402
+from mdconvert.stream import stream_markdown  # noqa: E402
+from mdconvert.template import load_template  # noqa: E402
+from mdconvert.themes import THEMES  # noqa: E402
+
+DEFAULT_SIZES = '100KB,10MB,100MB'
+MB = 1024 * 1024
+
+# Largest input each converter is run on by default; the in-memory
+# python-docx path grows superlinearly and would run for hours at 100MB
+CONVERTERS = {
+    'python-docx': (docx_render.convert_markdown, 2 * MB),
+    'python-docx-stream': (stream_markdown, 16 * MB),
+    'ooxml': (ooxml_render.convert_markdown, None),
+}
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def _rate(size, seconds):
+    return round(size / MB / seconds, 3) if seconds else None
+
+
+def bench_converters(sizes, theme, workdir, limits=True):
+    """Time every converter on a mixed corpus of each size"""
+    results = []
+    for size in sizes:
+        md_file = os.path.join(workdir, f'corpus-{size}.md')
+        nbytes = write_corpus(md_file, size, DEFAULT_MIX)
+        entry = {'size': size, 'bytes': nbytes, 'converters': {}}
+        for name, (convert, max_bytes) in CONVERTERS.items():
+            if limits and max_bytes is not None and nbytes > max_bytes:
+                entry['converters'][name] = {'skipped': f'input over {max_bytes // MB}MB limit'}
+                print(f"{nbytes / MB:9.1f} MB  {name:20} skipped")
+                continue
+            docx_file = os.path.join(workdir, f'{name}.docx')
+            seconds, _ = _timed(convert, md_file, docx_file, theme)
+            entry['converters'][name] = {
+                'seconds': round(seconds, 4),
+                'mb_per_s': _rate(nbytes, seconds),
+                'output_bytes': os.path.getsize(docx_file),
+            }
+            print(f"{nbytes / MB:9.1f} MB  {name:20} {seconds:9.3f} s  {_rate(nbytes, seconds):8.2f} MB/s")
+        os.remove(md_file)
+        results.append(entry)
+    return results
+
+
+def bench_blocks(size, theme, workdir):
+    """Time parsing and rendering a corpus made of one block type at a time"""
+    results = {}
+    for kind in BLOCK_TYPES:
+        md_file = os.path.join(workdir, f'{kind}.md')
+        nbytes = write_corpus(md_file, size, {kind: 1})
+        with open(md_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        parse_seconds, blocks = _timed(parse_blocks, content)
+
+        base = load_template(theme)
+        renderer = DocxRenderer(base.document(), theme, base)
+        docx_seconds, _ = _timed(renderer.render, blocks)
+
+        fast = ooxml_render.OoxmlRenderer(theme, base.style_ids, base.width)
+        ooxml_seconds, _ = _timed(fast.render, blocks)
+
+        results[kind] = {
+            'bytes': nbytes,
+            'blocks': len(blocks),
+            'parse_seconds': round(parse_seconds, 4),
+            'python_docx_render_seconds': round(docx_seconds, 4),
+            'ooxml_render_seconds': round(ooxml_seconds, 4),
+        }
+        print(f"{kind:12} {len(blocks):7} blocks  parse {parse_seconds:7.3f} s  "
+              f"python-docx {docx_seconds:7.3f} s  ooxml {ooxml_seconds:7.3f} s")
+        os.remove(md_file)
+    return results
+
+
+def bench_inline(size, theme, workdir):
+    """Time inline formatting of every paragraph in an inline-heavy corpus"""
+    from mdconvert.inline import tokenize_inline
+
+    md_file = os.path.join(workdir, 'inline.md')
+    write_corpus(md_file, size, {'prose': 4, 'asterisks': 1})
+    with open(md_file, 'r', encoding='utf-8') as f:
+        texts = [block.text for block in parse_blocks(f.read()) if block.kind == 'paragraph']
+    os.remove(md_file)
+
+    def tokenize():
+        for text in texts:
+            tokenize_inline(text)
+
+    base = load_template(theme)
+    renderer = DocxRenderer(base.document(), theme, base)
+
+    def docx_runs():
+        for text in texts:
+            renderer.add_inline_runs(renderer.add_paragraph(), text)
+
+    fast = ooxml_render.OoxmlRenderer(theme, base.style_ids, base.width)
+
+    def ooxml_runs():
+        for text in texts:
+            fast.inline_runs(text)
+
+    results = {'paragraphs': len(texts), 'chars': sum(map(len, texts))}
+    for name, fn in (('tokenize', tokenize), ('python_docx_runs', docx_runs), ('ooxml_runs', ooxml_runs)):
+        seconds, _ = _timed(fn)
+        results[f'{name}_seconds'] = round(seconds, 4)
+        print(f"inline {name:18} {seconds:7.3f} s  ({len(texts)} paragraphs)")
+    return results
+
+
+def bench_slide(repeat, workdir):
+    """Time create_executive_slide(), which saves into the working directory"""
+    import create_exec_presentation
+
+    timings = []
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        for _ in range(repeat):
+            with contextlib.redirect_stdout(io.StringIO()):
+                seconds, _ = _timed(create_exec_presentation.create_executive_slide)
+            timings.append(seconds)
+    finally:
+        os.chdir(cwd)
+    print(f"create_executive_slide  best {min(timings):.3f} s  mean {sum(timings) / len(timings):.3f} s")
+    return {'best_seconds': round(min(timings), 4), 'mean_seconds': round(sum(timings) / len(timings), 4),
+            'repeat': repeat}
+
+
+def _meta():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'python_docx': docx.__version__,
+    }
+
+
+def _timings(results, path=()):
+    """Flatten a results dict into {path: seconds} for every *seconds key"""
+    found = {}
+    if isinstance(results, dict):
+        for key, value in results.items():
+            found.update(_timings(value, path + (str(key),)))
+    elif isinstance(results, list):
+        for item in results:
+            label = str(item.get('size', '')) if isinstance(item, dict) else ''
+            found.update(_timings(item, path + (label,)))
+    elif path and path[-1].endswith('seconds') and isinstance(results, (int, float)):
+        found['/'.join(path)] = results
+    return found
+
+
+def compare(old, new):
+    """Print new/old speed ratios for the timings both runs measured"""
+    old_timings, new_timings = _timings(old), _timings(new)
+    print(f"\nCompared with {old.get('meta', {}).get('commit') or 'baseline'} (>1.00x is faster):")
+    for key, seconds in new_timings.items():
+        before = old_timings.get(key)
+        if before and seconds:
+            print(f"  {key:70} {before:9.3f} -> {seconds:9.3f} s  {before / seconds:6.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help=f'corpus sizes (default: {DEFAULT_SIZES})')
+    parser.add_argument('--block-size', default='200KB', help='corpus size per block type')
+    parser.add_argument('--theme', choices=sorted(THEMES), default='cto')
+    parser.add_argument('--slide-repeat', type=int, default=5)
+    parser.add_argument('--no-limits', action='store_true',
+                        help='run every converter on every size, however long it takes')
+    parser.add_argument('--output', help='write results as JSON to this path')
+    parser.add_argument('--compare', help='earlier JSON results to compare against')
+    args = parser.parse_args()
+
+    try:
+        sizes = [parse_size(size) for size in args.sizes.split(',')]
+        block_size = parse_size(args.block_size)
+    except ValueError as e:
+        parser.error(str(e))
+    theme = THEMES[args.theme]
+
+    results = {'meta': _meta(), 'theme': args.theme}
+    with tempfile.TemporaryDirectory(prefix='mdconvert-bench-') as workdir:
+        results['converters'] = bench_converters(sizes, theme, workdir, not args.no_limits)
+        results['blocks'] = bench_blocks(block_size, theme, workdir)
+        results['inline'] = bench_inline(block_size, theme, workdir)
+        results['slide'] = bench_slide(args.slide_repeat, workdir)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare(json.load(f), results)
+
+
+if __name__ == '__main__':
+    main()
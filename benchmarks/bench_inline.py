@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Adversarial-input benchmark for the inline Markdown tokenizer
+
+Times tokenize_inline on delimiter-heavy lines of doubling length and fits the
+growth exponent of time against length (1.0 is linear, 2.0 is quadratic).
+Exits with a non-zero status if any input family exceeds MAX_EXPONENT.
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mdconvert.inline import tokenize_inline
+
+# Headroom over 1.0 absorbs timer noise and cache effects at larger sizes
+MAX_EXPONENT = 1.3
+
+ADVERSARIAL_INPUTS = {
+    'stray asterisks': lambda n: ('a * ' * n)[:n],
+    'asterisk run': lambda n: '*' * n,
+    'unclosed bold': lambda n: ('**a' * n)[:n] + 'x',
+    'mixed delimiters': lambda n: ('*_`a' * n)[:n],
+    'lone backtick': lambda n: '`' + ('a*_' * n)[:n - 1],
+    'underscores': lambda n: ('snake_case ' * n)[:n],
+    'random soup': lambda n: ''.join(random.Random(n).choices('*_`a ', k=n)),
+}
+
+
+def time_tokenize(text, repeat):
+    """Return the best of `repeat` timings for tokenizing text"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        tokenize_inline(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--min-size', type=int, default=20_000, help='shortest line length')
+    parser.add_argument('--doublings', type=int, default=5, help='number of size doublings')
+    parser.add_argument('--repeat', type=int, default=5, help='timings per size (best is kept)')
+    args = parser.parse_args()
+
+    failed = False
+    for name, make in ADVERSARIAL_INPUTS.items():
+        sizes = [args.min_size * 2 ** step for step in range(args.doublings + 1)]
+        timings = [time_tokenize(make(size), args.repeat) for size in sizes]
+        exponent = math.log(timings[-1] / timings[0]) / math.log(sizes[-1] / sizes[0])
+        status = 'ok' if exponent <= MAX_EXPONENT else 'SUPERLINEAR'
+        failed = failed or exponent > MAX_EXPONENT
+        print(f"{name:18} {sizes[-1]:>9,} chars {timings[-1] * 1000:8.2f} ms  "
+              f"growth exponent {exponent:.2f}  {status}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Synthetic Markdown corpus generator for the converter benchmarks
+
+Writes a document of a given size whose blocks are drawn, with a fixed seed,
+from a weighted mix of block types. The output is deterministic for the same
+size, mix and seed, so runs on different commits convert identical input.
+
+    python benchmarks/corpus.py 10MB corpus.md --mix prose=4,table=1,code=1
+"""
+
+import argparse
+import random
+import re
+
+WORDS = (
+    'patient appointment clinic provider claim billing schedule record '
+    'insurance referral telehealth portal audit encounter visit lab result '
+    'prescription pharmacy dashboard module workflow report status review'
+).split()
+LANGS = ('python', 'javascript', 'sql', 'bash', '')
+
+
+def _words(rng, n):
+    return ' '.join(rng.choices(WORDS, k=n))
+
+
+def heading(rng):
+    return f"{'#' * rng.randint(1, 4)} {_words(rng, rng.randint(2, 6)).title()}"
+
+
+def prose(rng):
+    """An inline-heavy paragraph: bold, italic and code spans between words"""
+    parts = []
+    for _ in range(rng.randint(20, 80)):
+        word = rng.choice(WORDS)
+        style = rng.random()
+        if style < 0.1:
+            word = f'**{word}**'
+        elif style < 0.18:
+            word = f'*{word}*'
+        elif style < 0.24:
+            word = f'`{word}()`'
+        elif style < 0.27:
+            word = f'_{word}_'
+        parts.append(word)
+    return ' '.join(parts) + '.'
+
+
+def table(rng):
+    cols = rng.randint(3, 8)
+    lines = ['| ' + ' | '.join(_words(rng, 2).title() for _ in range(cols)) + ' |',
+             '|' + '---|' * cols]
+    for _ in range(rng.randint(5, 40)):
+        lines.append('| ' + ' | '.join(_words(rng, rng.randint(1, 4)) for _ in range(cols)) + ' |')
+    return '\n'.join(lines)
+
+
+def code(rng):
+    lines = [f'```{rng.choice(LANGS)}']
+    for _ in range(rng.randint(5, 30)):
+        indent = '    ' * rng.randint(0, 3)
+        lines.append(f'{indent}{rng.choice(WORDS)}_{rng.randint(0, 99)} = {rng.choice(WORDS)}(a < b && c > d)')
+    lines.append('```')
+    return '\n'.join(lines)
+
+
+def nested_list(rng):
+    lines = []
+    level = 0
+    for i in range(rng.randint(3, 15)):
+        level = max(0, min(3, level + rng.choice((-1, 0, 0, 1))))
+        marker = rng.choice(('-', '-', '*', '+', '✅', f'{i + 1}.'))
+        lines.append(f"{'  ' * level}{marker} {prose(rng) if rng.random() < 0.2 else _words(rng, 6)}")
+    return '\n'.join(lines)
+
+
+def asterisks(rng):
+    """Pathological emphasis: stray and unbalanced delimiters"""
+    return ''.join(rng.choices(('a ', '* ', '** ', '***', '_', '`', 'b', ' '), k=rng.randint(100, 400)))
+
+
+def quote(rng):
+    return f'> {prose(rng)}'
+
+
+def metadata(rng):
+    return f'**{_words(rng, 2).title()}:** {_words(rng, rng.randint(1, 8))}'
+
+
+def rule(rng):
+    return '---'
+
+
+BLOCK_TYPES = {
+    'heading': heading,
+    'prose': prose,
+    'table': table,
+    'code': code,
+    'nested_list': nested_list,
+    'asterisks': asterisks,
+    'quote': quote,
+    'metadata': metadata,
+    'rule': rule,
+}
+
+DEFAULT_MIX = {
+    'heading': 1,
+    'prose': 6,
+    'table': 1,
+    'code': 1,
+    'nested_list': 2,
+    'asterisks': 0.5,
+    'quote': 0.5,
+    'metadata': 0.5,
+    'rule': 0.2,
+}
+
+_SIZE_RE = re.compile(r'(\d+(?:\.\d+)?)\s*([KMG]?)B?', re.IGNORECASE)
+_UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+
+
+def parse_size(text):
+    """Parse '100KB', '10MB' or a plain byte count into bytes"""
+    match = _SIZE_RE.fullmatch(text.strip())
+    if not match:
+        raise ValueError(f"Invalid size '{text}'")
+    return int(float(match.group(1)) * _UNITS[match.group(2).upper()])
+
+
+def parse_mix(text):
+    """Parse 'prose=4,table=1' into a {block type: weight} dict"""
+    mix = {}
+    for item in text.split(','):
+        name, _, weight = item.partition('=')
+        name = name.strip()
+        if name not in BLOCK_TYPES:
+            raise ValueError(f"Unknown block type '{name}'; expected one of {sorted(BLOCK_TYPES)}")
+        mix[name] = float(weight) if weight else 1.0
+    return mix
+
+
+def iter_corpus(size, mix=None, seed=0):
+    """Yield Markdown chunks totalling at least size bytes of UTF-8"""
+    mix = mix or DEFAULT_MIX
+    rng = random.Random(seed)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    written = 0
+    while written < size:
+        block = BLOCK_TYPES[rng.choices(names, weights)[0]](rng) + '\n\n'
+        written += len(block.encode('utf-8'))
+        yield block
+
+
+def write_corpus(path, size, mix=None, seed=0):
+    """Write a synthetic document to path and return its size in bytes"""
+    written = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        for chunk in iter_corpus(size, mix, seed):
+            f.write(chunk)
+            written += len(chunk.encode('utf-8'))
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('size', help="target size, e.g. 100KB, 10MB, 100MB")
+    parser.add_argument('output', help='Markdown file to write')
+    parser.add_argument('--mix', help=f"block weights, e.g. prose=4,table=1 (types: {', '.join(BLOCK_TYPES)})")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    try:
+        size = parse_size(args.size)
+        mix = parse_mix(args.mix) if args.mix else None
+    except ValueError as e:
+        parser.error(str(e))
+    written = write_corpus(args.output, size, mix, args.seed)
+    print(f"Wrote {written:,} bytes to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+Convert many Markdown documents to Word format in parallel
+
+Examples:
+    python convert_docs.py                      # the user manual and the two summaries
+    python convert_docs.py '**/*.md'            # every .md file in the repo
+    python convert_docs.py '*.md' docs/demo/*.md --out-dir build/docs
+    python convert_docs.py --manifest docs-manifest.json --report timings.json
+    python convert_docs.py --stream exports/audit-narrative.md
+    python convert_docs.py --backend ooxml --out-dir build/docs
+    python convert_docs.py --template corporate.dotx --out-dir build/docs
+    python convert_docs.py --compression store --out-dir build/ci   # fastest save
+    python convert_docs.py --out-dir build/docs --skip-unchanged --publish site/docs
+    python convert_docs.py --out-dir build/help --search-index build/help/manuals.search
+    python convert_docs.py --watch USER_MANUAL.md   # rebuild on every save
+"""
+
+import sys
+
+from mdconvert.batch import main
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,3 @@
+"""
+Shared Markdown conversion helpers for the AureonCare documentation scripts
+"""
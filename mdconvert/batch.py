@@ -0,0 +1,349 @@
+"""
+Parallel batch conversion of Markdown documents to Word
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+import traceback
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from mdconvert.cpus import available_cpus
+from mdconvert.profile import write_report
+from mdconvert.themes import THEMES
+
+# The documents the single-file scripts convert, when no patterns or manifest are given
+DEFAULT_PATTERNS = ('USER_MANUAL.md', 'EXECUTIVE_SUMMARY.md', 'CTO_TECHNICAL_SUMMARY.md')
+SKIP_DIRS = ('node_modules', '.git')
+
+# Documents that have a dedicated look; everything else uses DEFAULT_THEME
+DOCUMENT_THEMES = {
+    'CTO_TECHNICAL_SUMMARY.md': 'cto',
+    'EXECUTIVE_SUMMARY.md': 'executive',
+}
+DEFAULT_THEME = 'user-manual'
+
+BACKENDS = ('python-docx', 'ooxml')
+
+
+@dataclass
+class Job:
+    input: str
+    output: str
+    theme: str
+    compression: Optional[str] = None  # a mdconvert.package profile; None for the run's
+
+
+@dataclass
+class Result:
+    input: str
+    output: str
+    theme: str
+    ok: bool
+    seconds: float
+    error: Optional[str] = None
+    profile: Optional[dict] = None
+    sha256: Optional[str] = None
+    changed: Optional[bool] = None
+    save_seconds: Optional[float] = None
+    output_bytes: Optional[int] = None
+
+
+def _output_path(md_file, out_dir):
+    """md_file's .docx, beside it or at the same relative path under out_dir"""
+    base = os.path.splitext(md_file)[0] + '.docx'
+    if out_dir is None:
+        return base
+    relative = os.path.relpath(base)
+    if relative == os.pardir or relative.startswith(os.pardir + os.sep):
+        raise ValueError(f"{md_file} is outside the current directory, so it has no place under {out_dir}; "
+                         f"run from a directory containing it or give its output in a manifest")
+    return os.path.join(out_dir, relative)
+
+
+def _check_outputs(jobs):
+    """Raise ValueError when two jobs would write the same file"""
+    owners = {}
+    for job in jobs:
+        key = os.path.normcase(os.path.abspath(job.output))
+        if key in owners:
+            raise ValueError(f"{owners[key]} and {job.input} would both be written to {job.output}")
+        owners[key] = job.input
+
+
+def _expand(pattern):
+    paths = sorted(glob.glob(pattern, recursive=True))
+    return [path for path in paths
+            if os.path.isfile(path) and not any(part in SKIP_DIRS for part in path.split(os.sep))]
+
+
+def collect_jobs(patterns=(), manifest=None, theme=None, out_dir=None):
+    """Build the job list from glob patterns and/or a JSON manifest
+
+    A manifest is a list of {"input", "output"?, "theme"?, "compression"?}
+    entries; "input" may be a glob, in which case "output" is ignored.
+    Without either, DEFAULT_PATTERNS are converted. Raises ValueError when
+    two documents would be written to the same output.
+    """
+    entries = []
+    if manifest is not None:
+        with open(manifest, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        entries.extend(data['documents'] if isinstance(data, dict) else data)
+    for pattern in patterns:
+        entries.append({'input': pattern})
+    if not entries:
+        entries = [{'input': pattern} for pattern in DEFAULT_PATTERNS]
+
+    jobs = {}
+    for entry in entries:
+        if entry.get('compression') is not None:
+            from mdconvert.package import compression_level
+
+            compression_level(entry['compression'])
+        paths = _expand(entry['input'])
+        if not paths:
+            print(f"⚠️  No Markdown files match {entry['input']}", file=sys.stderr)
+        for path in paths:
+            name = entry.get('theme') or theme or DOCUMENT_THEMES.get(os.path.basename(path), DEFAULT_THEME)
+            if name not in THEMES:
+                raise ValueError(f"Unknown theme '{name}' for {path}; expected one of {sorted(THEMES)}")
+            output = entry.get('output') if len(paths) == 1 and entry.get('output') else _output_path(path, out_dir)
+            jobs[path] = Job(path, output, name, entry.get('compression'))
+    _check_outputs(jobs.values())
+    return list(jobs.values())
+
+
+@dataclass
+class Options:
+    """How every job in a run is converted"""
+    use_cache: bool = True
+    stream: bool = False
+    backend: str = 'python-docx'
+    profile: bool = False
+    template: Optional[str] = None
+    section_workers: int = 1
+    skip_unchanged: bool = False
+    compression: str = 'default'
+    search: bool = False  # write each document's mdconvert.search index next to it
+
+
+_worker_options = Options()
+_worker_cache = None
+
+
+def init_worker(options):
+    """Load python-docx, lxml and the renderer once per worker process"""
+    global _worker_options, _worker_cache
+    from mdconvert import docx_render, ooxml_render  # noqa: F401
+    from mdconvert.cache import SectionCache
+
+    _worker_options = options
+    # Only the in-memory python-docx path renders whole sections to cache
+    use_cache = options.use_cache and not options.stream and options.backend == 'python-docx'
+    _worker_cache = SectionCache.from_env() if use_cache else None
+
+
+def convert_job(job):
+    """Convert one document, returning a Result instead of raising"""
+    from mdconvert import ooxml_render
+    from mdconvert.docx_render import convert_markdown
+    from mdconvert.profile import NULL_PROFILER, Profiler
+    from mdconvert.search import DocumentIndex, sidecar_path
+    from mdconvert.store import commit, staging_path
+    from mdconvert.stream import stream_markdown
+
+    options = _worker_options
+    theme = THEMES[job.theme]
+    compression = job.compression or options.compression
+    profiler = Profiler() if options.profile else NULL_PROFILER
+    search = DocumentIndex(job.input) if options.search else None
+    # Written beside the output and moved into place, so a failed job leaves the old file alone;
+    # with skip_unchanged the output is only replaced when its contents change
+    target = staging_path(job.output)
+    start = time.perf_counter()
+    try:
+        output_dir = os.path.dirname(job.output)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        if options.backend == 'ooxml':
+            stats = ooxml_render.convert_markdown(job.input, target, theme, profiler=profiler,
+                                                  template=options.template, workers=options.section_workers,
+                                                  compression=compression, search=search)
+        elif options.stream:
+            stats = stream_markdown(job.input, target, theme, profiler=profiler, template=options.template,
+                                    compression=compression, search=search)
+        else:
+            stats = convert_markdown(job.input, target, theme, _worker_cache, profiler, options.template,
+                                     options.section_workers, compression, search)
+        if options.skip_unchanged:
+            digest, changed = commit(target, job.output)
+        else:
+            os.replace(target, job.output)
+            digest, changed = None, None
+        if search is not None:
+            search.save(sidecar_path(job.output))
+    except Exception:
+        if os.path.exists(target):
+            os.remove(target)
+        return Result(job.input, job.output, job.theme, False,
+                      time.perf_counter() - start, traceback.format_exc())
+    seconds = time.perf_counter() - start
+    result = Result(job.input, job.output, job.theme, True, seconds, sha256=digest, changed=changed,
+                    save_seconds=stats.save_seconds, output_bytes=stats.output_bytes)
+    if options.profile:
+        result.profile = profiler.report(
+            document=job.input, theme=job.theme, backend=options.backend,
+            stream=options.stream or options.backend == 'ooxml', total_seconds=round(seconds, 6),
+            input_bytes=os.path.getsize(job.input), output_bytes=stats.output_bytes,
+            uncompressed_bytes=stats.uncompressed_bytes, compression=compression)
+    return result
+
+
+def run_jobs(jobs, workers=None, options=None, on_result=None):
+    """Convert jobs across a process pool and return their Results in job order
+
+    Jobs are grouped by theme so each worker tends to keep converting with
+    the theme it has already loaded. A single job (or workers=1) runs in
+    this process. Streaming, and the 'ooxml' backend which always streams,
+    bypass the section cache.
+    """
+    options = options or Options()
+    workers = min(workers or available_cpus(), len(jobs)) or 1
+    ordered = sorted(jobs, key=lambda job: (job.theme, -os.path.getsize(job.input)))
+    results = {}
+
+    if workers == 1:
+        init_worker(options)
+        for job in ordered:
+            results[job.input] = convert_job(job)
+            if on_result:
+                on_result(results[job.input])
+    else:
+        # Imported here: multiprocessing is slow to load and single-job runs skip it
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(options,)) as pool:
+            futures = {pool.submit(convert_job, job): job for job in ordered}
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # The worker itself died (e.g. killed for memory); keep going
+                    result = Result(job.input, job.output, job.theme, False, 0.0, repr(e))
+                results[job.input] = result
+                if on_result:
+                    on_result(result)
+
+    return [results[job.input] for job in jobs]
+
+
+def _print_result(result):
+    if result.ok and result.changed is False:
+        print(f"✅ {result.input} -> {result.output} unchanged ({result.seconds:.2f}s)")
+    elif result.ok:
+        print(f"✅ {result.input} -> {result.output} ({result.seconds:.2f}s)")
+    else:
+        print(f"❌ {result.input} failed after {result.seconds:.2f}s\n{result.error}", file=sys.stderr)
+
+
+def main(argv=None):
+    from mdconvert.package import COMPRESSION_PROFILES, DEFAULT_COMPRESSION
+
+    parser = argparse.ArgumentParser(description='Convert Markdown documents to Word in parallel')
+    parser.add_argument('patterns', nargs='*', help='Markdown files or glob patterns (default: the user manual and the executive '
+                             'and CTO summaries)')
+    parser.add_argument('--manifest', help='JSON manifest of documents to convert')
+    parser.add_argument('--theme', choices=sorted(THEMES), help='theme for every document')
+    parser.add_argument('--out-dir', help='write .docx files under this directory')
+    parser.add_argument('-j', '--jobs', type=int, help='worker processes (default: available CPUs)')
+    parser.add_argument('--no-cache', action='store_true', help='render every section from scratch')
+    parser.add_argument('--stream', action='store_true',
+                        help='write document.xml incrementally to bound memory on huge inputs')
+    parser.add_argument('--backend', choices=BACKENDS, default='python-docx',
+                        help="renderer; 'ooxml' writes WordprocessingML directly and is much faster")
+    parser.add_argument('--report', help='write per-file timings as JSON to this path')
+    parser.add_argument('--profile', help='write per-phase and per-block-type timings as JSON to this path')
+    parser.add_argument('--template', help='.docx or .dotx (e.g. a corporate template) to build documents on')
+    parser.add_argument('--section-jobs', type=int,
+                        help='processes rendering the sections of each document '
+                             '(default: the CPUs left over per document worker)')
+    parser.add_argument('--compression', choices=sorted(COMPRESSION_PROFILES), default=DEFAULT_COMPRESSION,
+                        help="how hard to compress outputs: 'store' for scratch builds, 'max' for downloads "
+                             "(a manifest entry's \"compression\" overrides it)")
+    parser.add_argument('--skip-unchanged', action='store_true',
+                        help='leave an output untouched when the new one has the same contents')
+    parser.add_argument('--publish', metavar='DIR',
+                        help='copy outputs whose contents changed into DIR, tracked by content hash')
+    parser.add_argument('--search-index', metavar='PATH',
+                        help='write a full-text search index of every document to PATH '
+                             '(and each document\'s own next to its output)')
+    parser.add_argument('--watch', action='store_true',
+                        help='keep running and rebuild outputs whenever their sources change')
+    args = parser.parse_args(argv)
+
+    if args.template and not os.path.isfile(args.template):
+        parser.error(f"Template not found: {args.template}")
+    options = Options(not args.no_cache, args.stream, args.backend, bool(args.profile),
+                      os.path.abspath(args.template) if args.template else None,
+                      skip_unchanged=args.skip_unchanged, compression=args.compression,
+                      search=bool(args.search_index))
+    if args.watch:
+        from mdconvert.watch import watch
+
+        # Rebuilds run one at a time in this process
+        options.section_workers = args.section_jobs or available_cpus()
+        try:
+            return watch(args.patterns, args.manifest, args.theme, args.out_dir, options, _print_result)
+        except (OSError, ValueError, KeyError) as e:
+            parser.error(str(e))
+
+    try:
+        jobs = collect_jobs(args.patterns, args.manifest, args.theme, args.out_dir)
+    except (OSError, ValueError, KeyError) as e:
+        parser.error(str(e))
+    if not jobs:
+        print("No Markdown files to convert", file=sys.stderr)
+        return 1
+
+    doc_workers = min(args.jobs or available_cpus(), len(jobs))
+    options.section_workers = args.section_jobs or max(1, available_cpus() // doc_workers)
+
+    start = time.perf_counter()
+    results = run_jobs(jobs, args.jobs, options, _print_result)
+    elapsed = time.perf_counter() - start
+    failed = [result for result in results if not result.ok]
+    print(f"Converted {len(results) - len(failed)}/{len(results)} documents in {elapsed:.2f}s")
+
+    if args.search_index:
+        from mdconvert.search import merge_indexes, sidecar_path
+
+        merge_indexes([sidecar_path(result.output) for result in results if result.ok], args.search_index)
+        print(f"Search index of {len(results) - len(failed)} documents written to {args.search_index}")
+
+    if args.publish:
+        from mdconvert.store import publish_results
+
+        try:
+            published = publish_results(results, args.publish, args.out_dir)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+        print(f"Published {len(published)} changed of {len(results) - len(failed)} documents to {args.publish}")
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump({
+                'wall_seconds': elapsed,
+                'documents': [asdict(result) for result in results],
+            }, f, indent=2)
+
+    if args.profile:
+        write_report(args.profile, [result.profile for result in results if result.profile])
+        print(f"Profile written to {args.profile}")
+
+    return 1 if failed else 0
@@ -0,0 +1,293 @@
+"""
+Block-level Markdown lexer producing the document AST used by every converter
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+CHECKMARKS = ('✅', '❌')
+RULE_MARKERS = ('---', '___', '***')
+
+
+@dataclass
+class Heading:
+    level: int
+    text: str
+    kind = 'heading'
+
+
+@dataclass
+class Paragraph:
+    text: str
+    kind = 'paragraph'
+
+
+@dataclass
+class ListItem:
+    ordered: bool
+    level: int
+    marker: str
+    text: str
+    kind = 'list_item'
+
+
+@dataclass
+class Quote:
+    text: str
+    kind = 'quote'
+
+
+@dataclass
+class Table:
+    header: List[str]
+    rows: List[List[str]]
+    kind = 'table'
+
+
+@dataclass
+class CodeBlock:
+    lang: str
+    lines: List[str] = field(default_factory=list)
+    kind = 'code'
+
+
+@dataclass
+class Metadata:
+    """A `**Key:** value` line; key is None when the line has no single split point"""
+    text: str
+    key: Optional[str] = None
+    value: Optional[str] = None
+    kind = 'metadata'
+
+
+@dataclass
+class Image:
+    """A line that is only `![alt](path "title")`; text is the line, shown if the image can't be"""
+    alt: str
+    path: str
+    title: Optional[str] = None
+    text: str = ''
+    kind = 'image'
+
+
+@dataclass
+class Rule:
+    kind = 'rule'
+
+
+@dataclass
+class Blank:
+    kind = 'blank'
+
+
+_FENCE = object()
+
+_HEADING_RE = re.compile(r'(#{1,4}) (.*)')
+_BULLET_RE = re.compile(r'(\s*)([-*+✅❌])\s(.*)')
+_NUMBERED_RE = re.compile(r'(\s*)(\d+\.)\s(.*)')
+_PIPE_RE = re.compile(r'(?<!\\)\|')
+_IMAGE_RE = re.compile(r'!\[([^\]]*)\]\(\s*(<[^>]*>|[^\s)]+)(?:\s+"([^"]*)")?\s*\)')
+
+
+def _fence(line, stripped):
+    if stripped.startswith('```'):
+        return _FENCE
+    return None
+
+
+def _heading(line, stripped):
+    match = _HEADING_RE.match(line)
+    if match:
+        return Heading(len(match.group(1)), match.group(2).strip())
+    return None
+
+
+def _rule(line, stripped):
+    if stripped in RULE_MARKERS:
+        return Rule()
+    return None
+
+
+def _bullet(line, stripped):
+    match = _BULLET_RE.match(line)
+    if match:
+        return ListItem(False, len(match.group(1)) // 2, match.group(2), match.group(3))
+    return None
+
+
+def _numbered(line, stripped):
+    match = _NUMBERED_RE.match(line)
+    if match:
+        return ListItem(True, len(match.group(1)) // 2, match.group(2), match.group(3))
+    return None
+
+
+def _quote(line, stripped):
+    return Quote(stripped[1:].strip())
+
+
+def _image(line, stripped):
+    match = _IMAGE_RE.fullmatch(stripped)
+    if match:
+        alt, path, title = match.groups()
+        return Image(alt, path[1:-1] if path.startswith('<') else path, title, line)
+    return None
+
+
+# Each line is classified once, by the first non-blank character, against the
+# handful of block types that can start with it
+_DISPATCH = {
+    '`': (_fence,),
+    '#': (_heading,),
+    '-': (_rule, _bullet),
+    '*': (_rule, _bullet),
+    '_': (_rule,),
+    '+': (_bullet,),
+    '>': (_quote,),
+    '!': (_image,),
+}
+for _marker in CHECKMARKS:
+    _DISPATCH[_marker] = (_bullet,)
+for _digit in '0123456789':
+    _DISPATCH[_digit] = (_numbered,)
+
+
+def _classify(line, stripped):
+    """Return the block a line starts, _FENCE, or None for table/paragraph text"""
+    for matcher in _DISPATCH.get(stripped[0], ()):
+        block = matcher(line, stripped)
+        if block is not None:
+            return block
+    return None
+
+
+def split_table_row(line):
+    """Split a pipe table row into stripped cell texts, keeping empty cells"""
+    row = line.strip()
+    if row.startswith('|'):
+        row = row[1:]
+    if row.endswith('|') and not row.endswith('\\|'):
+        row = row[:-1]
+    if '\\|' in row:
+        return [cell.strip().replace('\\|', '|') for cell in _PIPE_RE.split(row)]
+    return [cell.strip() for cell in row.split('|')]
+
+
+def _table(table_lines):
+    header = split_table_row(table_lines[0])
+    width = len(header)
+    rows = []
+    for table_line in table_lines[2:]:  # Skip separator line
+        row = split_table_row(table_line)
+        if not any(row):
+            continue
+        # Pad short rows and drop cells beyond the header's columns
+        if len(row) < width:
+            row.extend([''] * (width - len(row)))
+        rows.append(row[:width])
+    return Table(header, rows)
+
+
+def _text_block(line):
+    if line.startswith('**') and ':**' in line:
+        parts = line.split(':**')
+        if len(parts) == 2:
+            return Metadata(line, parts[0].replace('**', ''), parts[1].strip())
+        return Metadata(line)
+    return Paragraph(line)
+
+
+def scan_blocks(lines):
+    """Yield (block, first line, end line) for an iterable of Markdown lines
+
+    Line numbers count from 0 and the end is exclusive, so every block
+    spans the lines it was parsed from.
+    """
+    source = enumerate(lines)
+    item = next(source, None)
+    first = True
+
+    while item is not None:
+        n, line = item
+        stripped = line.strip()
+
+        # Blank lines become spacing, except at the very start of the document
+        if not stripped:
+            if not first:
+                yield Blank(), n, n + 1
+            first = False
+            item = next(source, None)
+            continue
+        first = False
+
+        block = _classify(line, stripped)
+
+        # Fenced code runs to the closing fence (or the end of the input)
+        if block is _FENCE:
+            code = CodeBlock(stripped[3:].strip())
+            end = n
+            for end, line in source:
+                if line.strip().startswith('```'):
+                    break
+                code.lines.append(line)
+            yield code, n, end + 1
+            item = next(source, None)
+            continue
+
+        if block is not None:
+            yield block, n, n + 1
+            item = next(source, None)
+            continue
+
+        # Tables need one line of lookahead: two consecutive lines with pipes
+        if '|' in line:
+            following = next(source, None)
+            if following is not None and '|' in following[1]:
+                table_lines = [line, following[1]]
+                item = None
+                for item in source:
+                    if '|' not in item[1]:
+                        break
+                    table_lines.append(item[1])
+                else:
+                    item = None
+                yield _table(table_lines), n, n + len(table_lines)
+                continue
+            yield _text_block(line), n, n + 1
+            item = following
+            continue
+
+        yield _text_block(line), n, n + 1
+        item = next(source, None)
+
+
+def iter_blocks(lines):
+    """Yield AST blocks for an iterable of Markdown lines"""
+    for block, _, _ in scan_blocks(lines):
+        yield block
+
+
+def iter_lines(f):
+    """Yield the lines of a text file without newlines, as content.split('\\n') would"""
+    line = ''
+    for line in f:
+        if line.endswith('\n'):
+            yield line[:-1]
+        else:
+            yield line
+    # split() yields an empty last item after a trailing newline (or for empty input)
+    if not line or line.endswith('\n'):
+        yield ''
+
+
+def parse_blocks(content):
+    """Parse Markdown text into a list of AST blocks"""
+    return list(iter_blocks(content.split('\n')))
+
+
+def read_blocks(md_file):
+    """Read and parse a Markdown file into a list of AST blocks"""
+    with open(md_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+    return parse_blocks(content)
@@ -0,0 +1,189 @@
+"""
+On-disk cache of rendered document sections
+
+A document is split into sections at H1/H2 headings. Each section's rendered
+body XML is stored under a hash of its blocks, the theme and the renderer
+source, so an edit only re-renders the sections it touches. Processed
+images (mdconvert.images) live in an images/ subdirectory and share the
+same byte budget and least-recently-used eviction.
+"""
+
+import functools
+import hashlib
+import os
+import tempfile
+import zlib
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+CACHE_ENV = 'MDCONVERT_CACHE_DIR'
+IMAGE_DIR = 'images'
+_ENTRY_SUFFIXES = ('.xml.z', '.img')
+
+# Modules whose code determines the XML a section renders to
+_RENDERER_MODULES = ('blocks.py', 'inline.py', 'themes.py', 'tables.py', 'styles.py', 'images.py', 'links.py',
+                     'docx_render.py', 'cache.py')
+
+
+def default_cache_dir():
+    """Return the cache directory from MDCONVERT_CACHE_DIR, or None if disabled
+
+    An unset variable means the per-user cache directory; an empty value
+    turns caching off.
+    """
+    directory = os.environ.get(CACHE_ENV)
+    if directory is None:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        return os.path.join(base, 'mdconvert')
+    return directory or None
+
+
+@functools.lru_cache(maxsize=None)
+def renderer_fingerprint():
+    """Hash of the renderer source and python-docx version"""
+    import docx
+
+    digest = hashlib.sha256(docx.__version__.encode())
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    for name in _RENDERER_MODULES:
+        with open(os.path.join(package_dir, name), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def split_sections(blocks):
+    """Group blocks into sections, each starting at an H1 or H2 heading"""
+    sections = []
+    current = []
+    for block in blocks:
+        if block.kind == 'heading' and block.level <= 2 and current:
+            sections.append(current)
+            current = []
+        current.append(block)
+    if current:
+        sections.append(current)
+    return sections
+
+
+def section_key(section, theme, layout=''):
+    """Content hash identifying a section's rendered output
+
+    layout identifies what the document template contributes to the XML
+    (style IDs and text width).
+    """
+    digest = hashlib.sha256(renderer_fingerprint().encode())
+    digest.update(repr(theme).encode())
+    digest.update(layout.encode())
+    for block in section:
+        digest.update(repr(block).encode())
+    return digest.hexdigest()
+
+
+def cache_entries(directory):
+    """Files counted against a cache directory's budget: sections at the top, images under images/"""
+    entries = []
+    for folder in (directory, os.path.join(directory, IMAGE_DIR)):
+        try:
+            with os.scandir(folder) as it:
+                entries.extend(entry for entry in it if entry.is_file() and entry.name.endswith(_ENTRY_SUFFIXES))
+        except OSError:
+            continue
+    return entries
+
+
+def cache_size(directory):
+    """Bytes held by cache_entries(directory)"""
+    total = 0
+    for entry in cache_entries(directory):
+        try:
+            total += entry.stat().st_size
+        except OSError:
+            continue
+    return total
+
+
+def evict(directory, max_bytes):
+    """Delete the least recently used entries of a cache directory; returns the bytes left
+
+    Trims to 90% of max_bytes so a full cache doesn't rescan on every put.
+    """
+    entries = []
+    for entry in cache_entries(directory):
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, entry.path))
+    entries.sort()
+    size = sum(entry_size for _, entry_size, _ in entries)
+    target = max_bytes * 0.9
+    for _, entry_size, path in entries:
+        if size <= target:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        size -= entry_size
+    return size
+
+
+def touch(path):
+    """Refresh path's mtime so eviction drops the least recently used entries"""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+class SectionCache:
+    """Size-bounded directory of compressed XML fragments, evicted LRU by mtime"""
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        self._size = cache_size(directory)
+
+    @classmethod
+    def from_env(cls):
+        """Return a cache at default_cache_dir(), or None when caching is off"""
+        directory = default_cache_dir()
+        return cls(directory) if directory else None
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.xml.z')
+
+    def get(self, key):
+        """Return the cached fragment bytes for key, or None"""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = zlib.decompress(f.read())
+        except (OSError, zlib.error):
+            self.misses += 1
+            return None
+        touch(path)
+        self.hits += 1
+        return data
+
+    def put(self, key, data):
+        """Store fragment bytes under key, evicting old entries past max_bytes"""
+        compressed = zlib.compress(data, 6)
+        path = self._path(key)
+        try:
+            replaced = os.path.getsize(path)
+        except OSError:
+            replaced = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(compressed)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self._size += len(compressed) - replaced
+        if self._size > self.max_bytes:
+            self._size = evict(self.directory, self.max_bytes)
@@ -0,0 +1,187 @@
+"""
+Thin client for the warm conversion daemon
+
+Imports nothing beyond the standard library, so starting it costs a small
+fraction of one conversion. The daemon is started on first use and exits on
+its own after sitting idle. The socket lives in $XDG_RUNTIME_DIR or in a
+directory under the temp directory that only this user can enter, and the
+client only connects to a socket its own user created.
+
+Protocol: one JSON request line per connection, e.g.
+    {"command": "convert", "cwd": "...", "patterns": ["*.md"], "theme": null, "out_dir": null,
+     "backend": null}
+answered by {"warning": "..."} lines, one {"result": {...}} line per document
+and a final {"done": true}, or by a single {"error": "..."} line. A null
+backend means the one the daemon was started with.
+
+    python -m mdconvert.client START-MEDFLOW.md FIX-AUDIT-LOGGING.md
+    python -m mdconvert.client --stop
+"""
+
+import argparse
+import json
+import os
+import socket
+import stat
+import sys
+import tempfile
+import time
+
+SOCKET_ENV = 'MDCONVERT_SOCKET'
+START_TIMEOUT = 30.0
+
+
+def private_dir(path):
+    """Create path as a directory only this user can use, or check that it already is one
+
+    A shared parent such as /tmp lets anyone create the name first, so an
+    existing directory must be ours and closed to group and others.
+    """
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise PermissionError(f"{path} is not a private directory of this user; not using it for the daemon socket")
+    return path
+
+
+def default_socket_path():
+    """MDCONVERT_SOCKET, else a socket in the runtime directory or a private one under the temp directory"""
+    path = os.environ.get(SOCKET_ENV)
+    if path:
+        return path
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        return os.path.join(runtime_dir, 'mdconvert.sock')
+    return os.path.join(private_dir(os.path.join(tempfile.gettempdir(), f'mdconvert-{os.getuid()}')),
+                        'daemon.sock')
+
+
+def _check_owner(path):
+    """Refuse a socket another user created: it would receive our paths and working directory"""
+    if os.stat(path).st_uid != os.getuid():
+        raise PermissionError(f"{path} belongs to another user; not connecting to it")
+
+
+def _connect(path):
+    _check_owner(path)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def start_daemon(path, daemon_args=()):
+    """Launch a detached daemon on path and wait until it accepts connections"""
+    import subprocess
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, (root, env.get('PYTHONPATH'))))
+    subprocess.Popen([sys.executable, '-m', 'mdconvert.daemon', '--socket', path, *daemon_args],
+                     cwd=root, env=env, start_new_session=True,
+                     stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        try:
+            return _connect(path)
+        except PermissionError:
+            raise
+        except OSError:
+            time.sleep(0.05)
+    raise OSError(f"mdconvert daemon did not start on {path}")
+
+
+def request(message, path=None, autostart=True, daemon_args=()):
+    """Send one request and yield the daemon's reply messages"""
+    path = path or default_socket_path()
+    try:
+        sock = _connect(path)
+    except PermissionError:
+        raise
+    except OSError:
+        if not autostart:
+            raise
+        sock = start_daemon(path, daemon_args)
+
+    with sock, sock.makefile('rb') as replies:
+        sock.sendall(json.dumps(message).encode('utf-8') + b'\n')
+        for line in replies:
+            yield json.loads(line)
+
+
+def _print_result(result):
+    if result['ok']:
+        print(f"✅ {result['input']} -> {result['output']} ({result['seconds']:.2f}s)")
+    else:
+        print(f"❌ {result['input']} failed after {result['seconds']:.2f}s\n{result['error']}", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Convert Markdown to Word through the warm daemon')
+    parser.add_argument('patterns', nargs='*',
+                        help='Markdown files or glob patterns (default: the user manual and the executive '
+                             'and CTO summaries)')
+    parser.add_argument('--manifest', help='JSON manifest of documents to convert')
+    parser.add_argument('--theme', help='theme for every document')
+    parser.add_argument('--out-dir', help='write .docx files under this directory')
+    parser.add_argument('--socket', help=f'daemon socket (default: ${SOCKET_ENV} or a per-user path)')
+    parser.add_argument('--backend', choices=('python-docx', 'ooxml'),
+                        help="backend for these documents (default: the running daemon's)")
+    parser.add_argument('--no-start', action='store_true', help='fail instead of starting a daemon')
+    parser.add_argument('--status', action='store_true', help='report whether a daemon is running')
+    parser.add_argument('--stop', action='store_true', help='stop the running daemon')
+    args = parser.parse_args(argv)
+
+    if args.status or args.stop:
+        try:
+            reply = next(request({'command': 'stop' if args.stop else 'ping'}, args.socket, autostart=False))
+        except PermissionError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            return 1
+        except OSError:
+            print("mdconvert daemon is not running")
+            return 1
+        print("mdconvert daemon stopped" if args.stop else f"mdconvert daemon running: {reply}")
+        return 0
+
+    message = {
+        'command': 'convert',
+        'cwd': os.getcwd(),
+        'patterns': args.patterns,
+        'manifest': args.manifest,
+        'theme': args.theme,
+        'out_dir': args.out_dir,
+        'backend': args.backend,
+    }
+    daemon_args = ('--backend', args.backend) if args.backend else ()
+    converted = failed = 0
+    try:
+        for reply in request(message, args.socket, not args.no_start, daemon_args):
+            if 'error' in reply:
+                print(f"❌ {reply['error']}", file=sys.stderr)
+                return 1
+            if 'warning' in reply:
+                print(reply['warning'], file=sys.stderr)
+            if 'result' in reply:
+                _print_result(reply['result'])
+                converted += reply['result']['ok']
+                failed += not reply['result']['ok']
+    except OSError as e:
+        print(f"❌ Cannot reach the mdconvert daemon: {e}", file=sys.stderr)
+        return 1
+
+    if not converted and not failed:
+        print("No Markdown files to convert", file=sys.stderr)
+        return 1
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
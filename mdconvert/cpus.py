@@ -0,0 +1,12 @@
+"""
+How many CPUs the converters may use, shared by the packaging and batch layers
+"""
+
+import os
+
+
+def available_cpus():
+    """CPUs this process may run on (respects container CPU sets)"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
@@ -0,0 +1,173 @@
+"""
+Warm conversion daemon listening on a Unix socket
+
+python-docx, lxml and the renderers are imported, and every theme's base
+template built, once at startup, so a request pays only for the conversion
+itself. Requests are handled one at a time, in the requesting client's
+working directory; see mdconvert.client for the protocol. A request may
+name a backend other than the one the daemon was started with; it applies
+to that request only.
+
+    python -m mdconvert.daemon [--backend ooxml] [--idle-timeout 900]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import time
+from dataclasses import asdict, replace
+
+from mdconvert.batch import BACKENDS, Options, collect_jobs, convert_job, init_worker
+from mdconvert.client import SOCKET_ENV, default_socket_path
+from mdconvert.cpus import available_cpus
+from mdconvert.themes import THEMES
+
+DEFAULT_IDLE_TIMEOUT = 15 * 60
+
+
+def _warm_up(template=None):
+    """Import the renderers and build every theme's base template once"""
+    from mdconvert.template import load_template
+
+    for theme in THEMES.values():
+        load_template(theme, template)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+
+    def _send(self, message):
+        self.wfile.write(json.dumps(message).encode('utf-8') + b'\n')
+        self.wfile.flush()
+
+    def handle(self):
+        self.server.last_request = time.monotonic()
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            self._send({'error': 'malformed request'})
+            return
+
+        command = request.get('command', 'convert')
+        if command == 'ping':
+            self._send({'ok': True, 'pid': os.getpid(), 'options': asdict(self.server.options),
+                        'backend': self.server.backend})
+            return
+        if command == 'stop':
+            self._send({'ok': True})
+            self.server.stopping = True
+            return
+        if command != 'convert':
+            self._send({'error': f"unknown command '{command}'"})
+            return
+
+        backend = request.get('backend') or self.server.options.backend
+        if backend not in BACKENDS:
+            self._send({'error': f"unknown backend '{backend}'"})
+            return
+        self.server.use_backend(backend)
+
+        # Paths in the request are relative to the client's directory
+        warnings = io.StringIO()
+        try:
+            os.chdir(request['cwd'])
+            with contextlib.redirect_stderr(warnings):
+                jobs = collect_jobs(request.get('patterns', ()), request.get('manifest'),
+                                    request.get('theme'), request.get('out_dir'))
+        except (OSError, ValueError, KeyError) as e:
+            self._send({'error': str(e)})
+            return
+        for warning in warnings.getvalue().splitlines():
+            self._send({'warning': warning})
+
+        for job in jobs:
+            self._send({'result': asdict(convert_job(job))})
+        self._send({'done': True})
+
+
+class DaemonServer(socketserver.UnixStreamServer):
+    """Sequential Unix socket server that exits after idle_timeout seconds"""
+
+    def __init__(self, path, options, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+        self.options = options
+        self.backend = options.backend
+        self.idle_timeout = idle_timeout
+        self.last_request = time.monotonic()
+        self.stopping = False
+        self.timeout = min(idle_timeout, 60)
+        super().__init__(path, _Handler)
+        os.chmod(path, 0o600)
+
+    def use_backend(self, backend):
+        """Convert with backend from now on, keeping the daemon's other options"""
+        if backend != self.backend:
+            init_worker(replace(self.options, backend=backend))
+            self.backend = backend
+
+    def serve(self):
+        while not self.stopping and time.monotonic() - self.last_request < self.idle_timeout:
+            self.handle_request()
+
+
+def _claim_socket(path):
+    """Remove a stale socket file; return False if a daemon is already serving it"""
+    if not os.path.exists(path):
+        return True
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+        return True
+    finally:
+        probe.close()
+    return False
+
+
+def serve(path=None, options=None, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+    """Run the daemon until it is stopped or sits idle for idle_timeout seconds"""
+    path = path or default_socket_path()
+    options = options or Options()
+    if not _claim_socket(path):
+        print(f"mdconvert daemon already running on {path}", file=sys.stderr)
+        return 1
+
+    init_worker(options)
+    _warm_up(options.template)
+    server = DaemonServer(path, options, idle_timeout)
+    print(f"mdconvert daemon {os.getpid()} listening on {path}", flush=True)
+    try:
+        server.serve()
+    finally:
+        server.server_close()
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve Markdown to Word conversions from a warm process')
+    parser.add_argument('--socket', help=f'socket path (default: ${SOCKET_ENV} or a per-user path)')
+    parser.add_argument('--backend', choices=BACKENDS, default='python-docx')
+    parser.add_argument('--stream', action='store_true', help='convert with bounded memory')
+    parser.add_argument('--no-cache', action='store_true', help='render every section from scratch')
+    parser.add_argument('--template', help='.docx or .dotx to build documents on')
+    parser.add_argument('--section-jobs', type=int, default=available_cpus(),
+                        help='processes rendering the sections of each document (default: available CPUs)')
+    parser.add_argument('--idle-timeout', type=float, default=DEFAULT_IDLE_TIMEOUT,
+                        help='exit after this many seconds without requests')
+    args = parser.parse_args(argv)
+
+    options = Options(not args.no_cache, args.stream, args.backend, template=args.template,
+                      section_workers=args.section_jobs)
+    return serve(args.socket, options, args.idle_timeout)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,560 @@
+"""
+Spec-driven slide decks, rendered once and cloned for every recipient
+
+A deck spec (JSON, YAML, or the front matter of a Markdown file) lists the
+slides and the components on each: plain text boxes, metric bands,
+quadrants of bulleted benefits and footers. Reusable definitions live under
+"components" and are pulled in with {"use": name, ...overrides}. Any text may
+contain {field} placeholders filled from one row of a recipient table (CSV,
+JSON or YAML); {index} is the row's 1-based position. In the "output" file
+name pattern, path separators in a value become '-', a value of '.' or
+'..' is refused, and two recipients may not resolve to the same file.
+
+A component with "fit": "shrink" has its font sizes reduced, per recipient,
+until its text fits the box as measured by mdconvert.layout; "fit": "check"
+fails the deck instead. The spec's "font" names the font measured with.
+
+python-pptx builds the slides only once, with a marker in place of every
+personalized text. Each deck is then the prebuilt package parts plus the
+slide XML with the markers replaced, so thousands of decks cost little more
+than writing the zip files.
+
+    python -m mdconvert.deck decks/executive.json
+    python -m mdconvert.deck decks/executive.json --data clinics.csv --out-dir build/decks
+"""
+
+import argparse
+import copy
+import csv
+import io
+import json
+import os
+import re
+import string
+import sys
+import time
+import traceback
+import zipfile
+from dataclasses import asdict
+from xml.sax.saxutils import escape
+
+from pptx import Presentation
+from pptx.dml.color import RGBColor
+from pptx.enum.text import PP_ALIGN
+from pptx.util import Inches, Pt
+
+from mdconvert import layout
+from mdconvert.batch import Result
+from mdconvert.cpus import available_cpus
+from mdconvert.package import COMPRESSION_PROFILES, DEFAULT_COMPRESSION, PackageZip, StaticParts
+from mdconvert.store import commit, publish_results, staging_path
+
+BLANK_LAYOUT = 6
+ALIGNMENTS = {'left': PP_ALIGN.LEFT, 'center': PP_ALIGN.CENTER, 'right': PP_ALIGN.RIGHT}
+FIT_MODES = ('shrink', 'check')
+
+# Private-use characters around a text index mark personalized text in slide XML
+_FIELD = '\ue000{}\ue001'
+_FIELD_RE = re.compile('\ue000(\\d+)\ue001')
+_CTRL_RE = re.compile(r'[\x00-\x08\x0B-\x1F]')
+_SLIDE_PART_RE = re.compile(r'ppt/slides/slide\d+\.xml$')
+_SZ_RE = re.compile(rb' sz="(\d+)"')
+_PATH_UNSAFE_RE = re.compile(r'[/\\:\x00-\x1F]')
+_FRONT_MATTER_RE = re.compile(r'\A---[ \t]*\r?\n(.*?)^---[ \t]*$', re.DOTALL | re.MULTILINE)
+
+
+def _parse_yaml(text, path):
+    try:
+        import yaml
+    except ImportError:
+        raise ValueError(f"{path}: YAML needs PyYAML (pip install pyyaml); use JSON instead") from None
+    return yaml.safe_load(text)
+
+
+def load_spec(path):
+    """Read a deck spec from .json, .yaml/.yml, or a Markdown file's front matter"""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.md':
+        match = _FRONT_MATTER_RE.match(text)
+        if match is None:
+            raise ValueError(f"{path}: no '---' front matter holding a deck spec")
+        text = match.group(1)
+        return json.loads(text) if text.lstrip().startswith('{') else _parse_yaml(text, path)
+    if ext in ('.yaml', '.yml'):
+        return _parse_yaml(text, path)
+    return json.loads(text)
+
+
+def load_rows(path):
+    """Read recipient rows from .csv, .json or .yaml (a list, or {"recipients": [...]})"""
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if ext == '.csv':
+            return list(csv.DictReader(f))
+        data = _parse_yaml(f.read(), path) if ext in ('.yaml', '.yml') else json.load(f)
+    rows = data.get('recipients') if isinstance(data, dict) else data
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        raise ValueError(f"{path}: expected a list of recipient objects")
+    return rows
+
+
+def _text_xml(text):
+    """Escape text for an a:t element the way python-pptx does"""
+    text = _CTRL_RE.sub(lambda match: '_x%04X_' % ord(match.group()), text)
+    return escape(text)
+
+
+def _split_fields(xml):
+    """Alternating UTF-8 XML and indexes of the personalized texts between them"""
+    pieces = _FIELD_RE.split(xml)
+    pieces[0::2] = [piece.encode('utf-8') for piece in pieces[0::2]]
+    pieces[1::2] = [int(index) for index in pieces[1::2]]
+    return pieces
+
+
+def _render(pieces, raw, values, font):
+    return b''.join([piece if isinstance(piece, bytes)
+                     else values[piece] if isinstance(piece, int)
+                     else piece.render(raw, values, font)
+                     for piece in pieces])
+
+
+def _file_name_value(name, value, index):
+    """A recipient value made safe to put in a file name: one path component at most"""
+    text = _PATH_UNSAFE_RE.sub('-', str(value))
+    if text.strip() in ('.', '..'):
+        raise ValueError(f"Recipient {index}: field '{name}' is {text!r}, which can't be used in a file name")
+    return text
+
+
+def _check_placeholders(pattern, source, where):
+    """The fields pattern uses; ValueError unless each is a plain recipient field name"""
+    try:
+        names = [name for _, name, _, _ in string.Formatter().parse(pattern) if name is not None]
+    except ValueError as e:
+        raise ValueError(f"{source}: {where} {pattern!r}: {e}") from None
+    for name in names:
+        if not name or name.isdigit() or '.' in name or '[' in name:
+            raise ValueError(f"{source}: {where} {pattern!r}: {{{name}}} is not a field name; "
+                             f"use a recipient column such as {{clinic}}, or {{index}}")
+    return names
+
+
+def _format(pattern, mapping, source, where):
+    """pattern.format_map(mapping), any failure a ValueError naming the spec and the field"""
+    try:
+        return pattern.format_map(mapping)
+    except KeyError as e:
+        raise ValueError(f"{source}: {where} has no field {e}") from None
+    except (AttributeError, IndexError, TypeError, ValueError) as e:
+        raise ValueError(f"{source}: {where} {pattern!r}: {e}") from None
+
+
+def _fill(text, raw):
+    return _FIELD_RE.sub(lambda match: raw[int(match.group(1))], text)
+
+
+class _FitBox:
+    """A shape whose font sizes are fitted to its text for every recipient"""
+
+    def __init__(self, shape_id, mode, box, paragraphs, label):
+        self.shape_id = shape_id
+        self.mode = mode
+        self.box = box
+        self.paragraphs = paragraphs
+        self.label = label
+        self.pieces = []
+
+    def render(self, raw, values, font):
+        xml = _render(self.pieces, raw, values, font)
+        paragraphs = tuple(layout.Paragraph(tuple(layout.Run(_fill(run.text, raw), run.size, run.bold)
+                                                  for run in para.runs), para.space_after)
+                           for para in self.paragraphs)
+        scale = layout.fit_scale(paragraphs, self.box, font)
+        if scale == 1.0:
+            return xml
+        if scale is None or self.mode == 'check':
+            raise ValueError(f"Text does not fit the {self.label}")
+        # Same half-point rounding as layout.scaled
+        return _SZ_RE.sub(lambda match: b' sz="%d"' % max(100, round(int(match.group(1)) * scale / 50) * 50),
+                          xml)
+
+
+class _SlideBuilder:
+    """Add components to a python-pptx slide through the python-pptx API"""
+
+    def __init__(self, slide, colors, field, number):
+        self.slide = slide
+        self.colors = colors
+        self.field = field
+        self.number = number
+        self.fit_boxes = []
+        self.handlers = {
+            'text': self.text,
+            'footer': self.text,
+            'metric_band': self.metric_band,
+            'quadrants': self.quadrants,
+        }
+
+    def color(self, value):
+        return RGBColor.from_string(self.colors.get(value, value).lstrip('#').upper())
+
+    def add(self, component):
+        kind = component.get('type')
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown component type '{kind}'; expected one of {sorted(self.handlers)}")
+        if component.get('fit') not in (None,) + FIT_MODES:
+            raise ValueError(f"Unknown fit '{component['fit']}'; expected one of {FIT_MODES}")
+        self.handlers[kind](component)
+
+    def fit(self, c, shape, paragraphs, width=None, height=None, wrap=False):
+        """Record shape for fitting when the component asks for it"""
+        if c.get('fit') is None:
+            return
+        box = layout.Box(width or shape.width, height or shape.height, wrap)
+        self.fit_boxes.append(_FitBox(shape.shape_id, c['fit'], box, tuple(paragraphs),
+                                      f"{c['type']} '{shape.name}' on slide {self.number}"))
+
+    def text(self, c):
+        box = self.slide.shapes.add_textbox(Inches(c['left']), Inches(c['top']),
+                                            Inches(c['width']), Inches(c['height']))
+        frame = box.text_frame
+        if 'word_wrap' in c:
+            frame.word_wrap = c['word_wrap']
+        frame.text = self.field(c['text'])
+        para = frame.paragraphs[0]
+        para.alignment = ALIGNMENTS[c.get('align', 'center')]
+        para.font.size = Pt(c['size'])
+        if 'bold' in c:
+            para.font.bold = c['bold']
+        if 'color' in c:
+            para.font.color.rgb = self.color(c['color'])
+        self.fit(c, box, [layout.paragraph(frame.text, c['size'], c.get('bold', False))],
+                 wrap=bool(c.get('word_wrap')))
+
+    def metric_band(self, c):
+        left, top = Inches(c['left']), Inches(c['top'])
+        width, height = Inches(c['width']), Inches(c['height'])
+        color = self.color(c.get('color', 'FFFFFF'))
+
+        band = self.slide.shapes.add_shape(1, left, top, width, height)  # Rectangle
+        band.fill.solid()
+        band.fill.fore_color.rgb = self.color(c['fill'])
+        band.line.color.rgb = self.color(c.get('line', c['fill']))
+
+        title = self.slide.shapes.add_textbox(left + Inches(0.2), top + Inches(0.15),
+                                              width - Inches(0.4), Inches(0.3))
+        frame = title.text_frame
+        frame.text = self.field(c['title'])
+        para = frame.paragraphs[0]
+        para.alignment = PP_ALIGN.CENTER
+        para.font.size = Pt(c.get('title_size', 20))
+        para.font.bold = True
+        para.font.color.rgb = color
+        self.fit(c, title, [layout.paragraph(frame.text, c.get('title_size', 20), True)])
+
+        # One column per metric: a large value over a smaller label, kept inside the band
+        metrics = c['metrics']
+        pitch = width // len(metrics)
+        for i, metric in enumerate(metrics):
+            box = self.slide.shapes.add_textbox(left + Inches(0.3) + i * pitch, top + Inches(0.5),
+                                                pitch - Inches(0.2), Inches(0.6))
+            para = box.text_frame.paragraphs[0]
+            para.alignment = PP_ALIGN.CENTER
+
+            value = para.add_run()
+            value.text = self.field(metric['value'])
+            value.font.size = Pt(c.get('value_size', 32))
+            value.font.bold = True
+            value.font.color.rgb = color
+
+            label = para.add_run()
+            label.text = '\n' + self.field(metric['label'])
+            label.font.size = Pt(c.get('label_size', 14))
+            label.font.color.rgb = color
+            runs = (layout.Run(value.text, c.get('value_size', 32), True),
+                    layout.Run(label.text, c.get('label_size', 14)))
+            self.fit(c, box, [layout.Paragraph(runs)], height=height - Inches(0.5))
+
+    def quadrants(self, c):
+        columns = c.get('columns', 2)
+        for i, item in enumerate(c['items']):
+            row, column = divmod(i, columns)
+            box = self.slide.shapes.add_textbox(
+                Inches(c['left']) + column * Inches(c['column_pitch']),
+                Inches(c['top']) + row * Inches(c['row_pitch']),
+                Inches(c['width']), Inches(c['height']))
+            frame = box.text_frame
+            frame.word_wrap = True
+
+            title = frame.paragraphs[0]
+            title.text = self.field(item['title'])
+            title.font.size = Pt(c.get('title_size', 16))
+            title.font.bold = True
+            title.font.color.rgb = self.color(c['title_color'])
+            title.space_after = Pt(6)
+
+            paragraphs = [layout.paragraph(title.text, c.get('title_size', 16), True, 6)]
+            for bullet in item['bullets']:
+                p = frame.add_paragraph()
+                p.text = c.get('bullet', '• ') + self.field(bullet)
+                p.font.size = Pt(c.get('bullet_size', 11))
+                p.level = 0
+                p.space_after = Pt(3)
+                paragraphs.append(layout.paragraph(p.text, c.get('bullet_size', 11), False, 3))
+            self.fit(c, box, paragraphs, wrap=True)
+
+
+class DeckTemplate:
+    """A deck spec rendered once, with markers where recipient data goes
+
+    Personalized texts fill a single run each; a line break in a value stays
+    a line break within that run.
+    """
+
+    def __init__(self, spec, source='deck spec'):
+        self.source = source  # the spec's path, for error messages
+        self.output = spec.get('output', 'deck-{index}.pptx')
+        _check_placeholders(self.output, source, 'output pattern')
+        self.font = spec.get('font', layout.DEFAULT_FONT)
+        self.texts = []
+        self._fields = {}
+        self._fit_boxes = {}
+        prs = self._build(spec)
+
+        buffer = io.BytesIO()
+        prs.save(buffer)
+        self.slides = []
+        with zipfile.ZipFile(buffer) as package:
+            for info in package.infolist():
+                if _SLIDE_PART_RE.match(info.filename):
+                    xml = package.read(info.filename).decode('utf-8')
+                    pieces = self._compile(xml, self._fit_boxes.get(info.filename, ()))
+                    self.slides.append((info.filename, pieces))
+            self.static_parts = StaticParts.from_zip(package, skip={name for name, _ in self.slides})
+
+    def _compile(self, xml, fit_boxes):
+        """Slide XML as static bytes, text indexes and _FitBoxes for fitted shapes"""
+        spans = []
+        for fit_box in fit_boxes:
+            start = xml.index(f'<p:sp><p:nvSpPr><p:cNvPr id="{fit_box.shape_id}" ')
+            spans.append((start, xml.index('</p:sp>', start) + len('</p:sp>'), fit_box))
+        pieces = []
+        position = 0
+        for start, end, fit_box in sorted(spans, key=lambda span: span[0]):
+            pieces.extend(_split_fields(xml[position:start]))
+            fit_box.pieces = _split_fields(xml[start:end])
+            pieces.append(fit_box)
+            position = end
+        pieces.extend(_split_fields(xml[position:]))
+        return pieces
+
+    def _field(self, text):
+        """Return static text as is, or a marker for text with {placeholders}"""
+        text = str(text)
+        if not _check_placeholders(text, self.source, 'text'):
+            return text.format()
+        if text not in self._fields:
+            self._fields[text] = len(self.texts)
+            self.texts.append(text)
+        return _FIELD.format(self._fields[text])
+
+    def _build(self, spec):
+        prs = Presentation()
+        size = spec.get('slide', {})
+        prs.slide_width = Inches(size.get('width', 10))
+        prs.slide_height = Inches(size.get('height', 7.5))
+        colors = spec.get('colors', {})
+        library = spec.get('components', {})
+
+        for number, slide_spec in enumerate(spec['slides'], 1):
+            slide = prs.slides.add_slide(prs.slide_layouts[BLANK_LAYOUT])
+            background = slide_spec.get('background', size.get('background'))
+            if background is not None:
+                fill = slide.background.fill
+                fill.solid()
+                fill.fore_color.rgb = RGBColor.from_string(colors.get(background, background).lstrip('#'))
+
+            builder = _SlideBuilder(slide, colors, self._field, number)
+            for component in slide_spec['content']:
+                if 'use' in component:
+                    if component['use'] not in library:
+                        raise ValueError(f"Unknown component '{component['use']}'")
+                    merged = copy.deepcopy(library[component['use']])
+                    merged.update((k, v) for k, v in component.items() if k != 'use')
+                    merged.setdefault('type', component['use'])
+                    component = merged
+                builder.add(component)
+            self._fit_boxes[slide.part.partname.lstrip('/')] = builder.fit_boxes
+        return prs
+
+    def fields(self, row, index=0):
+        """Mapping that fills the templates for one recipient"""
+        return {'index': index, **row}
+
+    def output_path(self, row, index=0, out_dir=None):
+        """The deck's path, with row's values confined to file names (see _file_name_value)"""
+        mapping = {name: _file_name_value(name, value, index) for name, value in row.items()}
+        path = _format(self.output, {'index': index, **mapping}, self.source, f"recipient {index}'s output name")
+        return path if out_dir is None else os.path.join(out_dir, path)
+
+    def output_paths(self, rows, out_dir=None):
+        """Each row's output path, in order; raises ValueError when two rows share one"""
+        paths = []
+        owners = {}
+        for index, row in enumerate(rows, 1):
+            path = self.output_path(row, index, out_dir)
+            key = os.path.normcase(os.path.abspath(path))
+            if key in owners:
+                raise ValueError(f"Recipients {owners[key]} and {index} would both be written to {path}; "
+                                 f"make the output pattern unique, e.g. with {{index}}")
+            owners[key] = index
+            paths.append(path)
+        return paths
+
+    def write(self, pptx_file, row=None, index=0, compression=DEFAULT_COMPRESSION):
+        """Write the deck for one recipient row and return its PackageStats"""
+        mapping = self.fields(row or {}, index)
+        raw = [_format(text, mapping, self.source, f"recipient {index}") for text in self.texts]
+        values = [_text_xml(text).encode('utf-8') for text in raw]
+        slides = [(name, _render(pieces, raw, values, self.font)) for name, pieces in self.slides]
+
+        with PackageZip(pptx_file, compression) as output:
+            output.add_all(self.static_parts.compressed(compression))
+            output.write_all(slides)
+        return output.stats()
+
+
+_worker_template = None
+
+
+def _init_worker(template):
+    global _worker_template
+    _worker_template = template
+
+
+def _write_deck(task):
+    """Write one deck, returning a Result instead of raising"""
+    index, row, output, skip_unchanged, compression = task
+    target = staging_path(output) if skip_unchanged else output
+    start = time.perf_counter()
+    try:
+        output_dir = os.path.dirname(output)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        stats = _worker_template.write(target, row, index, compression)
+        digest, changed = commit(target, output) if skip_unchanged else (None, None)
+    except Exception:
+        if target != output and os.path.exists(target):
+            os.remove(target)
+        return Result(f'#{index}', output, '', False, time.perf_counter() - start, traceback.format_exc())
+    return Result(f'#{index}', output, '', True, time.perf_counter() - start, sha256=digest, changed=changed,
+                  save_seconds=stats.save_seconds, output_bytes=stats.output_bytes)
+
+
+def build_decks(template, rows, out_dir=None, workers=None, on_result=None, skip_unchanged=False,
+                compression=DEFAULT_COMPRESSION):
+    """Write one deck per row across a process pool and return Results in row order
+
+    With skip_unchanged a deck whose bytes are the same as the file already
+    at its output path leaves that file untouched (see mdconvert.store).
+    compression is a mdconvert.package profile.
+    """
+    tasks = [(index, row, output, skip_unchanged, compression)
+             for index, (row, output) in enumerate(zip(rows, template.output_paths(rows, out_dir)), 1)]
+    workers = min(workers or available_cpus(), len(tasks)) or 1
+
+    if workers == 1:
+        _init_worker(template)
+        results = map(_write_deck, tasks)
+    else:
+        # Imported here: multiprocessing is slow to load and single-deck runs skip it
+        from concurrent.futures import ProcessPoolExecutor
+
+        pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(template,))
+        results = pool.map(_write_deck, tasks, chunksize=max(1, len(tasks) // (workers * 8)))
+
+    collected = []
+    try:
+        for result in results:
+            collected.append(result)
+            if on_result:
+                on_result(result)
+    finally:
+        if workers > 1:
+            pool.shutdown()
+    return collected
+
+
+def build_deck(spec_file, output=None, row=None):
+    """Write the single deck described by spec_file, optionally personalized"""
+    template = DeckTemplate(load_spec(spec_file), spec_file)
+    output = output or template.output_path(row or {})
+    template.write(output, row)
+    return output
+
+
+def _print_result(result):
+    if result.ok and result.changed is False:
+        print(f"✅ {result.output} unchanged ({result.seconds:.3f}s)")
+    elif result.ok:
+        print(f"✅ {result.output} ({result.seconds:.3f}s)")
+    else:
+        print(f"❌ {result.input} -> {result.output} failed\n{result.error}", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Render one slide deck per recipient from a deck spec')
+    parser.add_argument('spec', help='deck spec (.json, .yaml, or .md with front matter)')
+    parser.add_argument('--data', help='recipient table (.csv, .json, .yaml); default: one unpersonalized deck')
+    parser.add_argument('--out-dir', help='write decks under this directory')
+    parser.add_argument('-j', '--jobs', type=int, help='worker processes (default: available CPUs)')
+    parser.add_argument('--quiet', action='store_true', help='only report failures and the summary')
+    parser.add_argument('--report', help='write per-deck timings as JSON to this path')
+    parser.add_argument('--compression', choices=sorted(COMPRESSION_PROFILES), default=DEFAULT_COMPRESSION,
+                        help="how hard to compress decks: 'store' for scratch builds, 'max' for downloads")
+    parser.add_argument('--skip-unchanged', action='store_true',
+                        help='leave a deck untouched when the new one has the same contents')
+    parser.add_argument('--publish', metavar='DIR',
+                        help='copy decks whose contents changed into DIR, tracked by content hash')
+    args = parser.parse_args(argv)
+
+    try:
+        template = DeckTemplate(load_spec(args.spec), args.spec)
+        rows = load_rows(args.data) if args.data else [{}]
+        # Report bad output patterns and clashing outputs before starting any workers
+        template.output_paths(rows, args.out_dir)
+    except KeyError as e:
+        parser.error(f"Missing field {e}")
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    start = time.perf_counter()
+    on_result = (lambda result: None if result.ok else _print_result(result)) if args.quiet else _print_result
+    results = build_decks(template, rows, args.out_dir, args.jobs, on_result, args.skip_unchanged,
+                          args.compression)
+    elapsed = time.perf_counter() - start
+    failed = [result for result in results if not result.ok]
+    print(f"Built {len(results) - len(failed)}/{len(results)} decks in {elapsed:.2f}s")
+
+    if args.publish:
+        try:
+            published = publish_results(results, args.publish, args.out_dir)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+        print(f"Published {len(published)} changed of {len(results) - len(failed)} decks to {args.publish}")
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump({
+                'wall_seconds': elapsed,
+                'decks': [asdict(result) for result in results],
+            }, f, indent=2)
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
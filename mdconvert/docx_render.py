@@ -0,0 +1,379 @@
+"""
+Render the Markdown document AST into a Word document with python-docx
+"""
+
+import os
+from docx.opc.packuri import PackURI
+from docx.opc.part import Part
+from docx.oxml import OxmlElement, parse_xml
+from docx.oxml.ns import nsdecls, qn
+from docx.shared import Inches, Pt, RGBColor
+from lxml import etree
+
+from mdconvert.blocks import CHECKMARKS, read_blocks
+from mdconvert.cache import section_key, split_sections
+from mdconvert.images import RT_IMAGE, DocumentImages, drawing_xml
+from mdconvert.inline import tokenize_inline
+from mdconvert.links import RT_HYPERLINK, BodyLinks, bookmark_name, is_anchor, slugify
+from mdconvert.package import DEFAULT_COMPRESSION, save_document
+from mdconvert.parallel import render_sections
+from mdconvert.profile import NULL_PROFILER
+from mdconvert.styles import register_styles
+from mdconvert.tables import build_table
+from mdconvert.template import load_template, text_width
+
+_W_R = qn('w:r')
+_W_SECT_PR = qn('w:sectPr')
+_W_ID = qn('w:id')
+_W_NAME = qn('w:name')
+_R_ID = qn('r:id')
+_WP_DOC_PR = qn('wp:docPr')
+_W_BOOKMARK_START = qn('w:bookmarkStart')
+_W_BOOKMARK_END = qn('w:bookmarkEnd')
+_W_HYPERLINK = qn('w:hyperlink')
+_DRAWING_NAMESPACES = nsdecls('w', 'wp', 'r')
+
+
+class DocxRenderer:
+    """Append AST blocks to a python-docx Document using a theme
+
+    A document cloned from a BaseTemplate already has the theme's styles;
+    pass the template to reuse its style IDs instead of registering them.
+    """
+
+    def __init__(self, doc, theme, template=None):
+        self.doc = doc
+        self.theme = theme
+        if template is None:
+            self.style_ids = register_styles(doc, theme)
+            self.width = text_width(doc)
+            self.layout = f'{sorted(self.style_ids.items())}|{self.width}'
+        else:
+            self.style_ids = template.style_ids
+            self.width = template.width
+            self.layout = template.layout
+        self.use_images('')
+        self._drawing_id = 0
+        self._handlers = {
+            'heading': self.heading,
+            'paragraph': self.paragraph,
+            'list_item': self.list_item,
+            'quote': self.quote,
+            'table': self.table,
+            'code': self.code,
+            'metadata': self.metadata,
+            'rule': self.rule,
+            'blank': self.blank,
+            'image': self.image,
+        }
+
+    def use_images(self, base_dir):
+        """Resolve image paths against base_dir, the Markdown file's directory"""
+        self.images = DocumentImages(base_dir, self.width, self.theme.image_dpi)
+
+    def profile(self, profiler):
+        """Record per-block timings and the runs and elements each block adds"""
+        body = self.doc.element.body
+
+        def body_length():
+            # Children before the trailing sectPr, without python-docx's scan for it
+            length = len(body)
+            return length - 1 if length and body[-1].tag == _W_SECT_PR else length
+
+        def count(start, result):
+            runs = elements = 0
+            for child in body[start:body_length()]:
+                for element in child.iter():
+                    elements += 1
+                    if element.tag == _W_R:
+                        runs += 1
+            return runs, elements
+
+        self._handlers = profiler.instrument(self._handlers, body_length, count)
+
+    def render(self, blocks):
+        handlers = self._handlers
+        for block in blocks:
+            handlers[block.kind](block)
+
+    def _body_elements(self):
+        """Body children in document order, excluding the trailing sectPr"""
+        body = self.doc.element.body
+        children = list(body)
+        if children and children[-1] is body.sectPr:
+            children.pop()
+        return children
+
+    def insert_fragment(self, fragment):
+        """Append body XML rendered elsewhere (the section cache or a worker)"""
+        body = self.doc.element.body
+        sect_pr = body.sectPr
+        for element in list(parse_xml(b'<fragment>' + fragment + b'</fragment>')):
+            if sect_pr is not None:
+                sect_pr.addprevious(element)
+            else:
+                body.append(element)
+
+    def render_fragment(self, blocks):
+        """Render blocks and return their body XML, leaving the document as it was"""
+        start = len(self._body_elements())
+        self.render(blocks)
+        rendered = self._body_elements()[start:]
+        fragment = b''.join(etree.tostring(element) for element in rendered)
+        body = self.doc.element.body
+        for element in rendered:
+            body.remove(element)
+        return fragment
+
+    def render_cached(self, blocks, cache):
+        """Render blocks section by section, reusing cached section XML"""
+        for section in split_sections(blocks):
+            key = section_key(section, self.theme, self.layout + self.images.keys(section))
+            fragment = cache.get(key)
+            if fragment is not None:
+                self.insert_fragment(fragment)
+                continue
+
+            start = len(self._body_elements())
+            self.render(section)
+            rendered = self._body_elements()[start:]
+            cache.put(key, b''.join(etree.tostring(element) for element in rendered))
+
+    def render_parallel(self, blocks, workers, cache=None, template=None):
+        """Render blocks' sections across worker processes, in document order
+
+        Cached sections are taken from cache; the rest are rendered by
+        workers building on the same template and then cached.
+        """
+        sections = split_sections(blocks)
+        fragments = [None] * len(sections)
+        keys = [None] * len(sections)
+        if cache is not None:
+            for i, section in enumerate(sections):
+                keys[i] = section_key(section, self.theme, self.layout + self.images.keys(section))
+                fragments[i] = cache.get(keys[i])
+        missing = [i for i, fragment in enumerate(fragments) if fragment is None]
+        rendered = render_sections([sections[i] for i in missing], self.theme, 'python-docx', template, workers,
+                                   self.images.base_dir)
+        for i, fragment in zip(missing, rendered):
+            fragments[i] = fragment
+            if cache is not None:
+                cache.put(keys[i], fragment)
+        for fragment in fragments:
+            self.insert_fragment(fragment)
+
+    def add_paragraph(self, role=None, text=None):
+        """Append a paragraph, optionally styled by role and holding plain text"""
+        p = self.doc.add_paragraph(text)
+        if role is not None:
+            p._p.style = self.style_ids[role]
+        return p
+
+    def add_hyperlink(self, paragraph, target):
+        """Append an empty w:hyperlink to paragraph; a URL is a placeholder until linked"""
+        hyperlink = OxmlElement('w:hyperlink')
+        if is_anchor(target):
+            hyperlink.set(qn('w:anchor'), bookmark_name(target[1:]))
+        else:
+            hyperlink.set(_R_ID, target)
+        paragraph._p.append(hyperlink)
+        return hyperlink
+
+    def add_inline_runs(self, paragraph, text):
+        """Add text to a paragraph as runs with inline formatting applied"""
+        hyperlink = link = None
+        for token in tokenize_inline(text):
+            if token.link is not None:
+                if token.link != link:
+                    hyperlink = self.add_hyperlink(paragraph, token.link)
+                link = token.link
+                run = paragraph.add_run(token.text)
+                run._r.style = self.style_ids['link']
+                if token.bold:
+                    run.bold = True
+                if token.italic:
+                    run.italic = True
+                hyperlink.append(run._r)
+                continue
+            link = None
+            if token.code:
+                paragraph.add_run(token.text)._r.style = self.style_ids['inline_code']
+            elif token.bold and self.theme.bold_color is not None:
+                paragraph.add_run(token.text)._r.style = self.style_ids['strong']
+            else:
+                # A lone <w:b/> or <w:i/> is shorter than a style reference
+                run = paragraph.add_run(token.text)
+                if token.bold:
+                    run.bold = True
+                if token.italic:
+                    run.italic = True
+
+    def heading(self, block):
+        p = self.add_paragraph(f'heading{block.level}', block.text)
+        slug = slugify(block.text)
+        if slug:
+            # Placeholders, numbered and named by link_body
+            start = OxmlElement('w:bookmarkStart', {_W_ID: '0', _W_NAME: slug})
+            if p._p.pPr is not None:
+                p._p.pPr.addnext(start)
+            else:
+                p._p.insert(0, start)
+            p._p.append(OxmlElement('w:bookmarkEnd', {_W_ID: '0'}))
+
+    def paragraph(self, block):
+        p = self.add_paragraph()
+        self.add_inline_runs(p, block.text)
+
+    def list_item(self, block):
+        # Checkmark callouts stay regular paragraphs unless the theme lists them
+        if block.marker in CHECKMARKS and not self.theme.checkmark_bullets:
+            p = self.add_paragraph()
+            self.add_inline_runs(p, block.marker + ' ' + block.text)
+            return
+
+        text = block.text
+        if block.marker in CHECKMARKS:
+            text = block.marker + ' ' + text
+        p = self.add_paragraph('list_number' if block.ordered else 'list_bullet')
+        p.paragraph_format.left_indent = Inches(0.25 * (block.level + 1))
+        self.add_inline_runs(p, text)
+
+    def quote(self, block):
+        p = self.add_paragraph('quote')
+        self.add_inline_runs(p, block.text)
+
+    def code(self, block):
+        # One paragraph per fenced block; python-docx turns '\n' into <w:br/>
+        if block.lines:
+            self.add_paragraph('code', '\n'.join(block.lines))
+
+    def table(self, block):
+        if not block.rows:
+            return
+
+        tbl = build_table(block.header, block.rows, self.style_ids['table'],
+                          self.style_ids['table_header'], self.width)
+        self.doc.element.body._insert_tbl(tbl)
+
+        if self.theme.space_after_table:
+            self.add_paragraph()
+
+    def metadata(self, block):
+        if not self.theme.metadata_lines:
+            self.paragraph(block)
+            return
+
+        p = self.add_paragraph()
+        if block.key is not None:
+            p.add_run(block.key + ': ').bold = True
+            p.add_run(block.value)
+        else:
+            p.add_run(block.text)
+
+    def rule(self, block):
+        if self.theme.rule == 'space':
+            p = self.add_paragraph()
+            p.paragraph_format.space_before = Pt(6)
+            p.paragraph_format.space_after = Pt(6)
+        else:
+            run = self.add_paragraph().add_run('_' * 80)
+            run.font.color.rgb = RGBColor(192, 192, 192)
+
+    def blank(self, block):
+        self.add_paragraph()
+
+    def image(self, block):
+        image = self.images.resolve(block.path)
+        if image is None:
+            self.paragraph(block)
+            return
+        self._drawing_id += 1
+        xml = drawing_xml(image, self._drawing_id, os.path.basename(block.path), block.alt, _DRAWING_NAMESPACES)
+        self.doc.element.body._insert_p(parse_xml(xml))
+
+
+def add_images(doc, images):
+    """Add each image's part and relationship, both named by its key, to doc"""
+    document_part = doc.part
+    for image in images:
+        part = Part(PackURI('/' + image.partname), image.content_type, image.data, document_part.package)
+        document_part.rels.add_relationship(RT_IMAGE, part, image.rid)
+
+
+def link_body(doc, template):
+    """Complete the converted body's placeholders, as write_package does for a stream
+
+    Drawings and bookmarks are numbered after the template's own, and each
+    hyperlink URL gets its one relationship.
+    """
+    links = BodyLinks(template.next_drawing_id, template.next_bookmark_id)
+    tags = (_WP_DOC_PR, _W_BOOKMARK_START, _W_BOOKMARK_END, _W_HYPERLINK)
+    for child in doc.element.body[template.head_blocks:]:
+        for element in child.iter(*tags):
+            if element.tag == _WP_DOC_PR:
+                element.set('id', str(links.drawing()))
+            elif element.tag == _W_BOOKMARK_START:
+                bookmark_id, name = links.bookmark(element.get(_W_NAME))
+                element.set(_W_ID, str(bookmark_id))
+                element.set(_W_NAME, name)
+            elif element.tag == _W_BOOKMARK_END:
+                element.set(_W_ID, str(links.bookmark_end()))
+            elif element.get(_R_ID) is not None:
+                element.set(_R_ID, links.url(element.get(_R_ID)))
+    for url, rid in links.urls.items():
+        doc.part.rels.add_relationship(RT_HYPERLINK, url, rid, is_external=True)
+
+
+def convert_markdown(md_file, docx_file, theme, cache=None, profiler=NULL_PROFILER, template=None,
+                     workers=1, compression=DEFAULT_COMPRESSION, search=None):
+    """Convert a Markdown file to a Word document styled with theme
+
+    With a SectionCache, unchanged H1/H2 sections are copied from the cache
+    instead of being rendered again. An enabled Profiler records phase and
+    per-block timings. template is a .docx/.dotx to build on instead of
+    python-docx's default; either way the styled base is built once per
+    process and cloned. workers > 1 renders sections in that many processes
+    (see mdconvert.parallel); profiling always renders serially.
+    compression is a mdconvert.package profile. A mdconvert.search
+    DocumentIndex passed as search is fed the parsed blocks. Returns the
+    PackageStats.
+    """
+    with profiler.phase('parse'):
+        blocks = read_blocks(md_file)
+    if search is not None:
+        with profiler.phase('index'):
+            search.add(blocks)
+    return write_document(blocks, docx_file, theme, os.path.dirname(md_file), cache, profiler, template,
+                          workers, compression)
+
+
+def write_document(blocks, docx_file, theme, base_dir='', cache=None, profiler=NULL_PROFILER, template=None,
+                   workers=1, compression=DEFAULT_COMPRESSION):
+    """Write already parsed blocks as a Word document, as convert_markdown does
+
+    Image paths are resolved against base_dir. Returns the PackageStats.
+    """
+    with profiler.phase('setup'):
+        base = load_template(theme, template)
+        doc = base.document()
+        renderer = DocxRenderer(doc, theme, base)
+        renderer.use_images(base_dir)
+    if profiler.enabled:
+        renderer.profile(profiler)
+    with profiler.phase('images'):
+        images = renderer.images.scan(blocks)
+    with profiler.phase('render'):
+        if workers > 1 and not profiler.enabled:
+            renderer.render_parallel(blocks, workers, cache, template)
+        elif cache is None:
+            renderer.render(blocks)
+        else:
+            hits, misses = cache.hits, cache.misses
+            renderer.render_cached(blocks, cache)
+            if profiler.enabled:
+                profiler.counters.update(cache_hits=cache.hits - hits, cache_misses=cache.misses - misses)
+    with profiler.phase('save'):
+        if images:
+            add_images(doc, images)
+        link_body(doc, base)
+        return save_document(doc, docx_file, compression)
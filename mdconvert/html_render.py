@@ -0,0 +1,226 @@
+"""
+Render the Markdown document AST as a standalone HTML page
+
+The page is a single file for the frontend's help pages: the theme becomes
+an inline stylesheet and images are embedded as data URIs, processed and
+cached as for Word (see mdconvert.images). Headings carry the same ids as
+the Word bookmarks (see mdconvert.links), so [text](#anchor) links work the
+same way in both.
+"""
+
+import base64
+import os
+from html import escape
+
+from mdconvert.blocks import CHECKMARKS, read_blocks
+from mdconvert.images import DocumentImages
+from mdconvert.inline import tokenize_inline
+from mdconvert.links import HeadingSlugs, slugify
+
+EMU_PER_PX = 9525
+TEXT_WIDTH_TWIPS = 9360  # 6.5in, Word's default text width, for fitting images
+
+
+def stylesheet(theme):
+    """CSS for theme, following the Word styles registered in mdconvert.styles"""
+    font, size = theme.body_font or ('Calibri', 11)
+    rules = [
+        f'body{{font-family:"{font}",sans-serif;font-size:{size}pt;line-height:1.4;'
+        f'max-width:{TEXT_WIDTH_TWIPS // 20}pt;margin:2em auto;padding:0 1em}}',
+        f'a{{color:#{theme.link_color}}}',
+        f'code{{font-family:"Courier New",monospace;font-size:10pt;color:#{theme.inline_code_color}}}',
+        f'pre{{margin-left:.5in;font-size:9pt;color:#{theme.code_color}'
+        + (f';background:#{theme.code_shading}' if theme.code_shading else '') + '}',
+        'pre code{color:inherit;font-size:inherit}',
+        f'blockquote{{margin-left:.5in;font-style:italic;color:#{theme.quote_color}}}',
+        'table{border-collapse:collapse;width:100%}',
+        'th,td{border:1px solid #8EAADB;padding:2pt 5pt;text-align:left}',
+        'th{' + (f'background:#{theme.table_header_fill};' if theme.table_header_fill else '')
+        + (f'color:#{theme.table_header_color}' if theme.table_header_color else '') + '}',
+        'img{max-width:100%;height:auto}',
+        'hr{border:0;border-top:1px solid #C0C0C0}' if theme.rule == 'line' else 'hr{border:0}',
+    ]
+    if theme.bold_color is not None:
+        rules.append(f'strong{{color:#{theme.bold_color}}}')
+    for level in range(1, 5):
+        heading = theme.heading(level)
+        rule = f'h{level}{{font-size:{heading.size}pt;color:#{heading.color}'
+        if heading.centered:
+            rule += ';text-align:center'
+        if heading.space_before is not None:
+            rule += f';margin-top:{heading.space_before}pt'
+        rules.append(rule + '}')
+    return '\n'.join(rules)
+
+
+class HtmlRenderer:
+    """Turn AST blocks into HTML strings with a theme"""
+
+    def __init__(self, theme, width=TEXT_WIDTH_TWIPS):
+        self.theme = theme
+        self.width = width
+        self.slugs = HeadingSlugs()
+        self.title = None
+        self._lists = []  # (tag, level) of the open lists, innermost last
+        self.use_images('')
+        self._handlers = {
+            'heading': self.heading,
+            'paragraph': self.paragraph,
+            'list_item': self.list_item,
+            'quote': self.quote,
+            'table': self.table,
+            'code': self.code,
+            'metadata': self.metadata,
+            'rule': self.rule,
+            'blank': self.blank,
+            'image': self.image,
+        }
+
+    def use_images(self, base_dir):
+        """Resolve image paths against base_dir, the Markdown file's directory"""
+        self.images = DocumentImages(base_dir, self.width, self.theme.image_dpi)
+
+    def render(self, blocks):
+        """Return the HTML for blocks as one string"""
+        handlers = self._handlers
+        parts = []
+        for block in blocks:
+            if self._lists and block.kind != 'list_item' and block.kind != 'blank':
+                parts.append(self._close_lists(-1) + '\n')
+            parts.append(handlers[block.kind](block))
+        return ''.join(parts)
+
+    def finish(self):
+        """HTML closing whatever is still open at the end of the document"""
+        return self._close_lists(-1) + '\n' if self._lists else ''
+
+    def _close_lists(self, level):
+        parts = []
+        while self._lists and self._lists[-1][1] > level:
+            parts.append(f'</li></{self._lists.pop()[0]}>')
+        return ''.join(parts)
+
+    def inline(self, text):
+        """HTML for text with inline formatting applied"""
+        parts = []
+        link = None
+        for token in tokenize_inline(text):
+            if token.link != link:
+                if link is not None:
+                    parts.append('</a>')
+                if token.link is not None:
+                    parts.append(f'<a href="{escape(token.link)}">')
+                link = token.link
+            html = escape(token.text, quote=False)
+            if token.code:
+                html = f'<code>{html}</code>'
+            if token.italic:
+                html = f'<em>{html}</em>'
+            if token.bold:
+                html = f'<strong>{html}</strong>'
+            parts.append(html)
+        if link is not None:
+            parts.append('</a>')
+        return ''.join(parts)
+
+    def heading(self, block):
+        if self.title is None and block.text:
+            self.title = block.text
+        slug = slugify(block.text)
+        anchor = f' id="{escape(self.slugs.unique(slug))}"' if slug else ''
+        return f'<h{block.level}{anchor}>{escape(block.text, quote=False)}</h{block.level}>\n'
+
+    def paragraph(self, block):
+        return f'<p>{self.inline(block.text)}</p>\n'
+
+    def list_item(self, block):
+        # Checkmark callouts stay regular paragraphs unless the theme lists them
+        if block.marker in CHECKMARKS and not self.theme.checkmark_bullets:
+            return self._close_lists(-1) + f'<p>{self.inline(block.marker + " " + block.text)}</p>\n'
+
+        text = block.text
+        if block.marker in CHECKMARKS:
+            text = block.marker + ' ' + text
+        tag = 'ol' if block.ordered else 'ul'
+        parts = [self._close_lists(block.level)]
+        if self._lists and self._lists[-1][1] == block.level:
+            if self._lists[-1][0] == tag:
+                parts.append('</li>')
+            else:
+                parts.append(f'</li></{self._lists.pop()[0]}>')
+        if not self._lists or self._lists[-1][1] < block.level:
+            parts.append(f'<{tag}>')
+            self._lists.append((tag, block.level))
+        parts.append(f'<li>{self.inline(text)}')
+        return ''.join(parts)
+
+    def quote(self, block):
+        return f'<blockquote><p>{self.inline(block.text)}</p></blockquote>\n'
+
+    def code(self, block):
+        if not block.lines:
+            return ''
+        lang = f' class="language-{escape(block.lang)}"' if block.lang else ''
+        return f'<pre><code{lang}>{escape(chr(10).join(block.lines), quote=False)}</code></pre>\n'
+
+    def table(self, block):
+        if not block.rows:
+            return ''
+        parts = ['<table><thead><tr>']
+        parts.extend(f'<th>{self.inline(cell)}</th>' for cell in block.header)
+        parts.append('</tr></thead><tbody>')
+        for row in block.rows:
+            parts.append('<tr>')
+            parts.extend(f'<td>{self.inline(cell)}</td>' for cell in row)
+            parts.append('</tr>')
+        parts.append('</tbody></table>\n')
+        return ''.join(parts)
+
+    def metadata(self, block):
+        if not self.theme.metadata_lines:
+            return self.paragraph(block)
+        if block.key is not None:
+            return f'<p><strong>{escape(block.key)}:</strong> {escape(block.value, quote=False)}</p>\n'
+        return f'<p>{escape(block.text, quote=False)}</p>\n'
+
+    def rule(self, block):
+        return '<hr>\n'
+
+    def blank(self, block):
+        return ''
+
+    def image(self, block):
+        image = self.images.resolve(block.path)
+        if image is None:
+            return self.paragraph(block)
+        data = base64.b64encode(image.data).decode('ascii')
+        title = f' title="{escape(block.title)}"' if block.title else ''
+        return (f'<p><img src="data:{image.content_type};base64,{data}" alt="{escape(block.alt)}"{title} '
+                f'width="{image.cx // EMU_PER_PX}" height="{image.cy // EMU_PER_PX}"></p>\n')
+
+
+def page(body, title, theme):
+    """A complete HTML document around body"""
+    return (
+        '<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="utf-8">\n'
+        '<meta name="viewport" content="width=device-width, initial-scale=1">\n'
+        f'<title>{escape(title, quote=False)}</title>\n<style>\n{stylesheet(theme)}\n</style>\n</head>\n'
+        f'<body>\n{body}</body>\n</html>\n'
+    )
+
+
+def write_html(blocks, html_file, theme, base_dir=''):
+    """Write blocks as a standalone HTML page; returns the bytes written"""
+    renderer = HtmlRenderer(theme)
+    renderer.use_images(base_dir)
+    body = renderer.render(blocks) + renderer.finish()
+    title = renderer.title or os.path.splitext(os.path.basename(html_file))[0]
+    data = page(body, title, theme).encode('utf-8')
+    with open(html_file, 'wb') as f:
+        f.write(data)
+    return len(data)
+
+
+def convert_markdown(md_file, html_file, theme):
+    """Convert a Markdown file to a standalone HTML page"""
+    return write_html(read_blocks(md_file), html_file, theme, os.path.dirname(md_file))
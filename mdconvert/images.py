@@ -0,0 +1,312 @@
+"""
+Pictures for ![alt](path) lines, decoded, fitted and recompressed once
+
+An image is shown at its natural size (the DPI it records, else 96),
+shrunk to the text width, and keeps only the pixels that size needs at the
+theme's image_dpi. Decoding, resizing and recompressing is the slow part,
+so the result is stored under the cache directory (see mdconvert.cache),
+keyed by the source file's SHA-256, the DPI and the text width: an image
+is processed once however many documents use it.
+
+The key also names the image's package part and relationship ID. Body XML
+showing an image is therefore the same whichever worker process or cache
+entry it came from, and a picture used in several places is one part.
+"""
+
+import functools
+import hashlib
+import io
+import json
+import mmap
+import os
+import sys
+import tempfile
+from collections import OrderedDict
+from urllib.parse import unquote
+from xml.sax.saxutils import escape
+
+from mdconvert.blocks import iter_blocks, iter_lines
+from mdconvert.cache import DEFAULT_MAX_BYTES, IMAGE_DIR, cache_size, default_cache_dir, evict, touch
+from mdconvert.tables import EMU_PER_TWIP
+
+IMAGE_VERSION = 1  # bump when processing changes so cached images are redone
+SCREEN_DPI = 96
+EMU_PER_INCH = 914400
+JPEG_QUALITY = 85
+MEMORY_IMAGES = 64
+
+RT_IMAGE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/image'
+CONTENT_TYPES = {'png': 'image/png', 'jpeg': 'image/jpeg'}
+
+_NS_A = 'http://schemas.openxmlformats.org/drawingml/2006/main'
+_NS_PIC = 'http://schemas.openxmlformats.org/drawingml/2006/picture'
+
+_warned = set()
+
+
+class ProcessedImage:
+    """A fitted, recompressed image and the size it is shown at, in EMU"""
+    __slots__ = ('key', 'ext', 'data', 'cx', 'cy')
+
+    def __init__(self, key, ext, data, cx, cy):
+        self.key = key
+        self.ext = ext
+        self.data = data
+        self.cx = cx
+        self.cy = cy
+
+    @property
+    def partname(self):
+        return f'word/media/image-{self.key}.{self.ext}'
+
+    @property
+    def rid(self):
+        return f'rIdImg{self.key}'
+
+    @property
+    def content_type(self):
+        return CONTENT_TYPES[self.ext]
+
+
+def process_image(source, max_width_emu, dpi):
+    """Fit source image bytes to max_width_emu at dpi; returns (ext, data, cx, cy)
+
+    JPEG stays JPEG and anything else becomes PNG. An image that needed no
+    change keeps its own bytes when re-encoding would not make it smaller.
+    """
+    # Imported here: only documents with images need Pillow
+    from PIL import Image, ImageOps
+
+    try:
+        image = Image.open(io.BytesIO(source))
+    except Image.DecompressionBombError as e:
+        # Not an OSError, but as unusable as a corrupt file
+        raise ValueError(e) from None
+    source_format = image.format
+    rotated = image.getexif().get(0x0112, 1) != 1
+    if rotated:
+        image = ImageOps.exif_transpose(image)
+    width, height = image.size
+    source_dpi = image.info.get('dpi', (SCREEN_DPI,))[0] or SCREEN_DPI
+    cx = min(round(width / max(source_dpi, 1) * EMU_PER_INCH), max_width_emu)
+    cy = round(cx * height / width)
+
+    pixels = round(cx / EMU_PER_INCH * dpi)
+    resized = pixels < width
+    if resized:
+        image = image.resize((pixels, max(1, round(height * pixels / width))), Image.LANCZOS)
+
+    buffer = io.BytesIO()
+    if source_format == 'JPEG':
+        ext = 'jpeg'
+        if image.mode not in ('L', 'RGB', 'CMYK'):
+            image = image.convert('RGB')
+        image.save(buffer, 'JPEG', quality=JPEG_QUALITY, optimize=True)
+    else:
+        ext = 'png'
+        if image.mode not in ('1', 'L', 'LA', 'P', 'RGB', 'RGBA'):
+            image = image.convert('RGBA')
+        image.save(buffer, 'PNG', optimize=True)
+    data = buffer.getvalue()
+    if not resized and not rotated and source_format == ext.upper() and len(source) <= len(data):
+        data = source
+    return ext, data, cx, cy
+
+
+class ImageCache:
+    """Processed images on disk (when a cache directory is given) and the most recent in memory
+
+    Images go in the images/ subdirectory of cache_dir and count against
+    the same max_bytes as the section cache there, evicted together.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.directory = os.path.join(cache_dir, IMAGE_DIR) if cache_dir else None
+        self.max_bytes = max_bytes
+        self._memory = OrderedDict()
+        self._digests = {}  # (path, mtime_ns, size) -> SHA-256 of the file
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            self._size = cache_size(cache_dir)
+
+    @classmethod
+    def from_env(cls):
+        """Images under default_cache_dir(), or in memory only when caching is off"""
+        return cls(default_cache_dir())
+
+    def _source(self, path):
+        """The file's digest, and its bytes if they had to be read for it"""
+        stat = os.stat(path)
+        stamp = (path, stat.st_mtime_ns, stat.st_size)
+        digest = self._digests.get(stamp)
+        if digest is not None:
+            return digest, None
+        with open(path, 'rb') as f:
+            source = f.read()
+        digest = self._digests[stamp] = hashlib.sha256(source).hexdigest()
+        return digest, source
+
+    def get(self, path, max_width_emu, dpi):
+        """The ProcessedImage for the file at path, processing it on first use"""
+        digest, source = self._source(path)
+        key = hashlib.sha256(f'{IMAGE_VERSION}|{dpi}|{max_width_emu}|{digest}'.encode()).hexdigest()[:16]
+        image = self._memory.get(key)
+        if image is None:
+            image = self._load(key)
+        if image is None:
+            if source is None:
+                with open(path, 'rb') as f:
+                    source = f.read()
+            image = ProcessedImage(key, *process_image(source, max_width_emu, dpi))
+            self._store(image)
+        self._memory[key] = image
+        self._memory.move_to_end(key)
+        if len(self._memory) > MEMORY_IMAGES:
+            self._memory.popitem(last=False)
+        return image
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.img')
+
+    def _load(self, key):
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                header = json.loads(f.readline())
+                data = f.read()
+        except (OSError, ValueError):
+            return None
+        touch(path)
+        return ProcessedImage(key, header['ext'], data, header['cx'], header['cy'])
+
+    def _store(self, image):
+        """Write a header line and the image bytes, atomically"""
+        if not self.directory:
+            return
+        header = json.dumps({'ext': image.ext, 'cx': image.cx, 'cy': image.cy}).encode()
+        path = self._path(image.key)
+        try:
+            replaced = os.path.getsize(path)
+        except OSError:
+            replaced = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(header + b'\n')
+                f.write(image.data)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self._size += len(header) + 1 + len(image.data) - replaced
+        if self._size > self.max_bytes:
+            self._size = evict(self.cache_dir, self.max_bytes)
+
+
+@functools.lru_cache(maxsize=None)
+def default_image_cache():
+    """The process's ImageCache, shared by every renderer"""
+    return ImageCache.from_env()
+
+
+class DocumentImages:
+    """The images one document shows, resolved against its directory
+
+    images holds each distinct ProcessedImage in order of first use, which
+    is the order their package parts and relationships are written in.
+    """
+
+    def __init__(self, base_dir, width, dpi, cache=None):
+        self.base_dir = base_dir
+        self.max_width_emu = width * EMU_PER_TWIP
+        self.dpi = dpi
+        self.cache = cache or default_image_cache()
+        self.images = {}
+        self._resolved = {}
+
+    def resolve(self, path):
+        """The ProcessedImage for a Markdown image path, or None (with a warning) if unusable"""
+        if path in self._resolved:
+            return self._resolved[path]
+        image = None
+        if '://' in path:
+            _warn(path, 'remote images are not downloaded')
+        else:
+            full = os.path.join(self.base_dir, unquote(path))
+            try:
+                image = self.cache.get(full, self.max_width_emu, self.dpi)
+            except (OSError, SyntaxError, ValueError) as e:
+                _warn(full, e)
+        self._resolved[path] = image
+        if image is not None:
+            self.images.setdefault(image.key, image)
+        return image
+
+    def scan(self, blocks):
+        """Resolve the images in blocks, returning every image seen so far"""
+        for block in blocks:
+            if block.kind == 'image':
+                self.resolve(block.path)
+        return list(self.images.values())
+
+    def keys(self, blocks):
+        """What the images in blocks contribute to a section cache key"""
+        keys = []
+        for block in blocks:
+            if block.kind == 'image':
+                image = self.resolve(block.path)
+                keys.append(image.key if image is not None else '-')
+        return '|' + ','.join(keys) if keys else ''
+
+
+def image_blocks(md_file):
+    """The image blocks of a Markdown file, for writers that stream the rest
+
+    Files without any image syntax, nearly all of them, are not parsed.
+    """
+    with open(md_file, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            if buffer.find(b'![') < 0:
+                return []
+    with open(md_file, 'r', encoding='utf-8') as f:
+        return [block for block in iter_blocks(iter_lines(f)) if block.kind == 'image']
+
+
+def _warn(path, reason):
+    if path not in _warned:
+        _warned.add(path)
+        print(f"⚠️  Image {path} left as text: {reason}", file=sys.stderr)
+
+
+def _attr(value):
+    # Quoted as lxml writes attributes, so both renderers give the same bytes
+    return '"' + escape(value, {'"': '&quot;'}) + '"'
+
+
+def drawing_xml(image, drawing_id, name, alt='', namespaces=''):
+    """A w:p holding image inline, as python-docx's add_picture lays it out
+
+    The document root declares the w, wp and r prefixes; namespaces is
+    inserted into the w:p tag when the string is parsed on its own.
+    """
+    extent = f'cx="{image.cx}" cy="{image.cy}"'
+    return (
+        (f'<w:p {namespaces}>' if namespaces else '<w:p>') +
+        '<w:r><w:drawing><wp:inline distT="0" distB="0" distL="0" distR="0">'
+        f'<wp:extent {extent}/><wp:effectExtent l="0" t="0" r="0" b="0"/>'
+        f'<wp:docPr id="{drawing_id}" name={_attr(name)} descr={_attr(alt)}/>'
+        f'<wp:cNvGraphicFramePr><a:graphicFrameLocks xmlns:a="{_NS_A}" noChangeAspect="1"/>'
+        f'</wp:cNvGraphicFramePr><a:graphic xmlns:a="{_NS_A}">'
+        f'<a:graphicData uri="{_NS_PIC}"><pic:pic xmlns:pic="{_NS_PIC}">'
+        f'<pic:nvPicPr><pic:cNvPr id="0" name={_attr(name)}/><pic:cNvPicPr/></pic:nvPicPr>'
+        f'<pic:blipFill><a:blip r:embed="{image.rid}"/><a:stretch><a:fillRect/></a:stretch></pic:blipFill>'
+        f'<pic:spPr><a:xfrm><a:off x="0" y="0"/><a:ext {extent}/></a:xfrm>'
+        '<a:prstGeom prst="rect"><a:avLst/></a:prstGeom></pic:spPr>'
+        '</pic:pic></a:graphicData></a:graphic></wp:inline></w:drawing></w:r></w:p>'
+    )
+
@@ -0,0 +1,157 @@
+"""
+Inline Markdown tokenizer: **bold**, *italic* / _italic_, `code` spans and [links](target)
+"""
+
+import re
+from typing import List, NamedTuple, Optional
+
+_DELIMITERS = ('*', '_', '`')
+_DELIMITER_RE = re.compile(r'[*_`]')
+_LINK = '\x00'  # stands in for a link while emphasis is paired
+# Code spans are matched too, only so that links inside them are left alone
+_LINK_RE = re.compile(r'`[^`]*`|(?<!!)\[([^\]]+)\]\(\s*<?([^\s<>()]+)>?(?:\s+"[^"]*")?\s*\)')
+
+
+class InlineRun(NamedTuple):
+    text: str
+    bold: bool = False
+    italic: bool = False
+    code: bool = False
+    link: Optional[str] = None  # a URL, or '#slug' for a heading in the document
+
+
+class _Finder:
+    """Equivalent of str.find for a fixed needle when start offsets only grow
+
+    All occurrences are collected up front; each lookup then advances a cursor,
+    so any sequence of non-decreasing lookups costs O(len(text)) in total.
+    """
+
+    __slots__ = ('positions', 'cursor')
+
+    def __init__(self, positions):
+        self.positions = positions
+        self.cursor = 0
+
+    def find(self, start):
+        positions = self.positions
+        cursor = self.cursor
+        while cursor < len(positions) and positions[cursor] < start:
+            cursor += 1
+        self.cursor = cursor
+        return positions[cursor] if cursor < len(positions) else -1
+
+
+def _finders(text):
+    positions = [match.start() for match in _DELIMITER_RE.finditer(text)]
+    singles = {'*': [], '_': [], '`': []}
+    for index in positions:
+        singles[text[index]].append(index)
+    finders = {char: _Finder(indexes) for char, indexes in singles.items()}
+    for char in ('*', '_'):
+        indexes = singles[char]
+        doubles = [index for index, following in zip(indexes, indexes[1:])
+                   if following == index + 1]
+        finders[char * 2] = _Finder(doubles)
+    finders[None] = _Finder(positions)
+    return finders
+
+
+def tokenize_inline(text) -> List[InlineRun]:
+    """Split a line of Markdown into formatted runs in linear time
+
+    Delimiters pair with the next matching delimiter on the line; unmatched
+    ones are kept as literal text. Adjacent plain text is merged into a single
+    run, and empty spans are dropped together with their delimiters. A link's
+    text is formatted the same way, each of its runs carrying the target.
+    """
+    if '](' not in text or _LINK in text:
+        return _tokenize_spans(text)
+
+    # Each link becomes one placeholder character, so emphasis around it applies
+    links = []
+
+    def hold(match):
+        if match.group(1) is None:
+            return match.group(0)
+        links.append(match.groups())
+        return _LINK
+
+    masked = _LINK_RE.sub(hold, text)
+    if not links:
+        return _tokenize_spans(text)
+
+    runs = []
+    pending = iter(links)
+    for run in _tokenize_spans(masked):
+        if _LINK not in run.text:
+            runs.append(run)
+            continue
+        for i, piece in enumerate(run.text.split(_LINK)):
+            if i:
+                label, target = next(pending)
+                runs.extend(token._replace(bold=token.bold or run.bold, italic=token.italic or run.italic,
+                                           link=target) for token in _tokenize_spans(label))
+            if piece:
+                runs.append(run._replace(text=piece))
+    return runs
+
+
+def _tokenize_spans(text):
+    if not any(char in text for char in _DELIMITERS):
+        return [InlineRun(text)] if text else []
+
+    finders = _finders(text)
+    runs = []
+    plain = []
+    length = len(text)
+    plain_start = 0
+    i = 0
+
+    def emit(end, run):
+        if plain_start < end:
+            plain.append(text[plain_start:end])
+        if run.text:
+            if plain:
+                runs.append(InlineRun(''.join(plain)))
+                plain.clear()
+            runs.append(run)
+
+    while i < length:
+        # Skip straight to the next delimiter character
+        i = finders[None].find(i)
+        if i == -1:
+            break
+        char = text[i]
+
+        # Handle bold (**text** or __text__)
+        if char != '`' and i + 1 < length and text[i + 1] == char:
+            end = finders[char * 2].find(i + 2)
+            if end != -1:
+                emit(i, InlineRun(text[i + 2:end], bold=True))
+                i = plain_start = end + 2
+                continue
+
+        # Handle italic (*text* or _text_)
+        if char != '`' and (i == 0 or text[i - 1] not in '*_'):
+            end = finders[char].find(i + 1)
+            if end != -1 and (end + 1 >= length or text[end + 1] != char):
+                emit(i, InlineRun(text[i + 1:end], italic=True))
+                i = plain_start = end + 1
+                continue
+
+        # Handle code (`text`)
+        if char == '`':
+            end = finders['`'].find(i + 1)
+            if end != -1:
+                emit(i, InlineRun(text[i + 1:end], code=True))
+                i = plain_start = end + 1
+                continue
+
+        i += 1
+
+    if plain_start < length:
+        plain.append(text[plain_start:])
+    if plain:
+        runs.append(InlineRun(''.join(plain)))
+    return runs
@@ -0,0 +1,351 @@
+"""
+Measure, wrap and fit slide text offline with glyph advances from local fonts
+
+Widths come from the hmtx and cmap tables of a TrueType font found on this
+machine (MDCONVERT_FONT_PATH, then the usual font directories). Calibri
+falls back to the metric-compatible Carlito. When no font file is found a
+flat average width is used, with a warning printed the first time text has
+to be shrunk by those estimates.
+
+Everything a batch deck run repeats is memoized: fonts are parsed once per
+process, word widths once per font, and whole-box fits once per distinct
+text, so fitting thousands of boxes costs little more than the lookups.
+Lengths are in points unless noted; boxes are given in EMU like python-pptx.
+"""
+
+import functools
+import os
+import re
+import struct
+import sys
+import unicodedata
+from dataclasses import dataclass
+from typing import Tuple
+
+DEFAULT_FONT = 'Calibri'  # minor font of python-pptx's default theme
+FONT_PATH_ENV = 'MDCONVERT_FONT_PATH'
+FONT_DIRS = (
+    '~/.fonts', '~/.local/share/fonts', '/usr/share/fonts', '/usr/local/share/fonts',
+    '~/Library/Fonts', '/Library/Fonts', '/System/Library/Fonts', 'C:\\Windows\\Fonts',
+)
+# Metric-compatible substitutes, tried after the family itself
+FONT_ALIASES = {
+    'calibri': ('carlito',),
+    'cambria': ('caladea',),
+    'arial': ('liberationsans', 'arimo'),
+    'helvetica': ('liberationsans', 'arimo'),
+    'timesnewroman': ('liberationserif', 'tinos'),
+    'couriernew': ('liberationmono', 'cousine'),
+}
+
+EMU_PER_PT = 12700
+DEFAULT_INSETS = (91440, 45720, 91440, 45720)  # PowerPoint's left, top, right, bottom
+FALLBACK_WIDTH = 0.5   # em, when no font file is available
+FALLBACK_LINE = 1.2    # line height in em
+BOLD_FACTOR = 1.05     # when only the regular face of a family is found
+MIN_SCALE = 0.5
+SCALE_STEP = 0.05
+
+_SPACE_RE = re.compile(r'( +)')
+
+
+def _normalize(name):
+    return re.sub(r'[^a-z0-9]', '', name.lower())
+
+
+class FontMetrics:
+    """Advance widths (in em) and line height of one font face"""
+
+    def __init__(self, name, advances=None, default=FALLBACK_WIDTH, line_height=FALLBACK_LINE, factor=1.0):
+        self.name = name
+        self.advances = advances or {}
+        self.default = default
+        self.line_height = line_height
+        self.factor = factor
+        self._words = {}
+
+    @classmethod
+    def from_file(cls, path, factor=1.0):
+        with open(path, 'rb') as f:
+            data = f.read()
+        units, ascent, descent, gap, glyph_advances, cmap = _read_ttf(data)
+        advances = {cp: glyph_advances[min(glyph, len(glyph_advances) - 1)] / units
+                    for cp, glyph in cmap.items()}
+        line_height = (ascent - descent + gap) / units
+        return cls(os.path.basename(path), advances, glyph_advances[0] / units, line_height, factor)
+
+    @property
+    def fallback(self):
+        """True when widths are the flat average, not read from a font file"""
+        return not self.advances
+
+    def char_width(self, char):
+        width = self.advances.get(ord(char))
+        if width is not None:
+            return width
+        # Joiners, variation selectors and combining marks take no space
+        if unicodedata.category(char) in ('Mn', 'Me', 'Cf'):
+            return 0.0
+        # Emoji and wide characters come from a fallback font at about 1 em
+        if unicodedata.east_asian_width(char) in ('W', 'F') or ord(char) >= 0x1F000:
+            return 1.0
+        return self.default
+
+    def width(self, text):
+        """Width of text in em, memoized per word"""
+        width = self._words.get(text)
+        if width is None:
+            width = sum(self.char_width(char) for char in text) * self.factor
+            self._words[text] = width
+        return width
+
+
+def _read_ttf(data):
+    """Units per em, ascent, descent, line gap, glyph advances and cmap of a TTF/OTF"""
+    offset = 0
+    if data[:4] == b'ttcf':
+        offset, = struct.unpack_from('>I', data, 12)  # first font of a collection
+    num_tables, = struct.unpack_from('>H', data, offset + 4)
+    tables = {}
+    for i in range(num_tables):
+        tag, _, table_offset, length = struct.unpack_from('>4sIII', data, offset + 12 + 16 * i)
+        tables[tag] = table_offset
+
+    units, = struct.unpack_from('>H', data, tables[b'head'] + 18)
+    ascent, descent, gap = struct.unpack_from('>hhh', data, tables[b'hhea'] + 4)
+    num_metrics, = struct.unpack_from('>H', data, tables[b'hhea'] + 34)
+    advances = [struct.unpack_from('>H', data, tables[b'hmtx'] + 4 * i)[0] for i in range(num_metrics)]
+    return units, ascent, descent, gap, advances, _read_cmap(data, tables[b'cmap'])
+
+
+def _read_cmap(data, base):
+    num, = struct.unpack_from('>H', data, base + 2)
+    subtables = {}
+    for i in range(num):
+        platform, encoding, offset = struct.unpack_from('>HHI', data, base + 4 + 8 * i)
+        subtables[(platform, encoding)] = base + offset
+
+    for key in ((3, 10), (0, 4), (0, 6), (3, 1), (0, 3), (0, 1), (0, 0)):
+        if key not in subtables:
+            continue
+        start = subtables[key]
+        fmt, = struct.unpack_from('>H', data, start)
+        if fmt == 12:
+            return _read_cmap12(data, start)
+        if fmt == 4:
+            return _read_cmap4(data, start)
+    return {}
+
+
+def _read_cmap4(data, start):
+    seg_count = struct.unpack_from('>H', data, start + 6)[0] // 2
+    ends = struct.unpack_from(f'>{seg_count}H', data, start + 14)
+    starts = struct.unpack_from(f'>{seg_count}H', data, start + 16 + 2 * seg_count)
+    deltas = struct.unpack_from(f'>{seg_count}h', data, start + 16 + 4 * seg_count)
+    range_base = start + 16 + 6 * seg_count
+    range_offsets = struct.unpack_from(f'>{seg_count}H', data, range_base)
+
+    cmap = {}
+    for i in range(seg_count):
+        for cp in range(starts[i], ends[i] + 1):
+            if cp == 0xFFFF:
+                break
+            if range_offsets[i] == 0:
+                glyph = (cp + deltas[i]) & 0xFFFF
+            else:
+                address = range_base + 2 * i + range_offsets[i] + 2 * (cp - starts[i])
+                glyph, = struct.unpack_from('>H', data, address)
+                if glyph:
+                    glyph = (glyph + deltas[i]) & 0xFFFF
+            if glyph:
+                cmap[cp] = glyph
+    return cmap
+
+
+def _read_cmap12(data, start):
+    groups, = struct.unpack_from('>I', data, start + 12)
+    cmap = {}
+    for i in range(groups):
+        first, last, glyph = struct.unpack_from('>III', data, start + 16 + 12 * i)
+        for offset in range(last - first + 1):
+            cmap[first + offset] = glyph + offset
+    return cmap
+
+
+@functools.lru_cache(maxsize=1)
+def _font_files():
+    """Normalized file name -> path for every font file in the font directories"""
+    dirs = [d for d in os.environ.get(FONT_PATH_ENV, '').split(os.pathsep) if d]
+    dirs.extend(os.path.expanduser(d) for d in FONT_DIRS)
+    files = {}
+    for directory in dirs:
+        for root, _, names in os.walk(directory):
+            for name in names:
+                stem, ext = os.path.splitext(name)
+                if ext.lower() in ('.ttf', '.otf', '.ttc'):
+                    files.setdefault(_normalize(stem), os.path.join(root, name))
+    return files
+
+
+def load_font(family=DEFAULT_FONT, bold=False):
+    """FontMetrics for a family name (or a font file path), cached per process"""
+    return _load_font(family, bool(bold))
+
+
+@functools.lru_cache(maxsize=None)
+def _load_font(family, bold):
+    if os.path.isfile(family):
+        return FontMetrics.from_file(family)
+
+    files = _font_files()
+    suffixes = ('bold', 'b', 'bd') if bold else ('', 'regular', 'r')
+    names = (_normalize(family),) + FONT_ALIASES.get(_normalize(family), ())
+    for name in names:
+        for suffix in suffixes:
+            if name + suffix in files:
+                return FontMetrics.from_file(files[name + suffix])
+    if bold:
+        regular = _load_font(family, False)
+        return FontMetrics(regular.name, regular.advances, regular.default, regular.line_height, BOLD_FACTOR)
+    return FontMetrics(family)
+
+
+@functools.lru_cache(maxsize=None)
+def _warn_fallback(family):
+    """Say once per process that family's text was shrunk using estimated widths"""
+    print(f"⚠️  No font file for {family}; text was fitted with average character widths "
+          f"(add fonts to ${FONT_PATH_ENV})", file=sys.stderr)
+
+
+@dataclass(frozen=True)
+class Run:
+    text: str
+    size: float  # points
+    bold: bool = False
+
+
+@dataclass(frozen=True)
+class Paragraph:
+    runs: Tuple[Run, ...]
+    space_after: float = 0.0  # points
+
+
+@dataclass(frozen=True)
+class Box:
+    """Text box geometry in EMU; wrap=False boxes only break at line breaks"""
+    width: int
+    height: int
+    wrap: bool = True
+    insets: Tuple[int, int, int, int] = DEFAULT_INSETS
+
+    @property
+    def inner_width(self):
+        return (self.width - self.insets[0] - self.insets[2]) / EMU_PER_PT
+
+    @property
+    def inner_height(self):
+        return (self.height - self.insets[1] - self.insets[3]) / EMU_PER_PT
+
+
+def paragraph(text, size, bold=False, space_after=0.0):
+    """A single-run Paragraph"""
+    return Paragraph((Run(text, size, bold),), space_after)
+
+
+def _pieces(paragraph):
+    """Split a paragraph into (text, size, bold) words, spaces and None for line breaks"""
+    for run in paragraph.runs:
+        for i, line in enumerate(run.text.replace('\r', '\n').replace('\v', '\n').split('\n')):
+            if i:
+                yield None
+            for piece in _SPACE_RE.split(line):
+                if piece:
+                    yield piece, run.size, run.bold
+
+
+def wrap_lines(paragraph, width, font=DEFAULT_FONT, wrap=True):
+    """Lay a paragraph out into lines of at most width points
+
+    Returns (line width, line size) pairs, where line size is the largest
+    font size on the line. Words wider than a line are broken by character.
+    """
+    lines = []
+    line_width = 0.0
+    line_size = 0.0
+    pending = 0.0  # trailing spaces, only counted if a word follows
+
+    def measure(text, size, bold):
+        return load_font(font, bold).width(text) * size
+
+    for piece in _pieces(paragraph):
+        if piece is None:
+            lines.append((line_width, line_size or paragraph.runs[0].size))
+            line_width = line_size = pending = 0.0
+            continue
+        text, size, bold = piece
+        if text[0] == ' ':
+            pending += measure(text, size, bold)
+            line_size = max(line_size, size)
+            continue
+        word = measure(text, size, bold)
+        if wrap and line_width and line_width + pending + word > width:
+            lines.append((line_width, line_size))
+            line_width = line_size = 0.0
+        else:
+            line_width += pending
+        pending = 0.0
+        if wrap and word > width:
+            # A word wider than the box is broken by character
+            for char in text:
+                advance = measure(char, size, bold)
+                if line_width and line_width + advance > width:
+                    lines.append((line_width, max(line_size, size)))
+                    line_width = line_size = 0.0
+                line_width += advance
+        else:
+            line_width += word
+        line_size = max(line_size, size)
+    lines.append((line_width, line_size or paragraph.runs[0].size))
+    return lines
+
+
+@functools.lru_cache(maxsize=65536)
+def measure_box(paragraphs, box, font=DEFAULT_FONT):
+    """(widest line, total height) of paragraphs laid out in box, in points"""
+    line_height = load_font(font).line_height
+    widest = height = 0.0
+    for i, para in enumerate(paragraphs):
+        for width, size in wrap_lines(para, box.inner_width, font, box.wrap):
+            widest = max(widest, width)
+            height += size * line_height
+        if i < len(paragraphs) - 1:
+            height += para.space_after
+    return widest, height
+
+
+def fits(paragraphs, box, font=DEFAULT_FONT):
+    widest, height = measure_box(tuple(paragraphs), box, font)
+    return widest <= box.inner_width + 0.01 and height <= box.inner_height + 0.01
+
+
+def scaled(paragraphs, scale):
+    """paragraphs with every font size multiplied by scale, to half points"""
+    return tuple(Paragraph(tuple(Run(run.text, max(1.0, round(run.size * scale * 2) / 2), run.bold)
+                                 for run in para.runs), para.space_after)
+                 for para in paragraphs)
+
+
+@functools.lru_cache(maxsize=65536)
+def fit_scale(paragraphs, box, font=DEFAULT_FONT, min_scale=MIN_SCALE):
+    """Largest scale (1.0 down to min_scale) at which a tuple of paragraphs fits box, else None"""
+    steps = int(round((1.0 - min_scale) / SCALE_STEP))
+    for step in range(steps + 1):
+        scale = round(1.0 - step * SCALE_STEP, 4)
+        if fits(scaled(paragraphs, scale) if step else paragraphs, box, font):
+            break
+    else:
+        scale = None
+    if scale != 1.0 and load_font(font).fallback:
+        _warn_fallback(font)
+    return scale
+
@@ -0,0 +1,152 @@
+"""
+Heading bookmarks, [text](#anchor) links and interned external hyperlinks
+
+Every heading gets a bookmark named after its GitHub-style slug, so the
+table-of-contents links Markdown documents carry, [text](#slug), become
+internal hyperlinks to it. A link's bookmark name follows from the slug
+alone, so links ahead of their heading need no lookahead.
+
+Renderers write placeholders: a bookmark carries its heading's raw slug and
+ID 0, an external hyperlink carries its URL as r:id. The writer passes the
+body through one BodyLinks in document order, as it already does for
+drawing IDs, which numbers the bookmarks, suffixes repeated slugs as GitHub
+does (setup, setup-1, ...) and interns each URL to a single relationship,
+rIdLink1, rIdLink2, ... in order of first use, however many links share it.
+Fragments from worker processes and the section cache go through the same
+pass, so every path writes the same XML.
+"""
+
+import hashlib
+import html
+import re
+from xml.sax.saxutils import escape
+
+RT_HYPERLINK = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink'
+
+MAX_BOOKMARK = 40  # Word drops longer bookmark names
+
+_SLUG_DROP_RE = re.compile(r'[^\w\- ]')
+_BOOKMARK_RE = re.compile(r'[a-z0-9-]*')
+_PLACEHOLDER_RE = re.compile(
+    rb'<wp:docPr id="\d+"'
+    rb'|<w:bookmarkStart w:id="\d+" w:name="([^"]*)"'
+    rb'|<w:bookmarkEnd w:id="\d+"'
+    rb'|<w:hyperlink r:id="([^"]*)"'
+)
+_MARKERS = (b'<wp:docPr', b'<w:bookmark', b'<w:hyperlink r:id=')
+
+
+def slugify(text):
+    """GitHub's anchor for a heading: lower case, punctuation dropped, spaces to hyphens"""
+    return _SLUG_DROP_RE.sub('', text.strip().lower()).replace(' ', '-')
+
+
+def bookmark_name(slug):
+    """The Word bookmark for slug, hidden (leading '_') and at most 40 characters
+
+    Slugs that are plain ASCII and short enough stay readable; any other
+    is shortened and made unique with a hash of the full slug.
+    """
+    name = '_' + slug.replace('-', '_')
+    if _BOOKMARK_RE.fullmatch(slug) and len(name) <= MAX_BOOKMARK:
+        return name
+    digest = hashlib.sha1(slug.encode('utf-8')).hexdigest()[:8]
+    prefix = re.sub(r'[^a-z0-9]', '_', slug)[:MAX_BOOKMARK - 10]
+    return f'_{prefix}_{digest}'
+
+
+class HeadingSlugs:
+    """Gives each heading a unique slug in document order, as GitHub does"""
+
+    def __init__(self):
+        self.seen = set()
+        self._counts = {}
+
+    def unique(self, slug):
+        """slug the first time, then slug-1, slug-2, ... skipping any already taken"""
+        count = self._counts.get(slug, 0)
+        self._counts[slug] = count + 1
+        unique = f'{slug}-{count}' if count else slug
+        while unique in self.seen:
+            count += 1
+            unique = f'{slug}-{count}'
+        self.seen.add(unique)
+        return unique
+
+
+def is_anchor(target):
+    return target.startswith('#')
+
+
+def _attr(value):
+    return escape(value, {'"': '&quot;'})
+
+
+def bookmark_start_xml(slug):
+    """A placeholder bookmarkStart for a heading, completed by BodyLinks"""
+    return f'<w:bookmarkStart w:id="0" w:name="{_attr(slug)}"/>'
+
+
+BOOKMARK_END_XML = '<w:bookmarkEnd w:id="0"/>'
+
+
+def hyperlink_open_xml(target):
+    """The w:hyperlink start tag for a link; anchors are final, URLs placeholders"""
+    if is_anchor(target):
+        return f'<w:hyperlink w:anchor="{bookmark_name(target[1:])}">'
+    return f'<w:hyperlink r:id="{_attr(target)}">'
+
+
+class BodyLinks:
+    """Numbers drawings and bookmarks and interns URLs across a body, in order
+
+    headings maps each heading's final slug to its bookmark name, and urls
+    maps each external target to its relationship ID, both in document
+    order.
+    """
+
+    def __init__(self, next_drawing_id=1, next_bookmark_id=1):
+        self.next_drawing_id = next_drawing_id
+        self.next_bookmark_id = next_bookmark_id
+        self.headings = {}
+        self.urls = {}
+        self._slugs = HeadingSlugs()
+
+    def drawing(self):
+        self.next_drawing_id += 1
+        return self.next_drawing_id - 1
+
+    def bookmark(self, slug):
+        """(ID, name) for the next heading bookmark, repeated slugs suffixed"""
+        unique = self._slugs.unique(slug)
+        name = self.headings[unique] = bookmark_name(unique)
+        self.next_bookmark_id += 1
+        return self.next_bookmark_id - 1, name
+
+    def bookmark_end(self):
+        # Heading bookmarks never nest, so an end closes the latest start
+        return self.next_bookmark_id - 1
+
+    def url(self, target):
+        """The relationship ID for an external target, one per distinct target"""
+        rid = self.urls.get(target)
+        if rid is None:
+            rid = self.urls[target] = f'rIdLink{len(self.urls) + 1}'
+        return rid
+
+    def _replace(self, match):
+        tag = match.group(0)
+        if tag.startswith(b'<wp:docPr'):
+            return b'<wp:docPr id="%d"' % self.drawing()
+        if tag.startswith(b'<w:bookmarkStart'):
+            bookmark_id, name = self.bookmark(html.unescape(match.group(1).decode('utf-8')))
+            return b'<w:bookmarkStart w:id="%d" w:name="%s"' % (bookmark_id, name.encode())
+        if tag.startswith(b'<w:bookmarkEnd'):
+            return b'<w:bookmarkEnd w:id="%d"' % self.bookmark_end()
+        return b'<w:hyperlink r:id="%s"' % self.url(html.unescape(match.group(2).decode('utf-8'))).encode()
+
+    def rewrite(self, xml):
+        """Complete the placeholders in serialized body XML"""
+        if not any(marker in xml for marker in _MARKERS):
+            return xml
+        return _PLACEHOLDER_RE.sub(self._replace, xml)
@@ -0,0 +1,276 @@
+"""
+Fast backend: render the Markdown AST straight to WordprocessingML text
+
+Produces the same document.xml as docx_render, but builds each body element
+from precompiled string templates instead of python-docx proxy objects.
+python-docx is only used to build the theme's BaseTemplate, once per process.
+"""
+
+import os
+import re
+from itertools import islice
+from xml.sax.saxutils import escape
+
+from mdconvert.blocks import CHECKMARKS, iter_blocks, iter_lines
+from mdconvert.images import DocumentImages, drawing_xml, image_blocks
+from mdconvert.inline import tokenize_inline
+from mdconvert.links import BOOKMARK_END_XML, bookmark_start_xml, hyperlink_open_xml, slugify
+from mdconvert.package import DEFAULT_COMPRESSION, write_package
+from mdconvert.parallel import render_spans
+from mdconvert.profile import NULL_PROFILER
+from mdconvert.source import SourceIndex
+from mdconvert.tables import table_xml
+from mdconvert.template import load_template
+
+FLUSH_BLOCKS = 1024
+INDENT_TWIPS = 360  # Inches(0.25)
+
+_BREAK_RE = re.compile(r'([\t\r\n])')
+_BOLD = '<w:rPr><w:b/></w:rPr>'
+_ITALIC = '<w:rPr><w:i/></w:rPr>'
+_BOLD_ITALIC = '<w:rPr><w:b/><w:i/></w:rPr>'
+_RULE_LINE = '<w:rPr><w:color w:val="C0C0C0"/></w:rPr>'
+_RULE_SPACE = '<w:p><w:pPr><w:spacing w:before="120" w:after="120"/></w:pPr></w:p>'
+_EMPTY_P = '<w:p/>'
+
+
+def _text(text):
+    # Same whitespace test python-docx uses for xml:space="preserve"
+    if len(text.strip()) < len(text):
+        return f'<w:t xml:space="preserve">{escape(text)}</w:t>'
+    return f'<w:t>{escape(text)}</w:t>'
+
+
+def run_xml(text, rpr=''):
+    """A w:r element for text, with tabs and line breaks as python-docx writes them"""
+    if _BREAK_RE.search(text) is None:
+        content = _text(text) if text else ''
+    else:
+        parts = []
+        for piece in _BREAK_RE.split(text):
+            if piece == '\t':
+                parts.append('<w:tab/>')
+            elif piece == '\n' or piece == '\r':
+                parts.append('<w:br/>')
+            elif piece:
+                parts.append(_text(piece))
+        content = ''.join(parts)
+    if not rpr and not content:
+        return '<w:r/>'
+    return f'<w:r>{rpr}{content}</w:r>'
+
+
+def _style_ppr(style_id):
+    return f'<w:pPr><w:pStyle w:val="{style_id}"/></w:pPr>'
+
+
+class OoxmlRenderer:
+    """Turn AST blocks into body XML strings using a theme's registered styles"""
+
+    def __init__(self, theme, style_ids, width):
+        self.theme = theme
+        self.style_ids = style_ids
+        self.width = width
+        self._ppr = {role: _style_ppr(style_id) for role, style_id in style_ids.items()}
+        self._strong = f'<w:rPr><w:rStyle w:val="{style_ids["strong"]}"/></w:rPr>'
+        self._inline_code = f'<w:rPr><w:rStyle w:val="{style_ids["inline_code"]}"/></w:rPr>'
+        self._link = f'<w:rStyle w:val="{style_ids["link"]}"/>'
+        self._list_ppr = {}
+        self.use_images('')
+        self._drawing_id = 0
+        self._handlers = {
+            'heading': self.heading,
+            'paragraph': self.paragraph,
+            'list_item': self.list_item,
+            'quote': self.quote,
+            'table': self.table,
+            'code': self.code,
+            'metadata': self.metadata,
+            'rule': self.rule,
+            'blank': self.blank,
+            'image': self.image,
+        }
+
+    def use_images(self, base_dir):
+        """Resolve image paths against base_dir, the Markdown file's directory"""
+        self.images = DocumentImages(base_dir, self.width, self.theme.image_dpi)
+
+    def profile(self, profiler):
+        """Record per-block timings and the runs and elements each block adds"""
+        def count(token, xml):
+            runs = xml.count('<w:r>') + xml.count('<w:r/>')
+            return runs, xml.count('<') - xml.count('</')
+
+        self._handlers = profiler.instrument(self._handlers, lambda: None, count)
+
+    def render(self, blocks):
+        """Return the body XML for blocks as one string"""
+        handlers = self._handlers
+        return ''.join([handlers[block.kind](block) for block in blocks])
+
+    def _paragraph(self, ppr='', runs=''):
+        if not ppr and not runs:
+            return _EMPTY_P
+        return f'<w:p>{ppr}{runs}</w:p>'
+
+    def inline_runs(self, text):
+        """Runs for text with inline formatting applied, as DocxRenderer adds them"""
+        runs = []
+        strong = self._strong if self.theme.bold_color is not None else None
+        link = None
+        for token in tokenize_inline(text):
+            if token.link != link:
+                if link is not None:
+                    runs.append('</w:hyperlink>')
+                if token.link is not None:
+                    runs.append(hyperlink_open_xml(token.link))
+                link = token.link
+            if link is not None:
+                rpr = f'<w:rPr>{self._link}{"<w:b/>" if token.bold else ""}{"<w:i/>" if token.italic else ""}</w:rPr>'
+            elif token.code:
+                rpr = self._inline_code
+            elif token.bold and strong is not None:
+                rpr = strong
+            elif token.bold:
+                rpr = _BOLD_ITALIC if token.italic else _BOLD
+            elif token.italic:
+                rpr = _ITALIC
+            else:
+                rpr = ''
+            runs.append(run_xml(token.text, rpr))
+        if link is not None:
+            runs.append('</w:hyperlink>')
+        return ''.join(runs)
+
+    def heading(self, block):
+        runs = run_xml(block.text) if block.text else ''
+        slug = slugify(block.text)
+        if slug:
+            runs = bookmark_start_xml(slug) + runs + BOOKMARK_END_XML
+        return self._paragraph(self._ppr[f'heading{block.level}'], runs)
+
+    def paragraph(self, block):
+        return self._paragraph('', self.inline_runs(block.text))
+
+    def _list_ppr_for(self, role, level):
+        key = (role, level)
+        ppr = self._list_ppr.get(key)
+        if ppr is None:
+            ppr = (f'<w:pPr><w:pStyle w:val="{self.style_ids[role]}"/>'
+                   f'<w:ind w:left="{INDENT_TWIPS * (level + 1)}"/></w:pPr>')
+            self._list_ppr[key] = ppr
+        return ppr
+
+    def list_item(self, block):
+        # Checkmark callouts stay regular paragraphs unless the theme lists them
+        if block.marker in CHECKMARKS and not self.theme.checkmark_bullets:
+            return self._paragraph('', self.inline_runs(block.marker + ' ' + block.text))
+
+        text = block.text
+        if block.marker in CHECKMARKS:
+            text = block.marker + ' ' + text
+        ppr = self._list_ppr_for('list_number' if block.ordered else 'list_bullet', block.level)
+        return self._paragraph(ppr, self.inline_runs(text))
+
+    def quote(self, block):
+        return self._paragraph(self._ppr['quote'], self.inline_runs(block.text))
+
+    def code(self, block):
+        if not block.lines:
+            return ''
+        text = '\n'.join(block.lines)
+        return self._paragraph(self._ppr['code'], run_xml(text) if text else '')
+
+    def table(self, block):
+        if not block.rows:
+            return ''
+        xml = table_xml(block.header, block.rows, self.style_ids['table'],
+                        self.style_ids['table_header'], self.width)
+        if self.theme.space_after_table:
+            xml += _EMPTY_P
+        return xml
+
+    def metadata(self, block):
+        if not self.theme.metadata_lines:
+            return self.paragraph(block)
+        if block.key is not None:
+            return self._paragraph('', run_xml(block.key + ': ', _BOLD) + run_xml(block.value))
+        return self._paragraph('', run_xml(block.text))
+
+    def rule(self, block):
+        if self.theme.rule == 'space':
+            return _RULE_SPACE
+        return self._paragraph('', run_xml('_' * 80, _RULE_LINE))
+
+    def blank(self, block):
+        return _EMPTY_P
+
+    def image(self, block):
+        image = self.images.resolve(block.path)
+        if image is None:
+            return self.paragraph(block)
+        self._drawing_id += 1
+        return drawing_xml(image, self._drawing_id, os.path.basename(block.path), block.alt)
+
+
+def convert_markdown(md_file, docx_file, theme, flush_blocks=FLUSH_BLOCKS, profiler=NULL_PROFILER,
+                     template=None, workers=1, compression=DEFAULT_COMPRESSION, search=None):
+    """Convert a Markdown file to a Word document with the fast backend
+
+    The input is read and written incrementally, so memory stays bounded
+    like stream_markdown's. workers > 1 instead indexes the file (see
+    mdconvert.source) and renders its sections in that many processes, each
+    parsing its own section; profiling always renders serially. A
+    mdconvert.search DocumentIndex passed as search is fed each chunk of
+    blocks as it is parsed. Returns the PackageStats.
+    """
+    if workers > 1 and not profiler.enabled:
+        return _convert_parallel(md_file, docx_file, theme, profiler, template, workers, compression, search)
+
+    with profiler.phase('setup'):
+        base = load_template(theme, template)
+        renderer = OoxmlRenderer(theme, base.style_ids, base.width)
+        renderer.use_images(os.path.dirname(md_file))
+    if profiler.enabled:
+        renderer.profile(profiler)
+    with profiler.phase('images'):
+        images = renderer.images.scan(image_blocks(md_file))
+
+    def write_body(out):
+        with open(md_file, 'r', encoding='utf-8') as f:
+            blocks = iter_blocks(iter_lines(f))
+            while True:
+                with profiler.phase('parse'):
+                    chunk = list(islice(blocks, flush_blocks))
+                if not chunk:
+                    break
+                if search is not None:
+                    with profiler.phase('index'):
+                        search.add(chunk)
+                with profiler.phase('render'):
+                    xml = renderer.render(chunk).encode('utf-8')
+                with profiler.phase('write'):
+                    out.write(xml)
+
+    return write_package(base, docx_file, write_body, profiler, compression, images)
+
+
+def _convert_parallel(md_file, docx_file, theme, profiler, template, workers, compression, search):
+    with profiler.phase('setup'):
+        base = load_template(theme, template)
+    with profiler.phase('parse'):
+        with SourceIndex(md_file) as index:
+            spans = index.section_spans()
+            # The workers parse the sections; the search index needs its own pass
+            if search is not None:
+                for section in index.sections():
+                    search.add(section)
+    with profiler.phase('images'):
+        images = DocumentImages(os.path.dirname(md_file), base.width, theme.image_dpi).scan(image_blocks(md_file))
+
+    def write_body(out):
+        with profiler.phase('render'):
+            for fragment in render_spans(md_file, spans, theme, 'ooxml', template, workers):
+                out.write(fragment)
+
+    return write_package(base, docx_file, write_body, profiler, compression, images)
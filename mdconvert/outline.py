@@ -0,0 +1,139 @@
+"""
+Outline slide decks from the Markdown document AST
+
+The document's H1 becomes a title slide, with the text before the first H2
+as its subtitle, and every H2 starts a Title and Content slide. The blocks
+under it become the slide's bullets: list items at their level, paragraphs,
+quotes and metadata at the top level, H3/H4 headings as bold bullets and
+table rows as one bullet each. Code blocks and images are left to the Word
+and HTML versions. Text is not fitted to the slide; an outline is a
+starting point to edit in PowerPoint (mdconvert.slides paginates to fit).
+
+Decks are written with PackageZip, so they are reproducible and compressed
+like every other output.
+"""
+
+import io
+import zipfile
+
+from pptx import Presentation
+from pptx.dml.color import RGBColor
+
+from mdconvert.blocks import CHECKMARKS
+from mdconvert.inline import tokenize_inline
+from mdconvert.links import is_anchor
+from mdconvert.package import DEFAULT_COMPRESSION, PackageZip
+
+TITLE_LAYOUT = 0
+CONTENT_LAYOUT = 1
+MAX_LEVEL = 4  # deepest bullet level the default layouts style
+
+
+def save_presentation(prs, pptx_file, compression=DEFAULT_COMPRESSION):
+    """Save a python-pptx Presentation through PackageZip and return its PackageStats"""
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    with zipfile.ZipFile(buffer) as package, PackageZip(pptx_file, compression) as output:
+        output.write_all([(info.filename, package.read(info)) for info in package.infolist()])
+    return output.stats()
+
+
+class OutlineRenderer:
+    """Add AST blocks to a python-pptx Presentation as title and bullet slides"""
+
+    def __init__(self, theme, prs=None):
+        self.theme = theme
+        self.prs = prs or Presentation()
+        self.frame = None     # text frame bullets go to, None before the first slide
+        self.subtitle = None  # the title slide's subtitle, until the first H2
+        self._empty = False   # the frame still holds only its initial empty paragraph
+        self._handlers = {
+            'heading': self.heading,
+            'paragraph': self.paragraph,
+            'list_item': self.list_item,
+            'quote': self.quote,
+            'table': self.table,
+            'code': self.skip,
+            'metadata': self.metadata,
+            'rule': self.skip,
+            'blank': self.skip,
+            'image': self.skip,
+        }
+
+    def render(self, blocks):
+        handlers = self._handlers
+        for block in blocks:
+            handlers[block.kind](block)
+
+    def _slide(self, layout, title, level):
+        slide = self.prs.slides.add_slide(self.prs.slide_layouts[layout])
+        slide.shapes.title.text = title
+        font = slide.shapes.title.text_frame.paragraphs[0].font
+        font.color.rgb = RGBColor.from_string(self.theme.heading(level).color)
+        return slide
+
+    def _bullet(self, text, level=0, bold=False, italic=False):
+        frame = self.frame if self.frame is not None else self.subtitle
+        if frame is None:
+            # Text before any heading opens an untitled slide
+            self.frame = self._slide(CONTENT_LAYOUT, '', 2).placeholders[1].text_frame
+            self._empty = True
+            frame = self.frame
+        para = frame.paragraphs[0] if self._empty else frame.add_paragraph()
+        self._empty = False
+        para.level = min(level, MAX_LEVEL)
+        for token in tokenize_inline(text):
+            run = para.add_run()
+            run.text = token.text
+            if token.bold or bold:
+                run.font.bold = True
+            if token.italic or italic:
+                run.font.italic = True
+            if token.link is not None and not is_anchor(token.link):
+                run.hyperlink.address = token.link
+
+    def heading(self, block):
+        if block.level == 1 and self.frame is None and self.subtitle is None:
+            slide = self._slide(TITLE_LAYOUT, block.text, 1)
+            self.subtitle = slide.placeholders[1].text_frame
+            self._empty = True
+        elif block.level <= 2:
+            slide = self._slide(CONTENT_LAYOUT, block.text, block.level)
+            self.frame = slide.placeholders[1].text_frame
+            self.subtitle = None
+            self._empty = True
+        else:
+            self._bullet(block.text, bold=True)
+
+    def paragraph(self, block):
+        self._bullet(block.text)
+
+    def list_item(self, block):
+        if block.marker in CHECKMARKS and not self.theme.checkmark_bullets:
+            self._bullet(block.marker + ' ' + block.text)
+            return
+        text = block.marker + ' ' + block.text if block.marker in CHECKMARKS else block.text
+        self._bullet(text, block.level)
+
+    def quote(self, block):
+        self._bullet(block.text, italic=True)
+
+    def table(self, block):
+        for row in block.rows:
+            self._bullet(' — '.join(cell for cell in row if cell))
+
+    def metadata(self, block):
+        if block.key is not None and self.theme.metadata_lines:
+            self._bullet(f'**{block.key}:** {block.value}')
+        else:
+            self._bullet(block.text)
+
+    def skip(self, block):
+        pass
+
+
+def write_outline(blocks, pptx_file, theme, compression=DEFAULT_COMPRESSION):
+    """Write blocks as an outline deck and return its PackageStats"""
+    renderer = OutlineRenderer(theme)
+    renderer.render(blocks)
+    return save_presentation(renderer.prs, pptx_file, compression)
@@ -0,0 +1,641 @@
+"""
+Write .docx and .pptx packages: stamped zip entries, compressed per profile
+
+Every part except word/document.xml is copied from a BaseTemplate, which
+carries the styles and page setup, and the body XML is written directly
+into the zip entry instead of being built as a tree first.
+
+Every zip entry any writer here makes carries the same fixed timestamp and
+attributes, so converting the same input twice gives identical bytes. The
+timestamp is $SOURCE_DATE_EPOCH when set, as for other reproducible builds,
+and otherwise the earliest date a zip can hold.
+
+A compression profile picks how hard parts are deflated: 'store' for
+scratch CI artifacts, 'max' for published downloads. Parts over
+CHUNK_SIZE, in practice document.xml and media, are deflated a chunk at a
+time across threads (zlib releases the GIL), each chunk primed with the
+end of the one before, as pigz does. The chunks join into one valid
+deflate stream. ZipWriter then only lays out the entries: local headers,
+the central directory and the end record, with zip64 records where sizes
+or offsets need them.
+"""
+
+import io
+import os
+import re
+import struct
+import time
+import zlib
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+
+from docx.opc.constants import CONTENT_TYPE
+from docx.opc.packuri import PACKAGE_URI
+from lxml import etree
+
+from mdconvert.cpus import available_cpus
+from mdconvert.images import RT_IMAGE
+from mdconvert.links import RT_HYPERLINK, BodyLinks
+from mdconvert.profile import NULL_PROFILER
+from mdconvert.store import staging_path
+
+DOCUMENT_PART = 'word/document.xml'
+DOCUMENT_RELS_PART = 'word/_rels/document.xml.rels'
+CONTENT_TYPES_PART = '[Content_Types].xml'
+ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+
+# Profile name -> zlib level, None meaning stored uncompressed
+COMPRESSION_PROFILES = {
+    'store': None,
+    'fast': 1,
+    'default': 6,  # zlib's default, what Document.save uses
+    'max': 9,
+}
+DEFAULT_COMPRESSION = 'default'
+CHUNK_SIZE = 1 << 20
+INLINE_SIZE = 64 * 1024  # smaller parts are not worth a thread hop
+_WINDOW = 32 * 1024
+
+_XMLNS_RE = re.compile(rb' xmlns(?::[\w.-]+)?="[^"]*"')
+
+# Zip records (APPNOTE.TXT 4.3) and the limits past which zip64 ones are needed
+_LOCAL_HEADER = struct.Struct('<4s2B4HL2L2H')
+_CENTRAL_HEADER = struct.Struct('<4s4B4HL2L5H2L')
+_END_RECORD = struct.Struct('<4s4H2LH')
+_ZIP64_END_RECORD = struct.Struct('<4sQ2H2L4Q')
+_ZIP64_LOCATOR = struct.Struct('<4sLQL')
+_ZIP64_LIMIT = (1 << 31) - 1
+_ZIP64_COUNT_LIMIT = 0xFFFF
+_ZIP64_EXTRA_SIZE = 20  # header ID, data size and both sizes, in a local header
+_VERSION = 20        # needed to extract deflated entries
+_ZIP64_VERSION = 45
+_UNIX = 3            # "made by" host system, so the permissions below apply
+_ATTRIBUTES = 0o600 << 16
+_UTF8_FLAG = 0x800
+_STORED, _DEFLATED = 0, 8
+_CONTENT_TYPES_NS = 'http://schemas.openxmlformats.org/package/2006/content-types'
+_RELATIONSHIPS_END = b'</Relationships>'
+
+# (extension, content type) pairs written as a Default rather than an
+# Override, the same table python-docx saves with
+_DEFAULT_CONTENT_TYPES = frozenset([
+    ('bin', 'application/vnd.openxmlformats-officedocument.presentationml.printerSettings'),
+    ('bin', 'application/vnd.openxmlformats-officedocument.spreadsheetml.printerSettings'),
+    ('bin', 'application/vnd.openxmlformats-officedocument.wordprocessingml.printerSettings'),
+    ('bmp', 'image/bmp'),
+    ('emf', 'image/x-emf'),
+    ('fntdata', 'application/x-fontdata'),
+    ('gif', 'image/gif'),
+    ('jpe', 'image/jpeg'),
+    ('jpeg', 'image/jpeg'),
+    ('jpg', 'image/jpeg'),
+    ('png', 'image/png'),
+    ('rels', CONTENT_TYPE.OPC_RELATIONSHIPS),
+    ('tif', 'image/tiff'),
+    ('tiff', 'image/tiff'),
+    ('wdp', 'image/vnd.ms-photo'),
+    ('wmf', 'image/x-wmf'),
+    ('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+    ('xml', CONTENT_TYPE.XML),
+])
+
+_threads = None
+_threads_pid = None
+_thread_count = 1
+
+
+def _zip_date_time():
+    epoch = os.environ.get('SOURCE_DATE_EPOCH')
+    if not epoch:
+        return ZIP_EPOCH
+    return max(ZIP_EPOCH, time.gmtime(int(epoch))[:6])
+
+
+ZIP_DATE_TIME = _zip_date_time()
+
+
+def _dos_date_time(date_time):
+    year, month, day, hour, minute, second = date_time
+    return (year - 1980) << 9 | month << 5 | day, hour << 11 | minute << 5 | second // 2
+
+
+_DOS_DATE, _DOS_TIME = _dos_date_time(ZIP_DATE_TIME)
+
+
+class _Entry:
+    """What the central directory records about one written entry"""
+    __slots__ = ('name', 'flags', 'method', 'crc', 'size', 'compressed', 'offset', 'version')
+
+    def __init__(self, name, level, offset):
+        try:
+            self.name, self.flags = name.encode('ascii'), 0
+        except UnicodeEncodeError:
+            self.name, self.flags = name.encode('utf-8'), _UTF8_FLAG
+        self.method = _STORED if level is None else _DEFLATED
+        self.crc = self.size = self.compressed = 0
+        self.offset = offset
+        self.version = _VERSION
+
+    def local_header(self, zip64):
+        """The local file header, with zip64 sizes when zip64 is true"""
+        size, compressed, extra = self.size, self.compressed, b''
+        if zip64:
+            extra = struct.pack('<HHQQ', 1, _ZIP64_EXTRA_SIZE - 4, size, compressed)
+            size = compressed = 0xFFFFFFFF
+            self.version = _ZIP64_VERSION
+        return _LOCAL_HEADER.pack(b'PK\x03\x04', self.version, 0, self.flags, self.method, _DOS_TIME, _DOS_DATE,
+                                  self.crc, compressed, size, len(self.name), len(extra)) + self.name + extra
+
+    def central_header(self):
+        size, compressed, offset, wide = self.size, self.compressed, self.offset, []
+        if size > _ZIP64_LIMIT or compressed > _ZIP64_LIMIT:
+            wide += [size, compressed]
+            size = compressed = 0xFFFFFFFF
+        if offset > _ZIP64_LIMIT:
+            wide.append(offset)
+            offset = 0xFFFFFFFF
+        extra = struct.pack(f'<HH{len(wide)}Q', 1, 8 * len(wide), *wide) if wide else b''
+        version = max(self.version, _ZIP64_VERSION) if wide else self.version
+        return _CENTRAL_HEADER.pack(b'PK\x01\x02', version, _UNIX, version, 0, self.flags, self.method,
+                                    _DOS_TIME, _DOS_DATE, self.crc, compressed, size, len(self.name), len(extra),
+                                    0, 0, 0, _ATTRIBUTES, offset) + self.name + extra
+
+
+class ZipWriter:
+    """Lays out a zip archive on a binary file: entries in order, then the directory
+
+    Every entry carries ZIP_DATE_TIME and the same attributes. Entries are
+    either written whole, with their sizes known (write), or started with a
+    plain header that finish() rewrites in place once their data is in. An
+    entry that turns out to need zip64 sizes has its data moved up to make
+    room for them, so fp must be readable as well as seekable.
+    """
+
+    def __init__(self, fp):
+        self.fp = fp
+        self.entries = []
+
+    def write(self, name, level, crc, size, data):
+        """Append an entry whose data (compressed per level) is complete"""
+        entry = _Entry(name, level, self.fp.tell())
+        entry.crc, entry.size, entry.compressed = crc, size, len(data)
+        self.fp.write(entry.local_header(size > _ZIP64_LIMIT or len(data) > _ZIP64_LIMIT))
+        self.fp.write(data)
+        self.entries.append(entry)
+
+    def start(self, name, level):
+        """Begin an entry whose data the caller writes to fp; complete it with finish"""
+        entry = _Entry(name, level, self.fp.tell())
+        self.fp.write(entry.local_header(zip64=False))
+        return entry
+
+    def finish(self, entry, crc, size, compressed):
+        entry.crc, entry.size, entry.compressed = crc, size, compressed
+        end = self.fp.tell()
+        zip64 = size > _ZIP64_LIMIT or compressed > _ZIP64_LIMIT
+        if zip64:
+            end = self._widen(entry, end)
+        self.fp.seek(entry.offset)
+        self.fp.write(entry.local_header(zip64))
+        self.fp.seek(end)
+        self.entries.append(entry)
+
+    def _widen(self, entry, end):
+        """Move entry's data up by the size of a zip64 extra; returns the new end"""
+        start = entry.offset + _LOCAL_HEADER.size + len(entry.name)
+        position = end
+        while position > start:
+            size = min(CHUNK_SIZE, position - start)
+            position -= size
+            self.fp.seek(position)
+            data = self.fp.read(size)
+            self.fp.seek(position + _ZIP64_EXTRA_SIZE)
+            self.fp.write(data)
+        return end + _ZIP64_EXTRA_SIZE
+
+    def close(self):
+        """Write the central directory and end of archive records"""
+        fp = self.fp
+        start = fp.tell()
+        fp.write(b''.join(entry.central_header() for entry in self.entries))
+        end = fp.tell()
+        count, size = len(self.entries), end - start
+        if count > _ZIP64_COUNT_LIMIT or start > _ZIP64_LIMIT or size > _ZIP64_LIMIT:
+            fp.write(_ZIP64_END_RECORD.pack(b'PK\x06\x06', 44, _ZIP64_VERSION, _ZIP64_VERSION, 0, 0,
+                                            count, count, size, start))
+            fp.write(_ZIP64_LOCATOR.pack(b'PK\x06\x07', 0, end, 1))
+            count, size, start = min(count, 0xFFFF), min(size, 0xFFFFFFFF), min(start, 0xFFFFFFFF)
+        fp.write(_END_RECORD.pack(b'PK\x05\x06', 0, 0, count, count, size, start, 0))
+
+
+def compression_level(compression):
+    """The zlib level for a compression profile name"""
+    try:
+        return COMPRESSION_PROFILES[compression]
+    except KeyError:
+        raise ValueError(f"Unknown compression profile '{compression}'; "
+                         f"expected one of {sorted(COMPRESSION_PROFILES)}") from None
+
+
+def _thread_pool():
+    """Threads for deflating chunks, or None on a single CPU"""
+    global _threads, _threads_pid, _thread_count
+    # A pool inherited through fork has no threads behind it
+    if _threads_pid != os.getpid():
+        _thread_count = available_cpus()
+        if _thread_count > 1:
+            from concurrent.futures import ThreadPoolExecutor
+
+            _threads = ThreadPoolExecutor(_thread_count, thread_name_prefix='deflate')
+        else:
+            _threads = None
+        _threads_pid = os.getpid()
+    return _threads
+
+
+def _deflate(data, level, primer=b'', last=True):
+    """Raw deflate data; a chunk that is not the last ends on a byte boundary"""
+    if primer:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15, zdict=primer)
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+
+def _submit(function, *args, size=CHUNK_SIZE):
+    pool = _thread_pool() if size > INLINE_SIZE else None
+    if pool is not None:
+        return pool.submit(function, *args)
+    future = Future()
+    future.set_result(function(*args))
+    return future
+
+
+class CompressedPart:
+    """A part's compressed bytes with what its zip entry records about them"""
+    __slots__ = ('name', 'data', 'crc', 'size', 'level')
+
+    def __init__(self, name, data, crc, size, level):
+        self.name = name
+        self.data = data
+        self.crc = crc
+        self.size = size
+        self.level = level
+
+
+class _PendingPart:
+    def __init__(self, name, data, level):
+        self.name = name
+        self.level = level
+        self.size = len(data)
+        self.crc = zlib.crc32(data)
+        if level is None:
+            self._chunks = [_submit(bytes, data, size=0)]
+            return
+        view = memoryview(data)
+        self._chunks = [
+            _submit(_deflate, view[start:start + CHUNK_SIZE], level,
+                    bytes(view[max(0, start - _WINDOW):start]), start + CHUNK_SIZE >= len(data),
+                    size=len(data))
+            for start in range(0, max(len(data), 1), CHUNK_SIZE)
+        ]
+
+    def result(self):
+        data = b''.join(chunk.result() for chunk in self._chunks)
+        return CompressedPart(self.name, data, self.crc, self.size, self.level)
+
+
+def compress_parts(parts, compression=DEFAULT_COMPRESSION):
+    """CompressedParts for (name, bytes) pairs, deflated concurrently"""
+    level = compression_level(compression)
+    pending = [_PendingPart(name, data, level) for name, data in parts]
+    return [part.result() for part in pending]
+
+
+class StaticParts:
+    """Parts copied unchanged into every output, compressed once per profile"""
+
+    def __init__(self, parts):
+        self.parts = parts
+        self._compressed = {}
+
+    def data(self, name):
+        return next(data for part_name, data in self.parts if part_name == name)
+
+    def compressed(self, compression=DEFAULT_COMPRESSION):
+        parts = self._compressed.get(compression)
+        if parts is None:
+            parts = self._compressed[compression] = compress_parts(self.parts, compression)
+        return parts
+
+    @classmethod
+    def from_zip(cls, package, skip=()):
+        """The parts of an open zip, in order, except those named in skip"""
+        return cls([(info.filename, package.read(info.filename))
+                    for info in package.infolist() if info.filename not in skip])
+
+
+@dataclass
+class PackageStats:
+    """What writing one package cost"""
+    save_seconds: float
+    output_bytes: int
+    uncompressed_bytes: int
+
+
+class PackageZip:
+    """A package written part by part with stamped entries and a compression profile
+
+    The seconds spent in its methods, compressing and writing, add up to
+    the save time in stats(). Given a path, the package is written to a
+    staging file beside it that replaces the path only when close()
+    finishes; leaving the with block on an exception discards it, so a
+    failed conversion never overwrites a good output.
+    """
+
+    def __init__(self, file, compression=DEFAULT_COMPRESSION):
+        start = time.perf_counter()
+        self.level = compression_level(compression)
+        self._owns_file = isinstance(file, (str, os.PathLike))
+        self._path = os.fspath(file) if self._owns_file else None
+        self._staged = staging_path(self._path) if self._owns_file else None
+        # Readable too: ZipWriter may move a streamed part up to widen its header
+        self._file = open(self._staged, 'w+b') if self._owns_file else file
+        self._writer = ZipWriter(self._file)
+        self.seconds = 0.0
+        self.uncompressed_bytes = 0
+        self.output_bytes = 0
+        self.seconds += time.perf_counter() - start
+
+    def add(self, part):
+        """Append an already compressed part"""
+        start = time.perf_counter()
+        self._writer.write(part.name, part.level, part.crc, part.size, part.data)
+        self.uncompressed_bytes += part.size
+        self.seconds += time.perf_counter() - start
+
+    def add_all(self, parts):
+        for part in parts:
+            self.add(part)
+
+    def write_all(self, parts):
+        """Compress (name, bytes) pairs concurrently and append them in order"""
+        start = time.perf_counter()
+        pending = [_PendingPart(name, data, self.level) for name, data in parts]
+        self.seconds += time.perf_counter() - start
+        for part in pending:
+            self.add(part.result())
+
+    def open(self, name):
+        """A binary file object for a part whose bytes are written as they come"""
+        return _PartStream(self, name)
+
+    def close(self):
+        if self._file is None:
+            return
+        start = time.perf_counter()
+        self._writer.close()
+        self.output_bytes = self._file.tell()
+        if self._owns_file:
+            self._file.close()
+            os.replace(self._staged, self._path)
+        self._file = None
+        self.seconds += time.perf_counter() - start
+
+    def abort(self):
+        """Stop without finishing the zip, removing the staging file"""
+        if self._file is None:
+            return
+        if self._owns_file:
+            self._file.close()
+            try:
+                os.remove(self._staged)
+            except OSError:
+                pass
+        self._file = None
+
+    def stats(self):
+        return PackageStats(round(self.seconds, 6), self.output_bytes, self.uncompressed_bytes)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        if exc_info[0] is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class _PartStream(io.RawIOBase):
+    """A part streamed into a PackageZip, deflated in chunks behind the writer"""
+
+    def __init__(self, package, name):
+        self._package = package
+        self._level = package.level
+        self._buffer = bytearray()
+        self._pending = deque()
+        self._primer = b''
+        _thread_pool()
+        self._limit = 2 * _thread_count
+        self._crc = 0
+        self._size = 0
+        self._compressed = 0
+        self._entry = package._writer.start(name, package.level)
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        start = time.perf_counter()
+        self._buffer += data
+        self._crc = zlib.crc32(data, self._crc)
+        self._size += len(data)
+        while len(self._buffer) >= CHUNK_SIZE:
+            chunk = bytes(self._buffer[:CHUNK_SIZE])
+            del self._buffer[:CHUNK_SIZE]
+            self._submit(chunk, last=False)
+        self._package.seconds += time.perf_counter() - start
+        return len(data)
+
+    def _submit(self, chunk, last):
+        if self._level is None:
+            self._pending.append(_submit(bytes, chunk, size=0))
+        else:
+            self._pending.append(_submit(_deflate, chunk, self._level, self._primer, last, size=len(chunk)))
+            self._primer = chunk[-_WINDOW:]
+        while len(self._pending) > self._limit:
+            self._flush_one()
+
+    def _flush_one(self):
+        data = self._pending.popleft().result()
+        self._package._writer.fp.write(data)
+        self._compressed += len(data)
+
+    def close(self):
+        if self.closed:
+            return
+        start = time.perf_counter()
+        self._submit(bytes(self._buffer), last=True)
+        self._buffer = bytearray()
+        while self._pending:
+            self._flush_one()
+
+        package = self._package
+        package._writer.finish(self._entry, self._crc, self._size, self._compressed)
+        package.uncompressed_bytes += self._size
+        package.seconds += time.perf_counter() - start
+        super().close()
+
+    def __exit__(self, *exc_info):
+        if exc_info[0] is None:
+            self.close()
+            return
+        # The package is abandoned; don't finish a truncated entry
+        for future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        super().close()
+
+
+def content_types_xml(part_types):
+    """[Content_Types].xml for (partname, content type) pairs, as python-docx saves it
+
+    A part whose extension and type are a standard pairing is covered by a
+    Default for the extension, any other by an Override; both are sorted.
+    """
+    defaults = {'rels': CONTENT_TYPE.OPC_RELATIONSHIPS, 'xml': CONTENT_TYPE.XML}
+    overrides = {}
+    for partname, content_type in part_types:
+        ext = os.path.splitext(partname)[1][1:]
+        if (ext.lower(), content_type) in _DEFAULT_CONTENT_TYPES:
+            defaults[ext.lower()] = content_type
+        else:
+            overrides[partname] = content_type
+    xml = [f'<?xml version=\'1.0\' encoding=\'UTF-8\' standalone=\'yes\'?>\n<Types xmlns="{_CONTENT_TYPES_NS}">']
+    xml.extend(f'<Default Extension="{_attr(ext)}" ContentType="{_attr(defaults[ext])}"/>' for ext in sorted(defaults))
+    xml.extend(f'<Override PartName="{_attr(partname)}" ContentType="{_attr(overrides[partname])}"/>'
+               for partname in sorted(overrides))
+    xml.append('</Types>')
+    return ''.join(xml).encode('utf-8')
+
+
+def _attr(value):
+    return value.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('"', '&quot;')
+
+
+def content_types(template, images):
+    """[Content_Types].xml for template with images added"""
+    return content_types_xml(list(template.part_types)
+                             + [('/' + image.partname, image.content_type) for image in images])
+
+
+def _relationship(rid, reltype, target, external=False):
+    mode = ' TargetMode="External"' if external else ''
+    return f'<Relationship Id="{_attr(rid)}" Type="{_attr(reltype)}" Target="{_attr(target)}"{mode}/>'
+
+
+def document_rels(template, images, urls):
+    """The document's relationships: the template's, then images', then hyperlinks'
+
+    New relationships are appended to the template's part with the attribute
+    order and escaping python-docx saves them with, so both backends agree.
+    """
+    xml = template.static_parts.data(DOCUMENT_RELS_PART)
+    rels = [_relationship(image.rid, RT_IMAGE, image.partname[len('word/'):]) for image in images]
+    rels.extend(_relationship(rid, RT_HYPERLINK, url, external=True) for url, rid in urls.items())
+    end = xml.rindex(_RELATIONSHIPS_END)
+    return xml[:end] + ''.join(rels).encode('utf-8') + xml[end:]
+
+
+class _LinkedBody:
+    """Passes body XML through to out with its placeholders completed by a BodyLinks"""
+
+    def __init__(self, out, links):
+        self._out = out
+        self._links = links
+
+    def write(self, data):
+        return self._out.write(self._links.rewrite(data))
+
+
+def save_document(doc, docx_file, compression=DEFAULT_COMPRESSION):
+    """Save a python-docx Document like Document.save and return its PackageStats
+
+    Parts are written in python-docx's order, a walk of the relationship
+    graph, which depends only on the document.
+    """
+    package = doc.part.package
+    parts = list(package.iter_parts())
+    for part in parts:
+        part.before_marshal()
+    members = [(CONTENT_TYPES_PART, content_types_xml([(part.partname, part.content_type) for part in parts])),
+               (PACKAGE_URI.rels_uri.membername, package.rels.xml)]
+    for part in parts:
+        members.append((part.partname.membername, part.blob))
+        if len(part.rels):
+            members.append((part.partname.rels_uri.membername, part.rels.xml))
+    with PackageZip(docx_file, compression) as output:
+        output.write_all(members)
+    return output.stats()
+
+
+def namespace_declarations(element):
+    """The xmlns attributes lxml writes for element's in-scope namespaces"""
+    return {
+        (f' xmlns:{prefix}="{uri}"' if prefix else f' xmlns="{uri}"').encode()
+        for prefix, uri in element.nsmap.items()
+    }
+
+
+def body_fragment(element, declared):
+    """Serialize a body child without the namespaces the root already declares
+
+    Serialized on its own, an element repeats every namespace in scope on its
+    start tag; dropping those makes the output match a whole-tree save.
+    """
+    xml = etree.tostring(element, encoding='UTF-8', xml_declaration=False)
+    end = xml.index(b'>')
+    start_tag = _XMLNS_RE.sub(lambda m: b'' if m.group(0) in declared else m.group(0), xml[:end])
+    return start_tag + xml[end:]
+
+
+def write_package(template, docx_file, write_body, profiler=NULL_PROFILER, compression=DEFAULT_COMPRESSION,
+                  images=()):
+    """Write a .docx built from template with write_body(out) supplying the body
+
+    The template's unchanging parts are copied already compressed, then the
+    parts of images (mdconvert.images.ProcessedImages the body shows) and
+    word/document.xml are appended. write_body receives a binary file object
+    positioned after the template's own body content and writes whole
+    converted elements, whose placeholders a mdconvert.links.BodyLinks
+    completes on the way. The document's relationships go last, once the
+    hyperlinks are known. Copying the parts and finishing the zip is the
+    profiler's 'save' phase. Returns the PackageStats.
+    """
+    with profiler.phase('save'):
+        output = PackageZip(docx_file, compression)
+    with output:
+        with profiler.phase('save'):
+            rels_part = None
+            for part in template.static_parts.compressed(compression):
+                if part.name == DOCUMENT_RELS_PART:
+                    rels_part = part
+                elif part.name == CONTENT_TYPES_PART and images:
+                    output.write_all([(part.name, content_types(template, images))])
+                else:
+                    output.add(part)
+            output.write_all([(image.partname, image.data) for image in images])
+        links = BodyLinks(template.next_drawing_id, template.next_bookmark_id)
+        with output.open(DOCUMENT_PART) as out:
+            out.write(template.head)
+            write_body(_LinkedBody(out, links))
+            out.write(template.tail)
+        with profiler.phase('save'):
+            if images or links.urls:
+                output.write_all([(DOCUMENT_RELS_PART, document_rels(template, images, links.urls))])
+            else:
+                output.add(rels_part)
+            output.close()
+    return output.stats()
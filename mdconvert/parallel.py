@@ -0,0 +1,98 @@
+"""
+Render a document's sections in worker processes and stitch them in order
+
+Sections (split at H1/H2 headings, as for the section cache) share no
+rendering state. Lists are numbered through their paragraph styles and
+every style ID comes from the theme's BaseTemplate, which each worker
+builds identically. So each section's body XML can be rendered on its own,
+and the fragments concatenated in document order are byte-for-byte the XML
+a serial render produces.
+
+The pool is started on first use and kept for the life of the process, so
+the daemon and watch mode pay for worker start-up once.
+"""
+
+import os
+
+from mdconvert.source import parse_span
+from mdconvert.template import load_template
+
+_pool = None
+_pool_workers = 0
+_renderers = {}
+
+
+def get_pool(workers):
+    """The shared process pool, restarted if a different size is asked for"""
+    global _pool, _pool_workers
+    if _pool is None or _pool_workers != workers:
+        # Imported here: multiprocessing is slow to load and serial runs skip it
+        from concurrent.futures import ProcessPoolExecutor
+
+        if _pool is not None:
+            _pool.shutdown()
+        _pool = ProcessPoolExecutor(workers)
+        _pool_workers = workers
+    return _pool
+
+
+def _renderer(backend, theme, template):
+    """A renderer for backend and theme, built once per worker process"""
+    key = (backend, theme, template)
+    renderer = _renderers.get(key)
+    if renderer is None:
+        base = load_template(theme, template)
+        if backend == 'ooxml':
+            from mdconvert.ooxml_render import OoxmlRenderer
+
+            renderer = OoxmlRenderer(theme, base.style_ids, base.width)
+        else:
+            from mdconvert.docx_render import DocxRenderer
+
+            renderer = DocxRenderer(base.document(), theme, base)
+        _renderers[key] = renderer
+    return renderer
+
+
+def _render_blocks(backend, theme, template, blocks, base_dir):
+    renderer = _renderer(backend, theme, template)
+    renderer.use_images(base_dir)
+    if backend == 'ooxml':
+        return renderer.render(blocks).encode('utf-8')
+    return renderer.render_fragment(blocks)
+
+
+def _render_section(task):
+    return _render_blocks(*task)
+
+
+def _render_span(task):
+    backend, theme, template, md_file, start, end = task
+    return _render_blocks(backend, theme, template, parse_span(md_file, start, end), os.path.dirname(md_file))
+
+
+def _map(function, tasks, workers):
+    if len(tasks) < 2 or workers < 2:
+        return map(function, tasks)
+    chunksize = max(1, len(tasks) // (workers * 4))
+    return get_pool(workers).map(function, tasks, chunksize=chunksize)
+
+
+def render_sections(sections, theme, backend='python-docx', template=None, workers=2, base_dir=''):
+    """Yield each section's body XML as bytes, in order, rendered across workers
+
+    Image paths are resolved against base_dir. Drawing IDs restart in each
+    section; the caller numbers them when it puts the document together.
+    """
+    tasks = [(backend, theme, template, section, base_dir) for section in sections]
+    return _map(_render_section, tasks, workers)
+
+
+def render_spans(md_file, spans, theme, backend='python-docx', template=None, workers=2):
+    """Like render_sections, for SourceIndex section spans that workers parse themselves
+
+    Only byte offsets cross the process boundary, and the parent never
+    holds the blocks.
+    """
+    tasks = [(backend, theme, template, md_file, start, end) for start, end in spans]
+    return _map(_render_span, tasks, workers)
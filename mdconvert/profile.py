@@ -0,0 +1,109 @@
+"""
+Opt-in timing of conversion phases and of each block type a renderer handles
+
+A renderer is profiled by swapping its kind -> handler table for timed
+wrappers, so an unprofiled conversion runs exactly the code it always did.
+"""
+
+import contextlib
+import json
+import time
+
+_perf = time.perf_counter
+
+
+class BlockStats:
+    __slots__ = ('count', 'total', 'max', 'runs', 'elements')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.runs = 0
+        self.elements = 0
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'total_seconds': round(self.total, 6),
+            'max_seconds': round(self.max, 6),
+            'runs': self.runs,
+            'elements': self.elements,
+        }
+
+
+class Profiler:
+    """Collects phase timings and per-block-type statistics for one document
+
+    A disabled profiler hands back handlers unchanged and times nothing, so
+    code can use one unconditionally.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.phases = {}
+        self.blocks = {}
+        self.counters = {}
+
+    @contextlib.contextmanager
+    def _timed_phase(self, name):
+        start = _perf()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + _perf() - start
+
+    def phase(self, name):
+        """Context manager adding the time spent inside it to phase `name`"""
+        if not self.enabled:
+            return contextlib.nullcontext()
+        return self._timed_phase(name)
+
+    def instrument(self, handlers, begin, count):
+        """Return handlers wrapped to record time, runs and elements per block kind
+
+        begin() is called before each handler and its value passed, with the
+        handler's return value, to count(), which returns (runs, elements)
+        created for the block.
+        """
+        if not self.enabled:
+            return handlers
+        return {kind: self._wrap(kind, handler, begin, count) for kind, handler in handlers.items()}
+
+    def _wrap(self, kind, handler, begin, count):
+        stats = self.blocks.setdefault(kind, BlockStats())
+
+        def timed(block):
+            token = begin()
+            start = _perf()
+            result = handler(block)
+            elapsed = _perf() - start
+            runs, elements = count(token, result)
+            stats.count += 1
+            stats.total += elapsed
+            if elapsed > stats.max:
+                stats.max = elapsed
+            stats.runs += runs
+            stats.elements += elements
+            return result
+
+        return timed
+
+    def report(self, **info):
+        """Return the profile as a JSON-serializable dict, with info merged in"""
+        blocks = sorted(self.blocks.items(), key=lambda item: -item[1].total)
+        return dict(
+            info,
+            phases={name: round(seconds, 6) for name, seconds in self.phases.items()},
+            blocks={kind: stats.as_dict() for kind, stats in blocks if stats.count},
+            counters=dict(self.counters),
+        )
+
+
+NULL_PROFILER = Profiler(enabled=False)
+
+
+def write_report(path, reports):
+    """Write a list of per-document profile reports as JSON"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'documents': reports}, f, indent=2)
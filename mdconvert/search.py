@@ -0,0 +1,368 @@
+"""
+Full-text search index of converted documents, built from the converter's parse
+
+A DocumentIndex is fed the blocks a converter has already parsed, chunk by
+chunk for the streaming writers. Every heading starts a section, named by
+the anchor its Word bookmark and HTML id use (see mdconvert.links), so a
+hit links straight to the heading. Each term occurrence is recorded with
+its section and word position, which phrase queries use.
+
+Indexes are written in a binary format made to be searched in place, from
+a read-only mmap here or a DataView over a fetched ArrayBuffer in the
+browser. Everything is little-endian and every record has a fixed size:
+
+    header    magic b'MDSI', u16 version, u16 0, u32 document, section and
+              term counts, u32 offsets of the five tables below
+    documents u32 path offset, u32 path length
+    sections  u32 document, u32 anchor offset, u32 anchor length,
+              u32 title offset, u32 title length
+    terms     u32 term offset, u32 term length, u32 first posting,
+              u32 posting count; sorted by the term's UTF-8 bytes
+    postings  u32 section, u32 position; by section, then position
+    strings   UTF-8 text the offsets above point into
+
+A term is found by binary search over the term records, and terms sharing
+a prefix are adjacent, for search as you type. Each document's index is
+written next to its output, and a build merges them into one index of
+every guide, so a rebuild only parses the documents it converts.
+
+    python -m mdconvert.search build/help.search "appointment reminders"
+"""
+
+import argparse
+import mmap
+import os
+import re
+import struct
+import sys
+from collections import defaultdict
+from typing import NamedTuple
+
+from mdconvert.inline import tokenize_inline
+from mdconvert.links import HeadingSlugs, slugify
+from mdconvert.store import staging_path
+
+MAGIC = b'MDSI'
+VERSION = 1
+MAX_PREFIX_TERMS = 64  # terms a prefix expands to at most
+
+_HEADER = struct.Struct('<4sHHIIIIIIII')
+_DOCUMENT = struct.Struct('<II')
+_SECTION = struct.Struct('<IIIII')
+_TERM = struct.Struct('<IIII')
+_POSTING = struct.Struct('<II')
+
+_TERM_RE = re.compile(r'\w+')
+
+
+def terms(text):
+    """The lower-cased words of text, in order"""
+    return _TERM_RE.findall(text.lower())
+
+
+def _plain(text):
+    """Inline Markdown reduced to the text a reader sees"""
+    return ' '.join(token.text for token in tokenize_inline(text))
+
+
+def _block_text(block):
+    kind = block.kind
+    if kind in ('paragraph', 'list_item', 'quote'):
+        return _plain(block.text)
+    if kind == 'table':
+        return ' '.join(_plain(cell) for row in [block.header] + block.rows for cell in row)
+    if kind == 'code':
+        return ' '.join(block.lines)
+    if kind == 'metadata':
+        return _plain(block.text)
+    if kind == 'image':
+        return block.alt
+    return ''
+
+
+class DocumentIndex:
+    """The sections of one document and where each term occurs in them
+
+    Text before the first heading is a section with an empty anchor,
+    titled with the document's path.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.sections = []               # (anchor, title)
+        self.postings = defaultdict(list)  # term -> [(section, position)]
+        self._slugs = HeadingSlugs()
+        self._position = 0
+
+    def _section(self, anchor, title):
+        self.sections.append((anchor, title))
+        self._position = 0
+
+    def _add_text(self, text):
+        if not self.sections:
+            self._section('', self.path)
+        section = len(self.sections) - 1
+        position = self._position
+        for term in terms(text):
+            self.postings[term].append((section, position))
+            position += 1
+        self._position = position
+
+    def add(self, blocks):
+        """Index blocks, continuing from the previous call"""
+        for block in blocks:
+            if block.kind == 'heading':
+                slug = slugify(block.text)
+                self._section(self._slugs.unique(slug) if slug else '', block.text)
+                self._add_text(block.text)
+            else:
+                text = _block_text(block)
+                if text:
+                    self._add_text(text)
+
+    def save(self, path):
+        """Write this document's index alone; see write_index"""
+        write_index([self], path)
+
+
+def read_documents(index):
+    """Every document of a SearchIndex as a DocumentIndex, read in one pass"""
+    documents = [DocumentIndex(index.document(number)) for number in range(index.document_count)]
+    owners = []  # section -> (document, section within it)
+    for doc, anchor, title in index.iter_sections():
+        owners.append((documents[doc], len(documents[doc].sections)))
+        documents[doc].sections.append((anchor, title))
+    for term, postings in index.iter_terms():
+        for section, position in postings:
+            document, local = owners[section]
+            document.postings[term].append((local, position))
+    return documents
+
+
+def write_index(documents, path):
+    """Merge DocumentIndexes into one index file at path, written atomically"""
+    strings = bytearray()
+    offsets = {}
+
+    def string(text):
+        data = text.encode('utf-8')
+        offset = offsets.get(data)
+        if offset is None:
+            offset = offsets[data] = len(strings)
+            strings.extend(data)
+        return offset, len(data)
+
+    document_table = bytearray()
+    section_table = bytearray()
+    merged = defaultdict(list)
+    section_count = 0
+    for number, document in enumerate(documents):
+        document_table += _DOCUMENT.pack(*string(document.path))
+        for anchor, title in document.sections:
+            section_table += _SECTION.pack(number, *string(anchor), *string(title))
+        for term, postings in document.postings.items():
+            merged[term.encode('utf-8')].extend((section_count + section, position)
+                                                 for section, position in postings)
+        section_count += len(document.sections)
+
+    term_table = bytearray()
+    posting_table = bytearray()
+    posting_count = 0
+    for term in sorted(merged):
+        postings = merged[term]
+        offset = len(strings)
+        strings.extend(term)
+        term_table += _TERM.pack(offset, len(term), posting_count, len(postings))
+        for posting in postings:
+            posting_table += _POSTING.pack(*posting)
+        posting_count += len(postings)
+
+    documents_offset = _HEADER.size
+    sections_offset = documents_offset + len(document_table)
+    terms_offset = sections_offset + len(section_table)
+    postings_offset = terms_offset + len(term_table)
+    strings_offset = postings_offset + len(posting_table)
+    header = _HEADER.pack(MAGIC, VERSION, 0, len(documents), section_count, len(merged),
+                          documents_offset, sections_offset, terms_offset, postings_offset, strings_offset)
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    staged = staging_path(path)
+    with open(staged, 'wb') as f:
+        for table in (header, document_table, section_table, term_table, posting_table, strings):
+            f.write(table)
+    os.replace(staged, path)
+
+
+def sidecar_path(output):
+    """Where a converted document's own index is written: next to it, as .search"""
+    return os.path.splitext(output)[0] + '.search'
+
+
+def merge_indexes(paths, path):
+    """Write one index at path of every document in the index files at paths"""
+    documents = []
+    for source in paths:
+        with SearchIndex(source) as index:
+            documents.extend(read_documents(index))
+    write_index(documents, path)
+
+
+class Hit(NamedTuple):
+    document: str
+    anchor: str
+    title: str
+    score: int
+
+
+class SearchIndex:
+    """An index file searched in place through a read-only mmap"""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, _, self.document_count, self.section_count, self.term_count, self._documents,
+         self._sections, self._terms, self._postings, self._strings) = _HEADER.unpack_from(self._buffer)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} search index")
+
+    def close(self):
+        self._buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _string(self, offset, length):
+        start = self._strings + offset
+        return self._buffer[start:start + length].decode('utf-8')
+
+    def _term_bytes(self, i):
+        offset, length, _, _ = _TERM.unpack_from(self._buffer, self._terms + i * _TERM.size)
+        start = self._strings + offset
+        return self._buffer[start:start + length]
+
+    def document(self, i):
+        return self._string(*_DOCUMENT.unpack_from(self._buffer, self._documents + i * _DOCUMENT.size))
+
+    def section(self, i):
+        """(document number, anchor, title) of section i"""
+        doc, anchor, anchor_length, title, title_length = _SECTION.unpack_from(
+            self._buffer, self._sections + i * _SECTION.size)
+        return doc, self._string(anchor, anchor_length), self._string(title, title_length)
+
+    def iter_sections(self):
+        for i in range(self.section_count):
+            yield self.section(i)
+
+    def _term_postings(self, i):
+        _, _, first, count = _TERM.unpack_from(self._buffer, self._terms + i * _TERM.size)
+        start = self._postings + first * _POSTING.size
+        return list(_POSTING.iter_unpack(self._buffer[start:start + count * _POSTING.size]))
+
+    def iter_terms(self):
+        """(term, postings) for every term, in order"""
+        for i in range(self.term_count):
+            yield self._term_bytes(i).decode('utf-8'), self._term_postings(i)
+
+    def _lower_bound(self, key):
+        low, high = 0, self.term_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._term_bytes(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def postings(self, term):
+        """[(section, position)] where term occurs; empty if it never does"""
+        key = term.lower().encode('utf-8')
+        i = self._lower_bound(key)
+        if i < self.term_count and self._term_bytes(i) == key:
+            return self._term_postings(i)
+        return []
+
+    def prefix_terms(self, prefix, limit=MAX_PREFIX_TERMS):
+        """Terms starting with prefix, in order, at most limit of them"""
+        key = prefix.lower().encode('utf-8')
+        found = []
+        i = self._lower_bound(key)
+        while i < self.term_count and len(found) < limit:
+            term = self._term_bytes(i)
+            if not term.startswith(key):
+                break
+            found.append(term.decode('utf-8'))
+            i += 1
+        return found
+
+    def search(self, query, limit=20):
+        """Sections holding every word of query, best first
+
+        A query in double quotes matches the words as a phrase; otherwise
+        the last word also matches longer words it begins, as when typing.
+        Sections score by how often the words occur in them.
+        """
+        words = terms(query)
+        if not words:
+            return []
+        phrase = query.strip().startswith('"') and query.strip().endswith('"') and len(words) > 1
+        # section -> positions, one dict per word
+        matches = []
+        for number, word in enumerate(words):
+            expanded = [word] if phrase or number < len(words) - 1 else self.prefix_terms(word)
+            positions = defaultdict(set)
+            for term in expanded:
+                for section, position in self.postings(term):
+                    positions[section].add(position)
+            if not positions:
+                return []
+            matches.append(positions)
+
+        sections = set(matches[0]).intersection(*matches[1:])
+        scored = []
+        for section in sections:
+            if phrase:
+                starts = matches[0][section]
+                for offset, positions in enumerate(matches[1:], 1):
+                    starts = {start for start in starts if start + offset in positions[section]}
+                score = len(starts)
+            else:
+                score = sum(len(positions[section]) for positions in matches)
+            if score:
+                scored.append((-score, section))
+        scored.sort()
+
+        hits = []
+        for score, section in scored[:limit]:
+            doc, anchor, title = self.section(section)
+            hits.append(Hit(self.document(doc), anchor, title, -score))
+        return hits
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Search an index written by convert_docs.py --search-index')
+    parser.add_argument('index', help='index file')
+    parser.add_argument('query', help='words to find; "quoted" for a phrase')
+    parser.add_argument('-n', '--limit', type=int, default=20, help='most hits to show (default: 20)')
+    args = parser.parse_args(argv)
+
+    try:
+        with SearchIndex(args.index) as index:
+            hits = index.search(args.query, args.limit)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    for hit in hits:
+        anchor = f'#{hit.anchor}' if hit.anchor else ''
+        print(f'{hit.score:5d}  {hit.document}{anchor}  {hit.title}')
+    if not hits:
+        print('No matches', file=sys.stderr)
+    return 0 if hits else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,584 @@
+"""
+Paginated slide decks from the Markdown document AST
+
+The document's H1 becomes a title slide, with the text before the first H2
+as its subtitle when it fits there, and every H2 (or later H1) starts a
+slide titled with the heading. The blocks under it are laid out top to
+bottom and measured with mdconvert.layout: whatever does not fit flows onto
+continuation slides, never splitting a paragraph and never leaving a
+heading alone at the bottom. Tables become native PowerPoint tables, split
+between rows with the header row repeated. A paragraph too tall for a whole
+slide, or a title too long for its box, is shrunk with layout.fit_scale.
+Images and rules are left to the Word and HTML versions.
+
+Like mdconvert.deck, python-pptx builds the package only once per process:
+a prototype slide with a text box and a table is cut into shape templates,
+and every slide is those templates with measured positions and the text
+filled in. The master, layouts and theme are compressed once, so a
+500-slide deck costs about as much as writing its slide XML.
+
+    python -m mdconvert.slides EXECUTIVE_SUMMARY.md
+    python -m mdconvert.slides USER_MANUAL.md -o build/USER_MANUAL-slides.pptx --theme user-manual
+"""
+
+import argparse
+import functools
+import io
+import os
+import re
+import sys
+import time
+import zipfile
+from typing import NamedTuple, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from pptx import Presentation
+from pptx.enum.text import MSO_AUTO_SIZE
+from pptx.util import Inches
+
+from mdconvert import layout
+from mdconvert.blocks import CHECKMARKS, read_blocks
+from mdconvert.inline import InlineRun, tokenize_inline
+from mdconvert.links import RT_HYPERLINK, is_anchor
+from mdconvert.package import COMPRESSION_PROFILES, CONTENT_TYPES_PART, DEFAULT_COMPRESSION, PackageZip, StaticParts
+
+BLANK_LAYOUT = 6
+SLIDE_WIDTH = Inches(10)
+SLIDE_HEIGHT = Inches(7.5)
+MARGIN = Inches(0.5)
+TITLE_TOP = Inches(0.3)
+TITLE_HEIGHT = Inches(0.9)
+BODY_TOP = Inches(1.3)
+BODY_HEIGHT = SLIDE_HEIGHT - BODY_TOP - Inches(0.4)
+COVER_TITLE_TOP = Inches(2.2)
+COVER_TITLE_HEIGHT = Inches(1.6)
+SUBTITLE_TOP = Inches(4.0)
+SUBTITLE_HEIGHT = Inches(2.5)
+
+# Font sizes in points
+TITLE_SIZE = 32
+COVER_TITLE_SIZE = 40
+SUBTITLE_SIZE = 20
+TEXT_SIZE = 18
+NESTED_SIZE = 16    # bullets below the top level
+SUBHEADING_SIZE = 22
+CODE_SIZE = 12
+TABLE_SIZE = 12
+
+CODE_FONT = 'Courier New'
+INDENT = Inches(0.3)  # per bullet level
+SPACE_AFTER = 6       # points after every paragraph
+TABLE_GAP = 8         # points between a table and what is around it
+CELL_INSETS = (91440, 45720, 91440, 45720)  # PowerPoint's default cell margins
+MIN_COLUMN_SHARE = 0.08  # narrowest column, as a share of the table width
+CONTINUED = ' (cont.)'
+UNBOUNDED = Inches(1000)  # box height for measuring text that may not fit
+
+_CTRL_RE = re.compile(r'[\x00-\x08\x0B-\x1F]')
+_XFRM_RE = re.compile(r'<a:off x="\d+" y="\d+"/><a:ext cx="\d+" cy="\d+"/>')
+_NAME_RE = re.compile(r'<p:cNvPr id="\d+" name="[^"]*"/>')
+_SLIDE_ID_RE = re.compile(r'<p:sldIdLst>.*?</p:sldIdLst>')
+_SLIDE_REL_RE = re.compile(r'<Relationship Id="[^"]+" Type="[^"]+/slide" Target="slides/slide\d+\.xml"/>')
+_SLIDE_TYPE_RE = re.compile(r'<Override PartName="/ppt/slides/slide\d+\.xml" ContentType="[^"]+"/>')
+
+SLIDE_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.presentationml.slide+xml'
+RT_SLIDE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/slide'
+RT_SLIDE_LAYOUT = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/slideLayout'
+_RELS_HEAD = ('<?xml version=\'1.0\' encoding=\'UTF-8\' standalone=\'yes\'?>\n'
+              '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">')
+
+
+def _text_xml(text):
+    """Escape text for an a:t element the way python-pptx does"""
+    return escape(_CTRL_RE.sub(lambda match: '_x%04X_' % ord(match.group()), text))
+
+
+def _attr(value):
+    return escape(value, {'"': '&quot;'})
+
+
+def _runs(text):
+    """The inline runs of text, at least one so an empty line keeps its height"""
+    return tuple(tokenize_inline(text)) or (InlineRun(''),)
+
+
+def _template(xml):
+    """Shape XML as a format string with its id, name and position left open"""
+    xml = xml.replace('{', '{{').replace('}', '}}')
+    xml = _NAME_RE.sub('<p:cNvPr id="{id}" name="{name}"/>', xml, count=1)
+    return _XFRM_RE.sub('<a:off x="{x}" y="{y}"/><a:ext cx="{cx}" cy="{cy}"/>', xml, count=1)
+
+
+def _cut(xml, start, end):
+    """The first element of xml starting with start and ending with end"""
+    first = xml.index(start)
+    return xml[first:xml.index(end, first) + len(end)]
+
+
+class _Skeleton:
+    """The parts every deck shares, cut from a python-pptx prototype"""
+
+    def __init__(self):
+        prs = Presentation()
+        prs.slide_width, prs.slide_height = SLIDE_WIDTH, SLIDE_HEIGHT
+        slide = prs.slides.add_slide(prs.slide_layouts[BLANK_LAYOUT])
+        box = slide.shapes.add_textbox(MARGIN, BODY_TOP, SLIDE_WIDTH - 2 * MARGIN, BODY_HEIGHT)
+        box.text_frame.word_wrap = True
+        box.text_frame.auto_size = MSO_AUTO_SIZE.NONE
+        slide.shapes.add_table(1, 1, MARGIN, BODY_TOP, SLIDE_WIDTH - 2 * MARGIN, BODY_HEIGHT)
+        slide_part = slide.part.partname.lstrip('/')
+
+        buffer = io.BytesIO()
+        prs.save(buffer)
+        with zipfile.ZipFile(buffer) as package:
+            slide_xml = package.read(slide_part).decode('utf-8')
+            slide_rels = package.read(slide_part.replace('slides/', 'slides/_rels/') + '.rels').decode('utf-8')
+            presentation = package.read('ppt/presentation.xml').decode('utf-8')
+            rels = package.read('ppt/_rels/presentation.xml.rels').decode('utf-8')
+            types = package.read(CONTENT_TYPES_PART).decode('utf-8')
+            self.static_parts = StaticParts.from_zip(package, skip={
+                slide_part, slide_part.replace('slides/', 'slides/_rels/') + '.rels', 'ppt/presentation.xml',
+                'ppt/_rels/presentation.xml.rels', CONTENT_TYPES_PART})
+
+        self.slide_head = slide_xml[:slide_xml.index('<p:grpSpPr/>') + len('<p:grpSpPr/>')]
+        self.slide_tail = slide_xml[slide_xml.index('</p:spTree>'):]
+        text_box = _cut(slide_xml, '<p:sp>', '</p:sp>')
+        self.text_box = _template(text_box).replace('<a:p/>', '{paragraphs}')
+        table = _cut(slide_xml, '<p:graphicFrame>', '</p:graphicFrame>')
+        table = table.replace(_cut(table, '<a:tblGrid>', '</a:tr>'), '\x00')
+        self.table = _template(table).replace('\x00', '{grid}{rows}')
+        self.layout_target = re.search(r'Target="(\.\./slideLayouts/[^"]+)"', slide_rels).group(1)
+
+        self.presentation = _SLIDE_ID_RE.sub('\x00', presentation)
+        self.rels = _SLIDE_REL_RE.sub('', rels)
+        self.types = _SLIDE_TYPE_RE.sub('', types)
+
+    def package_parts(self, count):
+        """(name, bytes) of presentation.xml, its relationships and the content types for count slides"""
+        ids = ''.join(f'<p:sldId id="{256 + i}" r:id="rIdSlide{i + 1}"/>' for i in range(count))
+        presentation = self.presentation.replace('\x00', f'<p:sldIdLst>{ids}</p:sldIdLst>' if count else '')
+        rels = self.rels.replace('</Relationships>', ''.join(
+            f'<Relationship Id="rIdSlide{i + 1}" Type="{RT_SLIDE}" Target="slides/slide{i + 1}.xml"/>'
+            for i in range(count)) + '</Relationships>')
+        types = self.types.replace('</Types>', ''.join(
+            f'<Override PartName="/ppt/slides/slide{i + 1}.xml" ContentType="{SLIDE_CONTENT_TYPE}"/>'
+            for i in range(count)) + '</Types>')
+        return [(CONTENT_TYPES_PART, types.encode('utf-8')),
+                ('ppt/presentation.xml', presentation.encode('utf-8')),
+                ('ppt/_rels/presentation.xml.rels', rels.encode('utf-8'))]
+
+
+@functools.lru_cache(maxsize=1)
+def _skeleton():
+    return _Skeleton()
+
+
+class TextItem(NamedTuple):
+    """One paragraph of slide text"""
+    runs: Tuple[InlineRun, ...]
+    size: float
+    level: Optional[int] = None  # bullet level, None for no bullet
+    number: Optional[int] = None  # ordered list items: the item's number
+    style: str = 'text'  # 'text', 'heading', 'quote' or 'code'
+
+
+class TableItem(NamedTuple):
+    header: Tuple[str, ...]
+    rows: Tuple[Tuple[str, ...], ...]
+
+
+class TablePart(NamedTuple):
+    """Rows [first, last) of a table, shown under its header"""
+    table: TableItem
+    first: int
+    last: int
+
+
+class Slide(NamedTuple):
+    title: str
+    items: tuple  # TextItems and TableParts, top to bottom
+    cover: bool = False  # a title slide: items are the subtitle
+
+
+class SlideRenderer:
+    """Turn AST blocks into paginated Slides, measured with mdconvert.layout"""
+
+    def __init__(self, theme):
+        self.theme = theme
+        self.font = theme.body_font[0] if theme.body_font else layout.DEFAULT_FONT
+        self.sections = []   # [title, items, cover]
+        self._covered = False  # the first H1 has made its title slide
+        self._table_layouts = {}
+        self._handlers = {
+            'heading': self.heading,
+            'paragraph': self.paragraph,
+            'list_item': self.list_item,
+            'quote': self.quote,
+            'table': self.table,
+            'code': self.code,
+            'metadata': self.metadata,
+            'rule': self.skip,
+            'blank': self.skip,
+            'image': self.skip,
+        }
+
+    def render(self, blocks):
+        handlers = self._handlers
+        for block in blocks:
+            handlers[block.kind](block)
+
+    def _add(self, item):
+        if not self.sections:
+            self.sections.append(['', [], False])
+        self.sections[-1][1].append(item)
+
+    def _text(self, text, size=TEXT_SIZE, level=None, number=None, style='text'):
+        self._add(TextItem(_runs(text), size, level, number, style))
+
+    def heading(self, block):
+        if block.level == 1 and not self._covered and not self.sections:
+            self._covered = True
+            self.sections.append([block.text, [], True])
+        elif block.level <= 2:
+            self.sections.append([block.text, [], False])
+        else:
+            self._add(TextItem((InlineRun(block.text),), SUBHEADING_SIZE, style='heading'))
+
+    def paragraph(self, block):
+        self._text(block.text)
+
+    def list_item(self, block):
+        if block.marker in CHECKMARKS and not self.theme.checkmark_bullets:
+            self._text(block.marker + ' ' + block.text)
+            return
+        text = block.marker + ' ' + block.text if block.marker in CHECKMARKS else block.text
+        size = TEXT_SIZE if block.level == 0 else NESTED_SIZE
+        number = int(block.marker.rstrip('.')) if block.ordered else None
+        self._text(text, size, block.level, number)
+
+    def quote(self, block):
+        self._text(block.text, style='quote')
+
+    def table(self, block):
+        if not block.header:
+            return
+        columns = len(block.header)
+        rows = tuple(tuple(row[:columns]) + ('',) * (columns - len(row)) for row in block.rows)
+        self._add(TableItem(tuple(block.header), rows))
+
+    def code(self, block):
+        for line in block.lines:
+            self._add(TextItem((InlineRun(line or ' '),), CODE_SIZE, style='code'))
+
+    def metadata(self, block):
+        if block.key is not None and self.theme.metadata_lines:
+            self._text(f'**{block.key}:** {block.value}')
+        else:
+            self._text(block.text)
+
+    def skip(self, block):
+        pass
+
+    # Measuring
+
+    def _indent(self, item):
+        return INDENT * (item.level + 1) if item.level is not None else 0
+
+    def layout_paragraph(self, item):
+        bold = item.style == 'heading'
+        return layout.Paragraph(tuple(layout.Run(run.text, item.size, bold or run.bold) for run in item.runs),
+                                SPACE_AFTER)
+
+    def text_height(self, item, width):
+        """Height in points of item in a text box width EMU wide, with the space after it"""
+        box = layout.Box(width - self._indent(item), UNBOUNDED)
+        font = CODE_FONT if item.style == 'code' else self.font
+        return layout.measure_box((self.layout_paragraph(item),), box, font)[1] + SPACE_AFTER
+
+    def table_layout(self, table, width):
+        """(column widths in EMU, header height, row heights in points) of a table width EMU wide"""
+        cached = self._table_layouts.get(table)
+        if cached is not None:
+            return cached
+        font = layout.load_font(self.font)
+        natural = [max([font.width(cell) * TABLE_SIZE for cell in column] + [1.0])
+                   for column in zip(table.header, *table.rows)]
+        total = sum(natural)
+        shares = [max(share / total, MIN_COLUMN_SHARE) for share in natural]
+        columns = [int(width * share / sum(shares)) for share in shares]
+        columns[-1] = width - sum(columns[:-1])
+
+        def row_height(row, bold):
+            height = 0.0
+            for cell, column in zip(row, columns):
+                para = layout.Paragraph(tuple(layout.Run(run.text, TABLE_SIZE, bold or run.bold)
+                                              for run in _runs(cell)))
+                box = layout.Box(column, UNBOUNDED, insets=CELL_INSETS)
+                height = max(height, layout.measure_box((para,), box, self.font)[1])
+            return height + (CELL_INSETS[1] + CELL_INSETS[3]) / layout.EMU_PER_PT
+
+        cached = self._table_layouts[table] = (columns, row_height(table.header, True),
+                                               [row_height(row, False) for row in table.rows])
+        return cached
+
+    # Paginating
+
+    def slides(self):
+        """Every section as one or more Slides"""
+        slides = []
+        for title, items, cover in self.sections:
+            if cover:
+                subtitle = tuple(item for item in items if isinstance(item, TextItem))
+                if len(subtitle) == len(items) and self._fits_subtitle(subtitle):
+                    slides.append(Slide(title, subtitle, True))
+                    continue
+                slides.append(Slide(title, (), True))
+            for number, page in enumerate(self.paginate(items)):
+                slides.append(Slide(title + CONTINUED if number else title, tuple(page)))
+        return slides
+
+    def _fits_subtitle(self, items):
+        paragraphs = tuple(self.layout_paragraph(item._replace(size=SUBTITLE_SIZE)) for item in items)
+        box = layout.Box(SLIDE_WIDTH - 2 * MARGIN, SUBTITLE_HEIGHT)
+        return layout.fit_scale(paragraphs, box, self.font) is not None
+
+    def paginate(self, items):
+        """Split a section's items into pages that each fit the slide body
+
+        A text item is never split; one taller than a whole slide is
+        shrunk to fit alone. A table continues on the next page between
+        rows. A heading moves to the next page unless the first line of
+        what follows it fits too.
+        """
+        width = SLIDE_WIDTH - 2 * MARGIN
+        capacity = BODY_HEIGHT / layout.EMU_PER_PT
+        insets = (CELL_INSETS[1] + CELL_INSETS[3]) / layout.EMU_PER_PT  # of each text box
+        pages = [[]]
+        used = 0.0
+        for index, item in enumerate(items):
+            if isinstance(item, TableItem):
+                columns, header, rows = self.table_layout(item, width)
+                first = 0
+                while first < len(rows):
+                    gap = TABLE_GAP if pages[-1] else 0.0
+                    room = capacity - used - gap - header
+                    last = first
+                    while last < len(rows) and rows[last] <= room:
+                        room -= rows[last]
+                        last += 1
+                    if last == first and not pages[-1]:
+                        last = first + 1  # a row taller than a slide still gets one
+                    if last == first:
+                        pages.append([])
+                        used = 0.0
+                        continue
+                    pages[-1].append(TablePart(item, first, last))
+                    used += gap + header + sum(rows[first:last]) + TABLE_GAP
+                    first = last
+                    if first < len(rows):
+                        pages.append([])
+                        used = 0.0
+                continue
+
+            height = self.text_height(item, width)
+            if height + insets > capacity:
+                scale = layout.fit_scale((self.layout_paragraph(item),),
+                                         layout.Box(width - self._indent(item), BODY_HEIGHT),
+                                         CODE_FONT if item.style == 'code' else self.font)
+                item = item._replace(size=max(1.0, round(item.size * (scale or layout.MIN_SCALE) * 2) / 2))
+                height = min(self.text_height(item, width), capacity - insets)
+            # A text box opens on an empty page or after a table
+            opens = not pages[-1] or isinstance(pages[-1][-1], TablePart)
+            needed = height + insets if opens else height
+            if item.style == 'heading' and index + 1 < len(items):
+                following = items[index + 1]
+                needed += (following.size * layout.load_font(self.font).line_height
+                           if isinstance(following, TextItem) else 2 * TABLE_SIZE)
+            if pages[-1] and used + needed > capacity:
+                pages.append([])
+                used = 0.0
+                opens = True
+            pages[-1].append(item)
+            used += height + insets if opens else height
+        return [page for page in pages if page] or [[]]
+
+
+class _SlideWriter:
+    """Slide XML from the skeleton's shape templates"""
+
+    def __init__(self, renderer, skeleton):
+        self.renderer = renderer
+        self.theme = renderer.theme
+        self.skeleton = skeleton
+        self.width = SLIDE_WIDTH - 2 * MARGIN
+
+    def _run(self, run, size, bold=False, italic=False, color=None, font=None, links=None):
+        attrs = f' lang="en-US" sz="{int(round(size * 100))}"'
+        if bold or run.bold:
+            attrs += ' b="1"'
+        if italic or run.italic:
+            attrs += ' i="1"'
+        if run.code:
+            color, font = self.theme.inline_code_color, CODE_FONT
+        elif run.link is not None:
+            color = self.theme.link_color
+            attrs += ' u="sng"'
+        elif run.bold and self.theme.bold_color is not None:
+            color = self.theme.bold_color
+        inner = f'<a:solidFill><a:srgbClr val="{color}"/></a:solidFill>' if color else ''
+        if font:
+            inner += f'<a:latin typeface="{font}"/>'
+        if run.link is not None and links is not None and not is_anchor(run.link):
+            inner += f'<a:hlinkClick r:id="{links.setdefault(run.link, f"rIdLink{len(links) + 1}")}"/>'
+        return f'<a:r><a:rPr{attrs}>{inner}</a:rPr><a:t>{_text_xml(run.text)}</a:t></a:r>'
+
+    def paragraph(self, item, links, align=None):
+        props = f'<a:spcAft><a:spcPts val="{SPACE_AFTER * 100}"/></a:spcAft>'
+        attrs = f' algn="{align}"' if align else ''
+        if item.level is not None:
+            attrs += f' marL="{INDENT * (item.level + 1)}" indent="{-INDENT}"'
+            if item.number is not None:
+                props += f'<a:buFont typeface="+mj-lt"/><a:buAutoNum type="arabicPeriod" startAt="{item.number}"/>'
+            else:
+                props += '<a:buFont typeface="Arial"/><a:buChar char="•"/>'
+        color = font = None
+        if item.style == 'heading':
+            color = self.theme.heading(3).color
+        elif item.style == 'quote':
+            color = self.theme.quote_color
+        elif item.style == 'code':
+            color, font = self.theme.code_color, CODE_FONT
+        runs = ''.join(self._run(run, item.size, item.style == 'heading', item.style == 'quote', color, font, links)
+                       for run in item.runs)
+        return f'<a:p><a:pPr{attrs}>{props}</a:pPr>{runs}</a:p>'
+
+    def text_box(self, shape_id, x, y, cx, cy, paragraphs):
+        return self.skeleton.text_box.format(id=shape_id, name=f'TextBox {shape_id - 1}', x=x, y=y, cx=cx, cy=cy,
+                                             paragraphs=paragraphs)
+
+    def title(self, slide, links):
+        size, top, height = ((COVER_TITLE_SIZE, COVER_TITLE_TOP, COVER_TITLE_HEIGHT) if slide.cover
+                             else (TITLE_SIZE, TITLE_TOP, TITLE_HEIGHT))
+        item = TextItem(_runs(slide.title), size, style='heading')
+        scale = layout.fit_scale((self.renderer.layout_paragraph(item),), layout.Box(self.width, height),
+                                 self.renderer.font)
+        item = item._replace(size=max(1.0, round(size * (scale or layout.MIN_SCALE) * 2) / 2))
+        color = self.theme.heading(1 if slide.cover else 2).color
+        runs = ''.join(self._run(run, item.size, True, color=color, links=links) for run in item.runs)
+        align = ' algn="ctr"' if slide.cover else ''
+        return self.text_box(2, MARGIN, top, self.width, height, f'<a:p><a:pPr{align}/>{runs}</a:p>')
+
+    def table(self, shape_id, y, part, links):
+        columns, header, rows = self.renderer.table_layout(part.table, self.width)
+        heights = [header] + rows[part.first:part.last]
+        cy = int(sum(heights) * layout.EMU_PER_PT)
+        grid = '<a:tblGrid>' + ''.join(f'<a:gridCol w="{column}"/>' for column in columns) + '</a:tblGrid>'
+        fill = (f'<a:solidFill><a:srgbClr val="{self.theme.table_header_fill}"/></a:solidFill>'
+                if self.theme.table_header_fill else '')
+        xml = []
+        for number, row in enumerate((part.table.header,) + part.table.rows[part.first:part.last]):
+            xml.append(f'<a:tr h="{int(heights[number] * layout.EMU_PER_PT)}">')
+            for cell in row:
+                color = self.theme.table_header_color if number == 0 else None
+                runs = ''.join(self._run(run, TABLE_SIZE, number == 0, color=color, links=links)
+                               for run in tokenize_inline(cell))
+                end = f'<a:endParaRPr lang="en-US" sz="{TABLE_SIZE * 100}"/>' if not runs else ''
+                xml.append(f'<a:tc><a:txBody><a:bodyPr/><a:lstStyle/><a:p>{runs}{end}</a:p></a:txBody>'
+                           f'<a:tcPr>{fill if number == 0 else ""}</a:tcPr></a:tc>')
+            xml.append('</a:tr>')
+        return self.skeleton.table.format(id=shape_id, name=f'Table {shape_id - 1}', x=MARGIN, y=y,
+                                          cx=self.width, cy=cy, grid=grid, rows=''.join(xml)), cy
+
+    def slide(self, slide):
+        """(slide XML, relationships XML) of one Slide"""
+        links = {}
+        shapes = [self.title(slide, links)]
+        if slide.cover:
+            if slide.items:
+                paragraphs = ''.join(self.paragraph(item._replace(size=SUBTITLE_SIZE), links, 'ctr')
+                                     for item in slide.items)
+                shapes.append(self.text_box(3, MARGIN, SUBTITLE_TOP, self.width, SUBTITLE_HEIGHT, paragraphs))
+        else:
+            y = BODY_TOP
+            text = []
+            for item in slide.items + (None,):
+                if isinstance(item, TextItem):
+                    text.append(item)
+                    continue
+                if text:
+                    height = sum(self.renderer.text_height(each, self.width) for each in text)
+                    cy = int(height * layout.EMU_PER_PT) + CELL_INSETS[1] + CELL_INSETS[3]
+                    shapes.append(self.text_box(len(shapes) + 2, MARGIN, y, self.width, cy,
+                                                ''.join(self.paragraph(each, links) for each in text)))
+                    y += cy
+                    text = []
+                if item is not None:
+                    if len(shapes) > 1:
+                        y += int(TABLE_GAP * layout.EMU_PER_PT)
+                    xml, cy = self.table(len(shapes) + 2, y, item, links)
+                    shapes.append(xml)
+                    y += cy + int(TABLE_GAP * layout.EMU_PER_PT)
+
+        rels = [f'<Relationship Id="rId1" Type="{RT_SLIDE_LAYOUT}" Target="{self.skeleton.layout_target}"/>']
+        rels.extend(f'<Relationship Id="{rid}" Type="{RT_HYPERLINK}" Target="{_attr(url)}" TargetMode="External"/>'
+                    for url, rid in links.items())
+        return (self.skeleton.slide_head + ''.join(shapes) + self.skeleton.slide_tail,
+                _RELS_HEAD + ''.join(rels) + '</Relationships>')
+
+
+def write_slides(blocks, pptx_file, theme, compression=DEFAULT_COMPRESSION):
+    """Write blocks as a paginated deck and return its PackageStats"""
+    renderer = SlideRenderer(theme)
+    renderer.render(blocks)
+    slides = renderer.slides()
+    skeleton = _skeleton()
+    writer = _SlideWriter(renderer, skeleton)
+    parts = []
+    for number, slide in enumerate(slides, 1):
+        xml, rels = writer.slide(slide)
+        parts.append((f'ppt/slides/slide{number}.xml', xml.encode('utf-8')))
+        parts.append((f'ppt/slides/_rels/slide{number}.xml.rels', rels.encode('utf-8')))
+
+    head = skeleton.package_parts(len(slides))
+    with PackageZip(pptx_file, compression) as output:
+        output.write_all(head[:1])
+        output.add_all(skeleton.static_parts.compressed(compression))
+        output.write_all(head[1:] + parts)
+    return output.stats()
+
+
+def convert_markdown(md_file, pptx_file, theme, compression=DEFAULT_COMPRESSION):
+    """Convert a Markdown file to a paginated deck"""
+    return write_slides(read_blocks(md_file), pptx_file, theme, compression)
+
+
+def main(argv=None):
+    from mdconvert.batch import DEFAULT_THEME, DOCUMENT_THEMES
+    from mdconvert.themes import THEMES
+
+    parser = argparse.ArgumentParser(description='Turn a Markdown document into a paginated slide deck')
+    parser.add_argument('input', help='Markdown file')
+    parser.add_argument('-o', '--output', help='deck to write (default: the input with -slides.pptx)')
+    parser.add_argument('--theme', choices=sorted(THEMES), help="theme (default: the document's own)")
+    parser.add_argument('--compression', choices=sorted(COMPRESSION_PROFILES), default=DEFAULT_COMPRESSION,
+                        help="how hard to compress the deck: 'store' for scratch builds, 'max' for downloads")
+    args = parser.parse_args(argv)
+
+    if not os.path.isfile(args.input):
+        parser.error(f"Markdown file not found: {args.input}")
+    output = args.output or os.path.splitext(args.input)[0] + '-slides.pptx'
+    theme = THEMES[args.theme or DOCUMENT_THEMES.get(os.path.basename(args.input), DEFAULT_THEME)]
+    if os.path.dirname(output):
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+    start = time.perf_counter()
+    blocks = read_blocks(args.input)
+    stats = write_slides(blocks, output, theme, args.compression)
+    with zipfile.ZipFile(output) as package:
+        count = sum(1 for name in package.namelist() if re.fullmatch(r'ppt/slides/slide\d+\.xml', name))
+    print(f"✅ {args.input} -> {output}: {count} slides in {time.perf_counter() - start:.2f}s "
+          f"({stats.output_bytes // 1024} KB)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
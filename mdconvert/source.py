@@ -0,0 +1,164 @@
+"""
+Memory-mapped Markdown source with a compact line and block index
+
+The file is mapped rather than read. Building the index decodes one line at
+a time and keeps only numbers, in arrays: where every line starts, and the
+kind and first line of every block. Any block range or H1/H2 section can
+then be parsed again straight from the mapping, so a huge generated file
+costs a few bytes per line instead of a str per line and an object per
+block, and a single section can be read without parsing the rest.
+
+Lines split on '\\n', '\\r\\n' and '\\r', as text-mode reads do, so the
+blocks are the same ones read_blocks returns.
+"""
+
+import mmap
+import os
+import re
+from array import array
+
+from mdconvert.blocks import Blank, iter_blocks, scan_blocks
+
+KINDS = ('heading', 'paragraph', 'list_item', 'quote', 'table', 'code', 'metadata', 'rule', 'blank', 'image')
+_KIND_CODES = {kind: code for code, kind in enumerate(KINDS)}
+_BLANK = _KIND_CODES['blank']
+
+_NEWLINE_RE = re.compile(rb'\r\n|\r|\n')
+_SPLIT_RE = re.compile(r'\r\n|\r|\n')
+
+
+class BlockToken:
+    """A block in the index: its kind and the lines [start, end) it spans"""
+    __slots__ = ('kind', 'start', 'end')
+
+    def __init__(self, kind, start, end):
+        self.kind = kind
+        self.start = start
+        self.end = end
+
+    def __repr__(self):
+        return f'BlockToken({self.kind!r}, {self.start}, {self.end})'
+
+
+def _split_lines(data):
+    return _SPLIT_RE.split(data.decode('utf-8'))
+
+
+def parse_span(md_file, start, end):
+    """Parse bytes [start, end) of md_file, a span returned by SourceIndex.section_span"""
+    with open(md_file, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    return list(iter_blocks(_split_lines(data)))
+
+
+class SourceIndex:
+    """Line offsets and block kinds of a Markdown file, backed by a read-only mmap"""
+
+    def __init__(self, md_file):
+        self.path = md_file
+        with open(md_file, 'rb') as f:
+            self.size = os.fstat(f.fileno()).st_size
+            # An empty file cannot be mapped
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b''
+
+        offset = 'Q' if self.size >= 1 << 32 else 'I'
+        self.line_starts = array(offset)
+        self.block_kinds = array('B')
+        self.block_starts = array('I')    # first line of each block
+        self.section_starts = array('I')  # first block of each H1/H2 section
+
+        kinds, starts, sections = self.block_kinds, self.block_starts, self.section_starts
+        for block, start, _ in scan_blocks(self._scan_lines()):
+            if not kinds or (block.kind == 'heading' and block.level <= 2):
+                sections.append(len(kinds))
+            kinds.append(_KIND_CODES[block.kind])
+            starts.append(start)
+        self.line_count = len(self.line_starts)
+
+    def _scan_lines(self):
+        """Decode lines one at a time, recording where each starts"""
+        buffer, starts = self._buffer, self.line_starts
+        position = 0
+        starts.append(0)
+        for match in _NEWLINE_RE.finditer(buffer):
+            yield buffer[position:match.start()].decode('utf-8')
+            position = match.end()
+            starts.append(position)
+        yield buffer[position:].decode('utf-8')
+
+    def close(self):
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return len(self.block_kinds)
+
+    def token(self, i):
+        end = self.block_starts[i + 1] if i + 1 < len(self.block_starts) else self.line_count
+        return BlockToken(KINDS[self.block_kinds[i]], self.block_starts[i], end)
+
+    def tokens(self):
+        for i in range(len(self.block_kinds)):
+            yield self.token(i)
+
+    def line_span(self, start, end):
+        """Byte range of lines [start, end), without the final line's newline"""
+        if end >= self.line_count:
+            return self.line_starts[start], self.size
+        stop = self.line_starts[end]
+        stop -= 2 if self._buffer[max(stop - 2, 0):stop] == b'\r\n' else 1
+        return self.line_starts[start], stop
+
+    def lines(self, start, end):
+        """Lines [start, end) decoded from the mapping"""
+        if start >= end:
+            return []
+        first, stop = self.line_span(start, end)
+        return _split_lines(self._buffer[first:stop])
+
+    def _block_lines(self, first, last):
+        # The first block starts with the document, so a dropped blank line stays dropped
+        start = self.block_starts[first] if first else 0
+        end = self.block_starts[last] if last < len(self.block_starts) else self.line_count
+        return start, end
+
+    def blocks(self, first=0, last=None):
+        """AST blocks [first, last), parsed again from the mapping"""
+        last = len(self.block_kinds) if last is None else last
+        if first >= last:
+            return []
+        # A blank first line would be taken for leading space and dropped
+        prefix = []
+        if self.block_kinds[first] == _BLANK:
+            prefix.append(Blank())
+            first += 1
+            if first == last:
+                return prefix
+        return prefix + list(iter_blocks(self.lines(*self._block_lines(first, last))))
+
+    def section_bounds(self, i):
+        """Blocks [first, last) of the i-th H1/H2 section"""
+        last = self.section_starts[i + 1] if i + 1 < len(self.section_starts) else len(self.block_kinds)
+        return self.section_starts[i], last
+
+    def section(self, i):
+        """The blocks of the i-th section, as split_sections would group them"""
+        return self.blocks(*self.section_bounds(i))
+
+    def section_span(self, i):
+        """Byte range of the i-th section, for parse_span in another process"""
+        return self.line_span(*self._block_lines(*self.section_bounds(i)))
+
+    def section_spans(self):
+        return [self.section_span(i) for i in range(len(self.section_starts))]
+
+    def sections(self):
+        for i in range(len(self.section_starts)):
+            yield self.section(i)
@@ -0,0 +1,104 @@
+"""
+Content-addressed writes and publishing: leave unchanged artifacts alone
+
+Output is reproducible (see mdconvert.package), so an artifact's SHA-256
+says whether it really changed. Converters write to a staging file next to
+the output; commit() moves it into place only when its hash differs from
+the file already there, so an unchanged output keeps its bytes and mtime.
+
+ArtifactStore is a publish directory, the tree the artifact sync uploads,
+with a manifest of the hash of every file in it. publish() copies an
+artifact in only when its hash differs from the manifest's, so a docs
+build that changed two documents publishes two files.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+
+MANIFEST = '.mdconvert-manifest.json'
+_CHUNK = 1 << 20
+
+
+def file_digest(path):
+    """Hex SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def staging_path(output):
+    """Where to write output before commit(), in the same directory so the move is atomic"""
+    directory, name = os.path.split(output)
+    return os.path.join(directory, f'.{name}.{os.getpid()}.tmp')
+
+
+def commit(staged, output):
+    """Move staged over output unless output already has the same contents
+
+    Returns (digest, changed). The staged file is gone either way.
+    """
+    digest = file_digest(staged)
+    if os.path.isfile(output) and file_digest(output) == digest:
+        os.remove(staged)
+        return digest, False
+    os.replace(staged, output)
+    return digest, True
+
+
+class ArtifactStore:
+    """A publish directory and the manifest of what it holds"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, MANIFEST)
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                self.artifacts = json.load(f)['artifacts']
+        except FileNotFoundError:
+            self.artifacts = {}
+
+    def publish(self, path, name, digest=None):
+        """Copy path to name under the store unless that content is already there
+
+        Returns True when the file was copied.
+        """
+        digest = digest or file_digest(path)
+        target = os.path.join(self.directory, name)
+        if self.artifacts.get(name) == digest and os.path.isfile(target):
+            return False
+        os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+        staged = staging_path(target)
+        shutil.copyfile(path, staged)
+        os.replace(staged, target)
+        self.artifacts[name] = digest
+        return True
+
+    def save(self):
+        os.makedirs(self.directory, exist_ok=True)
+        staged = staging_path(self.manifest_path)
+        with open(staged, 'w', encoding='utf-8') as f:
+            json.dump({'artifacts': dict(sorted(self.artifacts.items()))}, f, indent=2)
+        os.replace(staged, self.manifest_path)
+
+
+def publish_results(results, directory, root=None):
+    """Publish every successful Result's output, named relative to root
+
+    Returns the outputs that were copied; the rest were already published
+    with the same contents.
+    """
+    store = ArtifactStore(directory)
+    published = []
+    for result in results:
+        if result.ok:
+            name = os.path.relpath(result.output, root or os.curdir).replace(os.sep, '/')
+            if name.startswith('../'):
+                raise ValueError(f"{result.output} is outside {root or os.curdir}; cannot publish it")
+            if store.publish(result.output, name, result.sha256):
+                published.append(result.output)
+    store.save()
+    return published
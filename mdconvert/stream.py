@@ -0,0 +1,77 @@
+"""
+Streaming Markdown to Word conversion with bounded memory
+
+The Markdown file is read line by line and rendered a chunk of blocks at a
+time. Each chunk's body XML is written straight into word/document.xml inside
+the output zip and then dropped from the tree, so peak memory depends on the
+chunk size rather than on the size of the document.
+"""
+
+import os
+from itertools import islice
+
+from mdconvert.blocks import iter_blocks, iter_lines
+from mdconvert.docx_render import DocxRenderer
+from mdconvert.images import image_blocks
+from mdconvert.package import DEFAULT_COMPRESSION, body_fragment, namespace_declarations, write_package
+from mdconvert.profile import NULL_PROFILER
+from mdconvert.template import load_template
+
+FLUSH_BLOCKS = 256
+
+
+def _drain(body, out, declared):
+    """Write and remove every body child before the trailing sectPr"""
+    sect_pr = body.sectPr
+    children = []
+    for child in body.iterchildren():
+        if child is sect_pr:
+            break
+        children.append(child)
+    out.write(b''.join(body_fragment(child, declared) for child in children))
+    for child in children:
+        body.remove(child)
+
+
+def stream_markdown(md_file, docx_file, theme, flush_blocks=FLUSH_BLOCKS, profiler=NULL_PROFILER,
+                    template=None, compression=DEFAULT_COMPRESSION, search=None):
+    """Convert a Markdown file to a Word document without holding it in memory
+
+    Produces the same document.xml as convert_markdown. The section cache
+    is not used: it works on whole H1/H2 sections, which are unbounded.
+    A mdconvert.search DocumentIndex passed as search is fed each chunk of
+    blocks as it is parsed. Returns the PackageStats.
+    """
+    with profiler.phase('setup'):
+        base = load_template(theme, template)
+        doc = base.document()
+        body = doc.element.body
+        # The template's own body content is already part of base.head
+        for child in list(body):
+            if child is not body.sectPr:
+                body.remove(child)
+        renderer = DocxRenderer(doc, theme, base)
+        renderer.use_images(os.path.dirname(md_file))
+    if profiler.enabled:
+        renderer.profile(profiler)
+    with profiler.phase('images'):
+        images = renderer.images.scan(image_blocks(md_file))
+    declared = namespace_declarations(doc.element)
+
+    def write_body(out):
+        with open(md_file, 'r', encoding='utf-8') as f:
+            blocks = iter_blocks(iter_lines(f))
+            while True:
+                with profiler.phase('parse'):
+                    chunk = list(islice(blocks, flush_blocks))
+                if not chunk:
+                    break
+                if search is not None:
+                    with profiler.phase('index'):
+                        search.add(chunk)
+                with profiler.phase('render'):
+                    renderer.render(chunk)
+                with profiler.phase('write'):
+                    _drain(body, out, declared)
+
+    return write_package(base, docx_file, write_body, profiler, compression, images)
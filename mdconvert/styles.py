@@ -0,0 +1,126 @@
+"""
+Named Word styles the renderers reference, registered once per document
+"""
+
+from docx.enum.style import WD_STYLE_TYPE
+from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_UNDERLINE
+from docx.oxml import OxmlElement, parse_xml
+from docx.oxml.ns import qn
+from docx.shared import Inches, Pt, RGBColor
+
+from mdconvert.tables import header_table_style_xml
+
+CODE_FONT = 'Courier New'
+TABLE_STYLE = 'Light Grid Accent 1'
+
+
+def _get_or_add_style(styles, name, style_type):
+    try:
+        return styles[name]
+    except KeyError:
+        return styles.add_style(name, style_type)
+
+
+def _shade(element, fill):
+    """Append a solid w:shd fill to an rPr/pPr element"""
+    shading_elm = OxmlElement('w:shd')
+    shading_elm.set(qn('w:val'), 'clear')
+    shading_elm.set(qn('w:color'), 'auto')
+    shading_elm.set(qn('w:fill'), fill)
+    element.append(shading_elm)
+
+
+def register_styles(doc, theme):
+    """Create the named styles the renderer references, once per document
+
+    Returns the style IDs keyed by role. Blocks reference styles by ID
+    because python-docx resolves a style name or object with a scan of the
+    whole style sheet on every assignment.
+    """
+    styles = doc.styles
+
+    if theme.body_font is not None:
+        normal_font = styles['Normal'].font
+        normal_font.name, size = theme.body_font
+        normal_font.size = Pt(size)
+
+    style_ids = {
+        'list_bullet': styles['List Bullet'].style_id,
+        'list_number': styles['List Number'].style_id,
+    }
+
+    # Headings reuse Word's built-in Heading 1-4 styles
+    for level in range(1, 5):
+        heading_format = theme.heading(level)
+        style = styles[f'Heading {level}']
+        style_ids[f'heading{level}'] = style.style_id
+        style.font.size = Pt(heading_format.size)
+        style.font.color.rgb = RGBColor.from_string(heading_format.color)
+        style.font.bold = True
+        if heading_format.centered:
+            style.paragraph_format.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        if heading_format.space_before is not None:
+            style.paragraph_format.space_before = Pt(heading_format.space_before)
+
+    # A whole fenced block is one Code paragraph, so shading goes on the
+    # paragraph (w:shd must precede spacing and indent in pPr)
+    code = _get_or_add_style(styles, 'Code', WD_STYLE_TYPE.PARAGRAPH)
+    code.base_style = styles['Normal']
+    if theme.code_shading is not None:
+        _shade(code.element.get_or_add_pPr(), theme.code_shading)
+    code.font.name = CODE_FONT
+    code.font.size = Pt(9)
+    code.font.color.rgb = RGBColor.from_string(theme.code_color)
+    code.paragraph_format.left_indent = Inches(0.5)
+    if theme.code_spacing is not None:
+        code.paragraph_format.space_before = Pt(theme.code_spacing)
+        code.paragraph_format.space_after = Pt(theme.code_spacing)
+    code.paragraph_format.keep_together = True
+
+    quote = _get_or_add_style(styles, 'Quote', WD_STYLE_TYPE.PARAGRAPH)
+    quote.font.italic = True
+    quote.font.color.rgb = RGBColor.from_string(theme.quote_color)
+    quote.paragraph_format.left_indent = Inches(0.5)
+
+    table_header = _get_or_add_style(styles, 'Table Header', WD_STYLE_TYPE.PARAGRAPH)
+    table_header.base_style = styles['Normal']
+    table_header.font.bold = True
+    if theme.table_header_color is not None:
+        table_header.font.color.rgb = RGBColor.from_string(theme.table_header_color)
+
+    # Header shading comes from a table style derived from the stock grid
+    table = styles[TABLE_STYLE]
+    if theme.table_header_fill is not None:
+        try:
+            table = styles['Markdown Table']
+        except KeyError:
+            styles.element.append(parse_xml(header_table_style_xml(
+                'MarkdownTable', 'Markdown Table', table.style_id,
+                theme.table_header_fill, theme.table_header_color)))
+            table = styles['Markdown Table']
+
+    strong = _get_or_add_style(styles, 'Strong', WD_STYLE_TYPE.CHARACTER)
+    strong.font.bold = True
+    if theme.bold_color is not None:
+        strong.font.color.rgb = RGBColor.from_string(theme.bold_color)
+
+    inline_code = _get_or_add_style(styles, 'Inline Code', WD_STYLE_TYPE.CHARACTER)
+    inline_code.font.name = CODE_FONT
+    inline_code.font.size = Pt(10)
+    inline_code.font.color.rgb = RGBColor.from_string(theme.inline_code_color)
+
+    # Word's built-in name, so links look like the ones Word itself inserts
+    link = _get_or_add_style(styles, 'Hyperlink', WD_STYLE_TYPE.CHARACTER)
+    link.font.color.rgb = RGBColor.from_string(theme.link_color)
+    link.font.underline = WD_UNDERLINE.SINGLE
+
+    style_ids.update(
+        code=code.style_id,
+        quote=quote.style_id,
+        table=table.style_id,
+        table_header=table_header.style_id,
+        strong=strong.style_id,
+        inline_code=inline_code.style_id,
+        link=link.style_id,
+    )
+    return style_ids
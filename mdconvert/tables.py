@@ -0,0 +1,76 @@
+"""
+Bulk WordprocessingML table builder for Markdown pipe tables
+
+Tables are serialized to a w:tbl string in one pass and parsed once, instead
+of going through python-docx's row/cell proxies for every cell.
+"""
+
+from xml.sax.saxutils import escape
+
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+
+EMU_PER_TWIP = 635
+
+# Header shading is applied by the table style's firstRow formatting, so the
+# header row needs firstRow enabled in tblLook
+_TBL_LOOK = ('<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" '
+             'w:lastRow="0" w:noHBand="0" w:noVBand="1" w:val="04A0"/>')
+
+
+def _cell_paragraph(text, style_id=None):
+    ppr = f'<w:pPr><w:pStyle w:val="{style_id}"/></w:pPr>' if style_id else ''
+    if not text:
+        return f'<w:p>{ppr}</w:p>' if ppr else '<w:p/>'
+    return f'<w:p>{ppr}<w:r><w:t xml:space="preserve">{escape(text)}</w:t></w:r></w:p>'
+
+
+def table_xml(header, rows, table_style_id, header_style_id, width, namespaces=''):
+    """Serialize a header row plus body rows as a w:tbl element string
+
+    width is the usable text width in twips, split evenly across columns.
+    namespaces is inserted into the root tag (e.g. nsdecls('w')) when the
+    string is parsed on its own.
+    """
+    cols = len(header)
+    col_width = width // cols
+    tc_open = f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{col_width}"/></w:tcPr>'
+    grid = f'<w:gridCol w:w="{col_width}"/>' * cols
+
+    parts = [
+        (f'<w:tbl {namespaces}>' if namespaces else '<w:tbl>') +
+        f'<w:tblPr><w:tblStyle w:val="{table_style_id}"/>'
+        f'<w:tblW w:type="auto" w:w="0"/>{_TBL_LOOK}</w:tblPr>'
+        f'<w:tblGrid>{grid}</w:tblGrid>',
+        '<w:tr><w:trPr><w:tblHeader/></w:trPr>',
+    ]
+    for text in header:
+        parts.append(tc_open + _cell_paragraph(text, header_style_id) + '</w:tc>')
+    parts.append('</w:tr>')
+
+    for row in rows:
+        parts.append('<w:tr>')
+        for text in row:
+            parts.append(tc_open + _cell_paragraph(text) + '</w:tc>')
+        parts.append('</w:tr>')
+
+    parts.append('</w:tbl>')
+    return ''.join(parts)
+
+
+def build_table(header, rows, table_style_id, header_style_id, width):
+    """Return a parsed CT_Tbl element for a Markdown table"""
+    return parse_xml(table_xml(header, rows, table_style_id, header_style_id,
+                               width, nsdecls('w')))
+
+
+def header_table_style_xml(style_id, name, base_style_id, fill, color=None):
+    """Return a w:style table style that shades and colors the header row"""
+    color_xml = f'<w:color w:val="{color}"/>' if color else ''
+    return (
+        f'<w:style {nsdecls("w")} w:type="table" w:customStyle="1" w:styleId="{style_id}">'
+        f'<w:name w:val="{name}"/><w:basedOn w:val="{base_style_id}"/>'
+        f'<w:tblStylePr w:type="firstRow"><w:rPr><w:b/>{color_xml}</w:rPr>'
+        f'<w:tcPr><w:shd w:val="clear" w:color="auto" w:fill="{fill}"/></w:tcPr>'
+        '</w:tblStylePr></w:style>'
+    )
@@ -0,0 +1,169 @@
+"""
+Word, HTML and slide versions of a document from a single parse
+
+The Markdown is parsed once into the AST, and each format's renderer gets
+the same blocks: Word (mdconvert.docx_render), a standalone HTML page
+(mdconvert.html_render), an outline deck (mdconvert.outline) and a deck
+paginated to fit every slide (mdconvert.slides). With more
+than one CPU the renderers run at the same time in the shared process pool
+(see mdconvert.parallel), so a build of every format takes about as long as
+its slowest renderer.
+
+    python -m mdconvert.targets EXECUTIVE_SUMMARY.md
+    python -m mdconvert.targets USER_MANUAL.md --to docx html --out-dir build/help
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import traceback
+from dataclasses import asdict
+
+from mdconvert.batch import DEFAULT_THEME, DOCUMENT_THEMES, Result
+from mdconvert.cpus import available_cpus
+from mdconvert.blocks import read_blocks
+from mdconvert.package import COMPRESSION_PROFILES, DEFAULT_COMPRESSION
+from mdconvert.parallel import get_pool
+from mdconvert.store import commit, publish_results, staging_path
+from mdconvert.themes import THEMES
+
+# Format -> output file suffix
+TARGETS = {'docx': '.docx', 'html': '.html', 'pptx': '.pptx', 'slides': '-slides.pptx'}
+
+
+def _write(target, blocks, output, theme, base_dir, template, compression):
+    """Render blocks to output in one format; returns (save seconds, output bytes)"""
+    if target == 'docx':
+        from mdconvert.docx_render import write_document
+
+        stats = write_document(blocks, output, theme, base_dir, template=template, compression=compression)
+    elif target == 'pptx':
+        from mdconvert.outline import write_outline
+
+        stats = write_outline(blocks, output, theme, compression)
+    elif target == 'slides':
+        from mdconvert.slides import write_slides
+
+        stats = write_slides(blocks, output, theme, compression)
+    else:
+        from mdconvert.html_render import write_html
+
+        return None, write_html(blocks, output, theme, base_dir)
+    return stats.save_seconds, stats.output_bytes
+
+
+def _render_target(task):
+    """Write one format, returning a Result instead of raising"""
+    target, md_file, blocks, output, theme, template, compression, skip_unchanged = task
+    # Written beside output and moved into place, so a failure leaves the old file alone
+    staged = staging_path(output)
+    start = time.perf_counter()
+    try:
+        output_dir = os.path.dirname(output)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        save_seconds, output_bytes = _write(target, blocks, staged, THEMES[theme], os.path.dirname(md_file),
+                                            template, compression)
+        if skip_unchanged:
+            digest, changed = commit(staged, output)
+        else:
+            os.replace(staged, output)
+            digest, changed = None, None
+    except Exception:
+        if os.path.exists(staged):
+            os.remove(staged)
+        return Result(md_file, output, theme, False, time.perf_counter() - start, traceback.format_exc())
+    return Result(md_file, output, theme, True, time.perf_counter() - start, sha256=digest, changed=changed,
+                  save_seconds=save_seconds, output_bytes=output_bytes)
+
+
+def output_paths(md_file, targets, out_dir=None):
+    """Each target's output path: the Markdown file's name with the format's suffix"""
+    base = os.path.splitext(md_file)[0]
+    if out_dir is not None:
+        base = os.path.join(out_dir, os.path.relpath(base))
+    return {target: base + TARGETS[target] for target in targets}
+
+
+def convert_targets(md_file, outputs, theme, template=None, compression=DEFAULT_COMPRESSION, workers=None,
+                    skip_unchanged=False):
+    """Parse md_file once and write it in every format of outputs ({target: path})
+
+    theme is a theme name. Returns a Result per target, in outputs' order.
+    """
+    unknown = set(outputs) - set(TARGETS)
+    if unknown:
+        raise ValueError(f"Unknown targets {sorted(unknown)}; expected some of {sorted(TARGETS)}")
+    blocks = read_blocks(md_file)
+    tasks = [(target, md_file, blocks, output, theme, template, compression, skip_unchanged)
+             for target, output in outputs.items()]
+    workers = min(workers or available_cpus(), len(tasks))
+    if workers < 2:
+        return [_render_target(task) for task in tasks]
+    return list(get_pool(workers).map(_render_target, tasks))
+
+
+def _print_result(result):
+    if result.ok and result.changed is False:
+        print(f"✅ {result.input} -> {result.output} unchanged ({result.seconds:.2f}s)")
+    elif result.ok:
+        print(f"✅ {result.input} -> {result.output} ({result.seconds:.2f}s)")
+    else:
+        print(f"❌ {result.output} failed after {result.seconds:.2f}s\n{result.error}", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Convert a Markdown file to several formats from one parse')
+    parser.add_argument('input', help='Markdown file')
+    parser.add_argument('--to', nargs='+', choices=sorted(TARGETS), default=sorted(TARGETS),
+                        help='formats to write (default: all)')
+    parser.add_argument('--out-dir', help='write outputs under this directory')
+    parser.add_argument('--theme', choices=sorted(THEMES), help="theme (default: the document's own)")
+    parser.add_argument('--template', help='.docx or .dotx to build the Word version on')
+    parser.add_argument('-j', '--jobs', type=int, help='processes rendering formats (default: available CPUs)')
+    parser.add_argument('--compression', choices=sorted(COMPRESSION_PROFILES), default=DEFAULT_COMPRESSION,
+                        help="how hard to compress .docx and .pptx outputs")
+    parser.add_argument('--skip-unchanged', action='store_true',
+                        help='leave an output untouched when the new one has the same contents')
+    parser.add_argument('--publish', metavar='DIR',
+                        help='copy outputs whose contents changed into DIR, tracked by content hash')
+    parser.add_argument('--report', help='write per-format timings as JSON to this path')
+    args = parser.parse_args(argv)
+
+    if not os.path.isfile(args.input):
+        parser.error(f"Markdown file not found: {args.input}")
+    if args.template and not os.path.isfile(args.template):
+        parser.error(f"Template not found: {args.template}")
+    theme = args.theme or DOCUMENT_THEMES.get(os.path.basename(args.input), DEFAULT_THEME)
+    outputs = output_paths(args.input, args.to, args.out_dir)
+
+    start = time.perf_counter()
+    results = convert_targets(args.input, outputs, theme, os.path.abspath(args.template) if args.template else None,
+                              args.compression, args.jobs, args.skip_unchanged)
+    elapsed = time.perf_counter() - start
+    for result in results:
+        _print_result(result)
+    failed = [result for result in results if not result.ok]
+    print(f"Wrote {len(results) - len(failed)}/{len(results)} formats in {elapsed:.2f}s")
+
+    if args.publish:
+        try:
+            published = publish_results(results, args.publish, args.out_dir)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+        print(f"Published {len(published)} changed of {len(results) - len(failed)} outputs to {args.publish}")
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump({
+                'wall_seconds': elapsed,
+                'outputs': [asdict(result) for result in results],
+            }, f, indent=2)
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""
+Styled base packages, built once per theme and template file
+
+Opening python-docx's default template (or a corporate .dotx), applying the
+theme's margins and registering its styles costs more than converting a
+short document. A BaseTemplate does that once and keeps the result both as
+a parsed document, cloned for each python-docx document, and as the parts
+that never change, which the streaming writers copy already compressed.
+"""
+
+import copy
+import functools
+import io
+import os
+import re
+import zipfile
+
+from docx import Document
+from docx.shared import Inches
+from lxml import etree
+
+from mdconvert.package import DOCUMENT_PART, StaticParts, body_fragment, namespace_declarations
+from mdconvert.styles import register_styles
+from mdconvert.tables import EMU_PER_TWIP
+
+TEMPLATE_CONTENT_TYPES = (
+    b'application/vnd.openxmlformats-officedocument.wordprocessingml.template.main+xml',
+    b'application/vnd.ms-word.template.macroEnabledTemplate.main+xml',
+)
+DOCUMENT_CONTENT_TYPE = b'application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml'
+
+_DOC_PR_ID_RE = re.compile(rb'<wp:docPr id="(\d+)"')
+_BOOKMARK_ID_RE = re.compile(rb'<w:bookmarkStart w:id="(\d+)"')
+
+
+def open_document(source=None):
+    """Open a .docx, or a .dotx/.dotm template, as a python-docx Document
+
+    python-docx only accepts documents, so a template's main part content
+    type is rewritten to the document one. None opens the default template.
+    """
+    if source is None:
+        return Document()
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(source) as package, \
+            zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as output:
+        for info in package.infolist():
+            data = package.read(info.filename)
+            if info.filename == '[Content_Types].xml':
+                for content_type in TEMPLATE_CONTENT_TYPES:
+                    data = data.replace(content_type, DOCUMENT_CONTENT_TYPE)
+            output.writestr(info, data)
+    return Document(buffer)
+
+
+def new_document(theme, source=None):
+    """Open source (or the default template) with the theme's page setup applied"""
+    doc = open_document(source)
+    if theme.margins is not None:
+        for section in doc.sections:
+            section.top_margin = Inches(theme.margins)
+            section.bottom_margin = Inches(theme.margins)
+            section.left_margin = Inches(theme.margins)
+            section.right_margin = Inches(theme.margins)
+    return doc
+
+
+def text_width(doc):
+    """Usable width of the last section in twips"""
+    section = doc.sections[-1]
+    return (section.page_width - section.left_margin - section.right_margin) // EMU_PER_TWIP
+
+
+class BaseTemplate:
+    """A theme applied to a template package, kept ready to clone
+
+    Any content already in the template body (a cover page, letterhead)
+    stays ahead of the converted Markdown.
+    """
+
+    def __init__(self, theme, source=None):
+        doc = new_document(theme, source)
+        self.theme = theme
+        self.source = source
+        self.style_ids = register_styles(doc, theme)
+        self.width = text_width(doc)
+
+        buffer = io.BytesIO()
+        doc.save(buffer)
+
+        # document.xml around the point where converted blocks are inserted
+        root = doc.element
+        body = root.body
+        declared = namespace_declarations(root)
+        xml = etree.tostring(root, encoding='UTF-8', standalone=True)
+        head = [xml[:xml.index(b'<w:body>') + len(b'<w:body>')]]
+        head.extend(body_fragment(child, declared) for child in body if child is not body.sectPr)
+        self.head = b''.join(head)
+        sect_pr = b'' if body.sectPr is None else body_fragment(body.sectPr, declared)
+        self.tail = sect_pr + b'</w:body></w:document>'
+
+        # Drawings and bookmarks already in the template body keep their IDs;
+        # converted ones follow (see mdconvert.links)
+        self.head_blocks = len(body) - (body.sectPr is not None)
+        self.next_drawing_id = max(map(int, _DOC_PR_ID_RE.findall(self.head)), default=0) + 1
+        self.next_bookmark_id = max(map(int, _BOOKMARK_ID_RE.findall(self.head)), default=0) + 1
+        # The template's parts, for the content types of documents that add images
+        self.part_types = [(part.partname, part.content_type) for part in doc.part.package.iter_parts()]
+
+        # Every other part, compressed once per profile and copied into each output
+        with zipfile.ZipFile(io.BytesIO(buffer.getvalue())) as package:
+            self.static_parts = StaticParts.from_zip(package, skip=(DOCUMENT_PART,))
+
+        # Rendered XML depends only on the style IDs and the text width
+        self.layout = f'{sorted(self.style_ids.items())}|{self.width}'
+
+        # Converting only changes document.xml, its relationships and the package's
+        # part list; clones share every other part (styles, numbering, settings, ...)
+        self._document = doc
+        self._shared_parts = {id(part): part for part in doc.part.package.iter_parts() if part is not doc.part}
+
+    def document(self):
+        """A fresh python-docx Document with the theme's styles and page setup
+
+        A deep copy of the parsed template that shares its unchanging parts,
+        instead of unzipping and parsing the saved package again.
+        """
+        return copy.deepcopy(self._document, dict(self._shared_parts))
+
+
+@functools.lru_cache(maxsize=16)
+def _load_template(theme, source, stamp):
+    return BaseTemplate(theme, source)
+
+
+def load_template(theme, source=None):
+    """Return the cached BaseTemplate for theme and a .docx/.dotx source
+
+    A source file that changes on disk is loaded again.
+    """
+    stamp = None
+    if source is not None:
+        source = os.path.abspath(source)
+        stat = os.stat(source)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+    return _load_template(theme, source, stamp)
@@ -0,0 +1,97 @@
+"""
+Visual themes for the Markdown converters
+
+Colors are 'RRGGBB' hex strings, sizes are in points and indents/margins in
+inches, so the same theme can drive any output backend.
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+
+@dataclass(frozen=True)
+class HeadingStyle:
+    size: int
+    color: str
+    centered: bool = False
+    space_before: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class Theme:
+    name: str
+    headings: Tuple[HeadingStyle, HeadingStyle, HeadingStyle, HeadingStyle]
+    body_font: Optional[Tuple[str, int]] = None
+    margins: Optional[float] = None
+    code_color: str = '000000'
+    code_shading: Optional[str] = None
+    code_spacing: Optional[int] = None
+    inline_code_color: str = 'C7254E'
+    link_color: str = '0563C1'
+    bold_color: Optional[str] = None
+    quote_color: str = '666666'
+    rule: str = 'line'  # 'line' draws a light underscore rule, 'space' leaves a gap
+    table_header_color: Optional[str] = None
+    table_header_fill: Optional[str] = None
+    space_after_table: bool = False
+    metadata_lines: bool = False
+    checkmark_bullets: bool = False
+    image_dpi: int = 150  # pixels kept per inch of a picture's printed width
+
+    def heading(self, level):
+        return self.headings[level - 1]
+
+
+USER_MANUAL_THEME = Theme(
+    name='user-manual',
+    headings=(
+        HeadingStyle(24, '003366'),
+        HeadingStyle(18, '0066CC'),
+        HeadingStyle(14, '0066CC'),
+        HeadingStyle(12, '333333'),
+    ),
+    body_font=('Calibri', 11),
+)
+
+CTO_THEME = Theme(
+    name='cto',
+    headings=(
+        HeadingStyle(26, '002060', centered=True),
+        HeadingStyle(18, '003366', space_before=12),
+        HeadingStyle(14, '0066CC'),
+        HeadingStyle(12, '333333'),
+    ),
+    margins=1.0,
+    code_color='003366',
+    code_shading='F5F5F5',
+    code_spacing=2,
+    bold_color='003366',
+    table_header_color='FFFFFF',
+    table_header_fill='002060',
+    space_after_table=True,
+    metadata_lines=True,
+    checkmark_bullets=True,
+)
+
+EXECUTIVE_THEME = Theme(
+    name='executive',
+    headings=(
+        HeadingStyle(28, '002060', centered=True),
+        HeadingStyle(20, '003366', space_before=12),
+        HeadingStyle(16, '0066CC'),
+        HeadingStyle(13, '333333'),
+    ),
+    margins=1.0,
+    code_color='003366',
+    code_shading='F5F5F5',
+    code_spacing=2,
+    bold_color='003366',
+    rule='space',
+    table_header_color='FFFFFF',
+    table_header_fill='002060',
+    space_after_table=True,
+    metadata_lines=True,
+    checkmark_bullets=True,
+)
+
+THEMES = {theme.name: theme for theme in (USER_MANUAL_THEME, CTO_THEME, EXECUTIVE_THEME)}
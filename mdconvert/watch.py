@@ -0,0 +1,138 @@
+"""
+Watch Markdown sources and rebuild only the outputs affected by each save
+
+Sources are polled by mtime and size, which needs no platform support and
+is cheap at the size of this repo. A burst of saves is debounced into one
+rebuild. Rebuilds run in this process, so python-docx, the styles and the
+section cache stay warm and only the edited sections are rendered again.
+"""
+
+import importlib
+import os
+import sys
+import time
+import traceback
+
+from mdconvert.batch import Options, Result, collect_jobs, convert_job, init_worker
+
+POLL_INTERVAL = 0.25
+DEBOUNCE = 0.3
+RESCAN_INTERVAL = 2.0
+
+# Scripts that generate a deck: script -> (output, module function to call, other inputs)
+DECK_SCRIPTS = {
+    'create_exec_presentation.py': ('AUREONCARE_EXECUTIVE_PRESENTATION.pptx', 'create_executive_slide',
+                                    (os.path.join('decks', 'executive.json'),)),
+}
+
+
+def _stamp(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _stale(source, output):
+    """True when output is missing or older than source"""
+    source_stamp, output_stamp = _stamp(source), _stamp(output)
+    return output_stamp is None or (source_stamp is not None and output_stamp[0] < source_stamp[0])
+
+
+def build_deck(script):
+    """Re-import a deck script and run its build function"""
+    output, function, _ = DECK_SCRIPTS[script]
+    module_name = os.path.splitext(script)[0]
+    start = time.perf_counter()
+    try:
+        if module_name in sys.modules:
+            module = importlib.reload(sys.modules[module_name])
+        else:
+            module = importlib.import_module(module_name)
+        getattr(module, function)()
+    except Exception:
+        return Result(script, output, '', False, time.perf_counter() - start, traceback.format_exc())
+    return Result(script, output, '', True, time.perf_counter() - start)
+
+
+class Watcher:
+    """Track source stamps and report the sources that changed and settled"""
+
+    def __init__(self, patterns=(), manifest=None, theme=None, out_dir=None):
+        self.patterns = patterns
+        self.manifest = manifest
+        self.theme = theme
+        self.out_dir = out_dir
+        self.jobs = {}
+        self.decks = [script for script in DECK_SCRIPTS if os.path.exists(script)]
+        # Every file a deck is built from -> its script
+        self.deck_inputs = {path: script for script in self.decks
+                            for path in (script, *DECK_SCRIPTS[script][2]) if os.path.exists(path)}
+        self.stamps = {}
+        self.pending = {}
+        self.scanned = 0.0
+
+    def rescan(self):
+        """Pick up added and removed Markdown files"""
+        self.jobs = {job.input: job for job in collect_jobs(self.patterns, self.manifest,
+                                                            self.theme, self.out_dir)}
+        self.scanned = time.monotonic()
+        for path in list(self.jobs) + list(self.deck_inputs):
+            self.stamps.setdefault(path, _stamp(path))
+
+    def stale(self):
+        """Sources whose output is missing or older than the source"""
+        sources = [job.input for job in self.jobs.values() if _stale(job.input, job.output)]
+        sources += [script for script in self.decks
+                    if any(_stale(path, DECK_SCRIPTS[script][0])
+                           for path, owner in self.deck_inputs.items() if owner == script)]
+        return sources
+
+    def poll(self, debounce=DEBOUNCE):
+        """Return the sources changed at least `debounce` seconds ago and quiet since"""
+        if time.monotonic() - self.scanned > RESCAN_INTERVAL:
+            self.rescan()
+        now = time.monotonic()
+        for path in list(self.jobs) + list(self.deck_inputs):
+            stamp = _stamp(path)
+            if stamp != self.stamps.get(path):
+                self.stamps[path] = stamp
+                if stamp is not None:
+                    self.pending[path] = now
+        settled = [path for path, changed in self.pending.items() if now - changed >= debounce]
+        for path in settled:
+            del self.pending[path]
+        return settled
+
+    def build(self, sources):
+        """Rebuild the outputs of sources, returning their Results"""
+        results = []
+        decks = []
+        for source in sources:
+            if source in self.jobs:
+                results.append(convert_job(self.jobs[source]))
+            elif source in self.deck_inputs and self.deck_inputs[source] not in decks:
+                decks.append(self.deck_inputs[source])
+        results.extend(build_deck(script) for script in decks)
+        return results
+
+
+def watch(patterns=(), manifest=None, theme=None, out_dir=None, options=None,
+          on_result=None, interval=POLL_INTERVAL, debounce=DEBOUNCE):
+    """Build stale outputs, then rebuild on every settled change until interrupted"""
+    on_result = on_result or (lambda result: None)
+    init_worker(options or Options())
+    watcher = Watcher(patterns, manifest, theme, out_dir)
+    watcher.rescan()
+    for result in watcher.build(watcher.stale()):
+        on_result(result)
+    print(f"Watching {len(watcher.jobs) + len(watcher.deck_inputs)} sources (Ctrl+C to stop)", flush=True)
+
+    try:
+        while True:
+            time.sleep(interval)
+            for result in watcher.build(watcher.poll(debounce)):
+                on_result(result)
+    except KeyboardInterrupt:
+        return 0
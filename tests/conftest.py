@@ -0,0 +1,70 @@
+import os
+
+import pytest
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_DOCS = ['EXECUTIVE_SUMMARY.md', 'CTO_TECHNICAL_SUMMARY.md', 'USER_MANUAL.md']
+
+SAMPLE = """Intro before any heading, with **bold** and `code`.
+
+# Overview
+
+**Version:** 2.1
+**Status:** ✅ Ready
+
+A paragraph with a [link](https://example.com) and *italics*.
+
+## Tables
+
+| Name | Value |
+|------|-------|
+| a | 1 |
+|  | \\| pipe |
+
+## Lists
+
+- first
+  - nested **item**
+1. numbered
+2. second
+
+> A quote
+
+```python
+def f():
+    return 1
+```
+
+---
+
+### Deeper heading
+
+Closing words.
+
+# Appendix
+
+Last section.
+"""
+
+
+@pytest.fixture(autouse=True, scope='session')
+def _cache_dir(tmp_path_factory):
+    """Keep conversions away from the per-user cache"""
+    previous = os.environ.get('MDCONVERT_CACHE_DIR')
+    os.environ['MDCONVERT_CACHE_DIR'] = str(tmp_path_factory.mktemp('cache'))
+    yield
+    if previous is None:
+        del os.environ['MDCONVERT_CACHE_DIR']
+    else:
+        os.environ['MDCONVERT_CACHE_DIR'] = previous
+
+
+@pytest.fixture
+def sample_md(tmp_path):
+    path = tmp_path / 'sample.md'
+    path.write_text(SAMPLE, encoding='utf-8')
+    return str(path)
+
+
+def repo_doc(name):
+    return os.path.join(REPO, name)
@@ -0,0 +1,80 @@
+import os
+import zipfile
+
+import pytest
+
+from mdconvert import docx_render, ooxml_render
+from mdconvert.batch import BACKENDS, Job, Options, convert_job, init_worker
+from mdconvert.themes import THEMES
+
+from conftest import REPO_DOCS, repo_doc
+
+
+def _parts(path):
+    with zipfile.ZipFile(path) as archive:
+        assert archive.testzip() is None
+        return {name: archive.read(name) for name in archive.namelist()}
+
+
+def _assert_same_parts(expected, actual):
+    expected, actual = _parts(expected), _parts(actual)
+    assert sorted(actual) == sorted(expected)
+    for name in expected:
+        assert actual[name] == expected[name], name
+
+
+@pytest.mark.parametrize('theme', sorted(THEMES))
+def test_ooxml_matches_python_docx(sample_md, tmp_path, theme):
+    docx_render.convert_markdown(sample_md, str(tmp_path / 'a.docx'), THEMES[theme])
+    ooxml_render.convert_markdown(sample_md, str(tmp_path / 'b.docx'), THEMES[theme])
+    _assert_same_parts(tmp_path / 'a.docx', tmp_path / 'b.docx')
+
+
+@pytest.mark.parametrize('name', REPO_DOCS)
+def test_ooxml_matches_python_docx_on_repo_docs(tmp_path, name):
+    theme = THEMES['executive']
+    docx_render.convert_markdown(repo_doc(name), str(tmp_path / 'a.docx'), theme)
+    ooxml_render.convert_markdown(repo_doc(name), str(tmp_path / 'b.docx'), theme)
+    _assert_same_parts(tmp_path / 'a.docx', tmp_path / 'b.docx')
+
+
+@pytest.mark.parametrize('flush_blocks', [1, 5])
+def test_ooxml_flush_size_does_not_matter(sample_md, tmp_path, flush_blocks):
+    theme = THEMES['cto']
+    ooxml_render.convert_markdown(sample_md, str(tmp_path / 'a.docx'), theme)
+    ooxml_render.convert_markdown(sample_md, str(tmp_path / 'b.docx'), theme, flush_blocks=flush_blocks)
+    _assert_same_parts(tmp_path / 'a.docx', tmp_path / 'b.docx')
+
+
+def _bad_input(tmp_path):
+    bad = tmp_path / 'bad.md'
+    bad.write_bytes(b'# Title\n\n' + b'A paragraph.\n\n' * 5000 + b'# Later\n\n\xff broken\n')
+    return str(bad)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_failed_ooxml_conversion_keeps_previous_output(sample_md, tmp_path, workers):
+    output = str(tmp_path / 'out.docx')
+    ooxml_render.convert_markdown(sample_md, output, THEMES['cto'])
+    with open(output, 'rb') as f:
+        previous = f.read()
+    with pytest.raises(UnicodeDecodeError):
+        ooxml_render.convert_markdown(_bad_input(tmp_path), output, THEMES['cto'], workers=workers)
+    with open(output, 'rb') as f:
+        assert f.read() == previous
+    assert sorted(os.listdir(tmp_path)) == ['bad.md', 'out.docx', 'sample.md']
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_failed_job_keeps_previous_output(sample_md, tmp_path, backend):
+    output = str(tmp_path / 'out.docx')
+    init_worker(Options(use_cache=False, backend=backend))
+    assert convert_job(Job(sample_md, output, 'cto')).ok
+    with open(output, 'rb') as f:
+        previous = f.read()
+    result = convert_job(Job(_bad_input(tmp_path), output, 'cto'))
+    assert not result.ok
+    assert 'UnicodeDecodeError' in result.error
+    with open(output, 'rb') as f:
+        assert f.read() == previous
+    assert sorted(os.listdir(tmp_path)) == ['bad.md', 'out.docx', 'sample.md']
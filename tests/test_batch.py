@@ -0,0 +1,70 @@
+import json
+import os
+
+import pytest
+
+from mdconvert.batch import DEFAULT_PATTERNS, Options, collect_jobs, main, run_jobs
+
+
+@pytest.fixture
+def docs(tmp_path, monkeypatch):
+    """A working directory holding a few Markdown files"""
+    root = tmp_path / 'root'
+    (root / 'guides').mkdir(parents=True)
+    for name in ('USER_MANUAL.md', 'EXECUTIVE_SUMMARY.md', 'notes.md', os.path.join('guides', 'setup.md')):
+        (root / name).write_text(f'# {name}\n\nText.\n', encoding='utf-8')
+    (tmp_path / 'outside.md').write_text('# Outside\n', encoding='utf-8')
+    monkeypatch.chdir(root)
+    return root
+
+
+def test_default_is_the_script_documents(docs):
+    jobs = collect_jobs()
+    assert [job.input for job in jobs] == [name for name in DEFAULT_PATTERNS if os.path.exists(name)]
+    assert {job.input: job.theme for job in jobs} == {'USER_MANUAL.md': 'user-manual',
+                                                      'EXECUTIVE_SUMMARY.md': 'executive'}
+
+
+def test_out_dir_keeps_relative_paths(docs):
+    jobs = collect_jobs(['**/*.md'], out_dir='build')
+    assert sorted(job.output for job in jobs) == sorted(
+        os.path.join('build', name) for name in ('EXECUTIVE_SUMMARY.docx', 'USER_MANUAL.docx', 'notes.docx',
+                                                 os.path.join('guides', 'setup.docx')))
+
+
+def test_input_outside_cwd_is_refused_with_out_dir(docs):
+    with pytest.raises(ValueError, match='outside the current directory'):
+        collect_jobs([os.path.join('..', 'outside.md')], out_dir='build')
+    # Beside the input is fine
+    (job,) = collect_jobs([os.path.join('..', 'outside.md')])
+    assert job.output == os.path.join('..', 'outside.docx')
+
+
+def test_clashing_outputs_are_refused(docs):
+    manifest = docs / 'manifest.json'
+    manifest.write_text(json.dumps([{'input': 'notes.md', 'output': 'out.docx'},
+                                    {'input': 'guides/setup.md', 'output': 'out.docx'}]), encoding='utf-8')
+    with pytest.raises(ValueError, match='would both be written to out.docx'):
+        collect_jobs(manifest=str(manifest))
+    manifest.write_text(json.dumps([{'input': 'notes.md', 'output': 'USER_MANUAL.docx'}]), encoding='utf-8')
+    with pytest.raises(ValueError, match='would both be written'):
+        collect_jobs(['USER_MANUAL.md'], manifest=str(manifest))
+
+
+def test_cli_reports_clashes(docs, capsys):
+    manifest = docs / 'manifest.json'
+    manifest.write_text(json.dumps([{'input': 'notes.md', 'output': 'x.docx'},
+                                    {'input': 'USER_MANUAL.md', 'output': 'x.docx'}]), encoding='utf-8')
+    with pytest.raises(SystemExit):
+        main(['--manifest', str(manifest)])
+    assert 'would both be written to x.docx' in capsys.readouterr().err
+    assert not os.path.exists('x.docx')
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_run_jobs(docs, workers):
+    jobs = collect_jobs(['**/*.md'], out_dir='build')
+    results = run_jobs(jobs, workers, Options(use_cache=False))
+    assert [result.input for result in results] == [job.input for job in jobs]
+    assert all(result.ok for result in results)
+    assert all(os.path.isfile(job.output) for job in jobs)
@@ -0,0 +1,66 @@
+from mdconvert.blocks import (Blank, CodeBlock, Heading, ListItem, Metadata, Paragraph, Quote, Rule, Table,
+                              iter_blocks, iter_lines, parse_blocks, read_blocks)
+
+from conftest import SAMPLE
+
+
+def _content(blocks):
+    return [block for block in blocks if block.kind != 'blank']
+
+
+def test_sample_blocks():
+    assert _content(parse_blocks(SAMPLE)) == [
+        Paragraph('Intro before any heading, with **bold** and `code`.'),
+        Heading(1, 'Overview'),
+        Metadata('**Version:** 2.1', 'Version', '2.1'),
+        Metadata('**Status:** ✅ Ready', 'Status', '✅ Ready'),
+        Paragraph('A paragraph with a [link](https://example.com) and *italics*.'),
+        Heading(2, 'Tables'),
+        Table(['Name', 'Value'], [['a', '1'], ['', '| pipe']]),
+        Heading(2, 'Lists'),
+        ListItem(False, 0, '-', 'first'),
+        ListItem(False, 1, '-', 'nested **item**'),
+        ListItem(True, 0, '1.', 'numbered'),
+        ListItem(True, 0, '2.', 'second'),
+        Quote('A quote'),
+        CodeBlock('python', ['def f():', '    return 1']),
+        Rule(),
+        Heading(3, 'Deeper heading'),
+        Paragraph('Closing words.'),
+        Heading(1, 'Appendix'),
+        Paragraph('Last section.'),
+    ]
+
+
+def test_code_fence_hides_markdown():
+    blocks = _content(parse_blocks('```\n# not a heading\n- not a list\n```\n# Heading'))
+    assert blocks == [CodeBlock('', ['# not a heading', '- not a list']), Heading(1, 'Heading')]
+
+
+def test_unterminated_fence_runs_to_the_end():
+    assert _content(parse_blocks('```sh\nrm -rf build\n\n# still code')) == [
+        CodeBlock('sh', ['rm -rf build', '', '# still code'])]
+
+
+def test_checkmark_bullets_and_metadata_without_value():
+    blocks = _content(parse_blocks('✅ done\n❌ missing\n**Note:** a **b:** c'))
+    assert blocks[:2] == [ListItem(False, 0, '✅', 'done'), ListItem(False, 0, '❌', 'missing')]
+    assert blocks[2].kind == 'metadata' and blocks[2].key is None
+
+
+def test_blank_lines_are_blocks():
+    assert parse_blocks('a\n\nb') == [Paragraph('a'), Blank(), Paragraph('b')]
+
+
+def test_read_blocks_matches_parse_blocks(sample_md):
+    assert read_blocks(sample_md) == parse_blocks(SAMPLE)
+
+
+def test_iter_lines_matches_split(tmp_path):
+    for text in ('', 'a', 'a\n', 'a\n\nb', 'a\nb\n\n'):
+        path = tmp_path / 'doc.md'
+        path.write_text(text, encoding='utf-8')
+        with open(path, 'r', encoding='utf-8') as f:
+            assert list(iter_lines(f)) == text.split('\n')
+        with open(path, 'r', encoding='utf-8') as f:
+            assert list(iter_blocks(iter_lines(f))) == parse_blocks(text)
@@ -0,0 +1,70 @@
+import os
+import zipfile
+
+import pytest
+
+from mdconvert.blocks import read_blocks
+from mdconvert.cache import SectionCache, split_sections
+from mdconvert.docx_render import convert_markdown
+from mdconvert.themes import THEMES
+
+from conftest import SAMPLE
+
+THEME = THEMES['user-manual']
+
+
+def _document_xml(path):
+    with zipfile.ZipFile(path) as archive:
+        return archive.read('word/document.xml')
+
+
+def test_one_section_edit_renders_one_section(tmp_path):
+    md_file = tmp_path / 'doc.md'
+    md_file.write_text(SAMPLE, encoding='utf-8')
+    sections = len(split_sections(read_blocks(str(md_file))))
+    cache = SectionCache(str(tmp_path / 'cache'))
+
+    convert_markdown(str(md_file), str(tmp_path / 'cold.docx'), THEME, cache=cache)
+    assert (cache.hits, cache.misses) == (0, sections)
+
+    convert_markdown(str(md_file), str(tmp_path / 'warm.docx'), THEME, cache=cache)
+    assert (cache.hits, cache.misses) == (sections, sections)
+    assert _document_xml(tmp_path / 'warm.docx') == _document_xml(tmp_path / 'cold.docx')
+
+    md_file.write_text(SAMPLE.replace('Closing words.', 'Different closing words.'), encoding='utf-8')
+    convert_markdown(str(md_file), str(tmp_path / 'edited.docx'), THEME, cache=cache)
+    assert (cache.hits, cache.misses) == (2 * sections - 1, sections + 1)
+
+    convert_markdown(str(md_file), str(tmp_path / 'uncached.docx'), THEME)
+    assert _document_xml(tmp_path / 'edited.docx') == _document_xml(tmp_path / 'uncached.docx')
+
+
+def test_theme_change_misses(tmp_path):
+    md_file = tmp_path / 'doc.md'
+    md_file.write_text(SAMPLE, encoding='utf-8')
+    cache = SectionCache(str(tmp_path / 'cache'))
+    convert_markdown(str(md_file), str(tmp_path / 'a.docx'), THEME, cache=cache)
+    misses = cache.misses
+    convert_markdown(str(md_file), str(tmp_path / 'b.docx'), THEMES['cto'], cache=cache)
+    assert cache.hits == 0
+    assert cache.misses == 2 * misses
+
+
+
+def test_overwritten_entry_is_counted_once(tmp_path):
+    cache = SectionCache(str(tmp_path / 'cache'))
+    for _ in range(5):
+        cache.put('key', b'x' * 10000)
+    assert cache._size == os.path.getsize(cache._path('key'))
+
+
+def test_failed_put_leaves_no_temporary_file(tmp_path, monkeypatch):
+    cache = SectionCache(str(tmp_path / 'cache'))
+
+    def fail(*args):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(os, 'replace', fail)
+    with pytest.raises(OSError):
+        cache.put('key', b'data')
+    assert os.listdir(cache.directory) == []
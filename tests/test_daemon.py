@@ -0,0 +1,85 @@
+import os
+import threading
+
+import pytest
+
+from mdconvert import client
+from mdconvert.batch import Options
+from mdconvert.client import default_socket_path, private_dir, request
+from mdconvert.daemon import DaemonServer
+
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch):
+    """A daemon serving from a thread; yields its socket path"""
+    # The daemon runs requests in the client's directory; restore ours afterwards
+    monkeypatch.chdir(tmp_path)
+    path = str(tmp_path / 'd.sock')
+    server = DaemonServer(path, Options(use_cache=False), idle_timeout=30)
+    server.timeout = 0.1
+    thread = threading.Thread(target=server.serve, daemon=True)
+    thread.start()
+    yield path
+    server.stopping = True
+    thread.join()
+    server.server_close()
+
+
+def _convert(path, cwd, **fields):
+    message = {'command': 'convert', 'cwd': str(cwd), 'patterns': ['*.md'], **fields}
+    return list(request(message, path, autostart=False))
+
+
+def test_ping_and_stop(daemon):
+    (reply,) = request({'command': 'ping'}, daemon, autostart=False)
+    assert reply['ok'] and reply['pid'] == os.getpid() and reply['backend'] == 'python-docx'
+    assert list(request({'command': 'stop'}, daemon, autostart=False)) == [{'ok': True}]
+
+
+def test_convert(daemon, tmp_path, sample_md):
+    replies = _convert(daemon, tmp_path, out_dir='out')
+    assert replies[-1] == {'done': True}
+    (result,) = [reply['result'] for reply in replies if 'result' in reply]
+    assert result['ok'] and result['output'] == os.path.join('out', 'sample.docx')
+    assert os.path.isfile(tmp_path / 'out' / 'sample.docx')
+
+
+def test_backend_per_request(daemon, tmp_path, sample_md):
+    _convert(daemon, tmp_path, backend='ooxml')
+    assert next(request({'command': 'ping'}, daemon, autostart=False))['backend'] == 'ooxml'
+    # A request without a backend goes back to the daemon's own
+    _convert(daemon, tmp_path)
+    assert next(request({'command': 'ping'}, daemon, autostart=False))['backend'] == 'python-docx'
+    assert _convert(daemon, tmp_path, backend='nope') == [{'error': "unknown backend 'nope'"}]
+
+
+def test_errors(daemon, tmp_path):
+    assert _convert(daemon, tmp_path / 'missing')[0]['error']
+    assert list(request({'command': 'dance'}, daemon, autostart=False)) == [{'error': "unknown command 'dance'"}]
+
+
+def test_default_socket_is_private(tmp_path, monkeypatch):
+    monkeypatch.delenv(client.SOCKET_ENV, raising=False)
+    monkeypatch.delenv('XDG_RUNTIME_DIR', raising=False)
+    monkeypatch.setattr(client.tempfile, 'gettempdir', lambda: str(tmp_path))
+    path = default_socket_path()
+    directory = os.path.dirname(path)
+    assert os.path.dirname(directory) == str(tmp_path)
+    assert os.stat(directory).st_mode & 0o777 == 0o700
+
+    os.chmod(directory, 0o777)
+    with pytest.raises(PermissionError):
+        default_socket_path()
+
+
+def test_private_dir_refuses_a_file(tmp_path):
+    (tmp_path / 'taken').write_text('')
+    with pytest.raises(PermissionError):
+        private_dir(str(tmp_path / 'taken'))
+
+
+@pytest.mark.skipif(os.getuid() != 0, reason='needs root to create a file owned by another user')
+def test_socket_of_another_user_is_refused(daemon):
+    os.chown(daemon, 12345, -1)
+    with pytest.raises(PermissionError, match='another user'):
+        list(request({'command': 'ping'}, daemon, autostart=True))
@@ -0,0 +1,67 @@
+import os
+
+import pytest
+from pptx import Presentation
+
+from conftest import REPO
+from mdconvert.deck import DeckTemplate, build_decks, load_spec
+
+SPEC = {
+    'output': '{clinic}.pptx',
+    'slides': [{'content': [
+        {'type': 'text', 'text': 'Report for {clinic}', 'left': 1, 'top': 1, 'width': 8, 'height': 1, 'size': 28},
+        {'type': 'footer', 'text': 'Static footer', 'left': 1, 'top': 6, 'width': 8, 'height': 0.5, 'size': 10},
+    ]}],
+}
+
+
+def _texts(path):
+    return [shape.text_frame.text for slide in Presentation(path).slides for shape in slide.shapes]
+
+
+def test_fields_are_filled_per_recipient(tmp_path):
+    rows = [{'clinic': 'North & East'}, {'clinic': 'South <2>'}]
+    results = build_decks(DeckTemplate(SPEC), rows, tmp_path, workers=1)
+    assert all(result.ok for result in results)
+    assert _texts(tmp_path / 'North & East.pptx') == ['Report for North & East', 'Static footer']
+    assert _texts(tmp_path / 'South <2>.pptx') == ['Report for South <2>', 'Static footer']
+
+
+def test_repo_spec_builds(tmp_path):
+    template = DeckTemplate(load_spec(os.path.join(REPO, 'decks', 'executive.json')), 'executive.json')
+    output = tmp_path / 'executive.pptx'
+    template.write(output)
+    assert len(Presentation(output).slides) == len(template.slides)
+
+
+def test_output_names_stay_in_out_dir(tmp_path):
+    template = DeckTemplate(SPEC)
+    assert template.output_path({'clinic': '../etc/x'}, 1, tmp_path) == os.path.join(tmp_path, '..-etc-x.pptx')
+    with pytest.raises(ValueError, match="field 'clinic'"):
+        template.output_path({'clinic': '..'}, 1, tmp_path)
+
+
+def test_duplicate_outputs_are_refused(tmp_path):
+    with pytest.raises(ValueError, match='Recipients 1 and 3'):
+        DeckTemplate(SPEC).output_paths([{'clinic': 'a'}, {'clinic': 'b'}, {'clinic': 'a'}], tmp_path)
+
+
+@pytest.mark.parametrize('pattern', ['{}.pptx', '{0}.pptx', '{clinic.name}.pptx', '{clinic[0]}.pptx', '{clinic'])
+def test_bad_output_patterns_name_the_spec(pattern):
+    with pytest.raises(ValueError, match='^spec.json: output pattern'):
+        DeckTemplate({**SPEC, 'output': pattern}, 'spec.json')
+
+
+def test_bad_text_placeholders_name_the_spec():
+    spec = {**SPEC, 'slides': [{'content': [{**SPEC['slides'][0]['content'][0], 'text': 'Hello {}'}]}]}
+    with pytest.raises(ValueError, match='^spec.json: text'):
+        DeckTemplate(spec, 'spec.json')
+
+
+def test_missing_fields_name_the_recipient(tmp_path):
+    template = DeckTemplate(SPEC, 'spec.json')
+    with pytest.raises(ValueError, match="^spec.json: recipient 2's output name has no field 'clinic'"):
+        template.output_path({'site': 'x'}, 2)
+    with pytest.raises(ValueError, match="^spec.json: recipient 0 has no field 'clinic'"):
+        template.write(tmp_path / 'out.pptx', {'site': 'x'})
+    assert not os.listdir(tmp_path)
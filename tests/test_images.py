@@ -0,0 +1,76 @@
+import io
+import os
+import zipfile
+
+import docx
+import pytest
+from PIL import Image
+
+from mdconvert import images as images_module, ooxml_render
+from mdconvert.cache import SectionCache, cache_entries
+from mdconvert.images import DocumentImages, ImageCache, ProcessedImage
+from mdconvert.themes import THEMES
+
+THEME = THEMES['executive']
+WIDTH = 9360  # 6.5in of text, in twips
+
+
+def _png(path, size=(64, 32)):
+    Image.new('RGB', size, (200, 30, 30)).save(path, 'PNG')
+    return str(path)
+
+
+def test_images_are_processed_once(tmp_path):
+    _png(tmp_path / 'wide.png', (2000, 100))
+    cache = ImageCache(str(tmp_path / 'cache'))
+    first = DocumentImages(str(tmp_path), WIDTH, 150, cache).resolve('wide.png')
+    assert first.cx == WIDTH * images_module.EMU_PER_TWIP
+    assert Image.open(io.BytesIO(first.data)).size == (975, 49)  # 6.5in at 150 DPI
+
+    fresh = ImageCache(str(tmp_path / 'cache'))
+    again = DocumentImages(str(tmp_path), WIDTH, 150, fresh).resolve('wide.png')
+    assert (again.key, again.data, again.cx, again.cy) == (first.key, first.data, first.cx, first.cy)
+
+
+def test_decompression_bombs_fall_back_to_alt_text(tmp_path, monkeypatch, capsys):
+    _png(tmp_path / 'bomb.png', (200, 200))
+    monkeypatch.setattr(Image, 'MAX_IMAGE_PIXELS', 1000)
+    md = tmp_path / 'doc.md'
+    md.write_text('# Pictures\n\n![the chart](bomb.png)\n', encoding='utf-8')
+
+    assert DocumentImages(str(tmp_path), WIDTH, 150, ImageCache()).resolve('bomb.png') is None
+    ooxml_render.convert_markdown(str(md), str(tmp_path / 'doc.docx'), THEME)
+    assert 'bomb.png' in capsys.readouterr().err
+    with zipfile.ZipFile(tmp_path / 'doc.docx') as archive:
+        assert not [name for name in archive.namelist() if name.startswith('word/media/')]
+    assert any('the chart' in p.text for p in docx.Document(str(tmp_path / 'doc.docx')).paragraphs)
+
+
+def test_failed_store_leaves_no_temp_file(tmp_path, monkeypatch):
+    cache = ImageCache(str(tmp_path / 'cache'))
+
+    def fail(src, dst):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(images_module.os, 'replace', fail)
+    with pytest.raises(OSError):
+        cache._store(ProcessedImage('0' * 16, 'png', b'data', 1, 1))
+    assert os.listdir(cache.directory) == []
+
+
+def test_sections_and_images_share_the_budget(tmp_path):
+    directory = str(tmp_path / 'cache')
+    images = ImageCache(directory, max_bytes=20000)
+    for number in range(30):
+        images._store(ProcessedImage(f'{number:016x}', 'png', os.urandom(1000), 1, 1))
+        # Distinct mtimes, oldest first
+        os.utime(images._path(f'{number:016x}'), (number, number))
+    sections = SectionCache(directory, max_bytes=20000)
+    for number in range(10):
+        sections.put(f'key{number}', os.urandom(1000))
+
+    assert sum(entry.stat().st_size for entry in cache_entries(directory)) <= 20000
+    # The oldest images went first; every section written since is still there
+    assert not os.path.exists(images._path(f'{0:016x}'))
+    assert os.path.exists(images._path(f'{29:016x}'))
+    assert all(sections.get(f'key{number}') is not None for number in range(10))
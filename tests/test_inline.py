@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+from mdconvert.inline import InlineRun, tokenize_inline
+
+
+def _reference(text):
+    """(char, bold, italic, code) per character, by the character-by-character loop the converters used to run"""
+    chars = []
+    i = 0
+    while i < len(text):
+        if text[i:i + 2] in ('**', '__'):
+            end = text.find(text[i:i + 2], i + 2)
+            if end != -1:
+                chars.extend((char, True, False, False) for char in text[i + 2:end])
+                i = end + 2
+                continue
+        if text[i] in '*_' and (i == 0 or text[i - 1] not in '*_'):
+            end = text.find(text[i], i + 1)
+            if end != -1 and (end + 1 >= len(text) or text[end + 1] != text[i]):
+                chars.extend((char, False, True, False) for char in text[i + 1:end])
+                i = end + 1
+                continue
+        if text[i] == '`':
+            end = text.find('`', i + 1)
+            if end != -1:
+                chars.extend((char, False, False, True) for char in text[i + 1:end])
+                i = end + 1
+                continue
+        chars.append((text[i], False, False, False))
+        i += 1
+    return chars
+
+
+def _characters(runs):
+    return [(char, run.bold, run.italic, run.code) for run in runs for char in run.text]
+
+
+@pytest.mark.parametrize('text, runs', [
+    ('plain', [InlineRun('plain')]),
+    ('**b** and *i*', [InlineRun('b', bold=True), InlineRun(' and '), InlineRun('i', italic=True)]),
+    ('__b__ _i_ `c`', [InlineRun('b', bold=True), InlineRun(' '), InlineRun('i', italic=True), InlineRun(' '),
+                       InlineRun('c', code=True)]),
+    ('`**not bold**`', [InlineRun('**not bold**', code=True)]),
+    ('a * b', [InlineRun('a * b')]),
+    ('**b *i* b**', [InlineRun('b *i* b', bold=True)]),
+    ('****', []),
+    ('', []),
+])
+def test_runs(text, runs):
+    assert tokenize_inline(text) == runs
+
+
+def test_plain_text_is_merged():
+    runs = tokenize_inline('a * b _ c ` d')
+    assert runs == [InlineRun('a * b _ c ` d')]
+
+
+def test_matches_reference_formatting():
+    rng = random.Random(2024)
+    alphabet = ['*', '**', '_', '__', '`', 'a', 'b', ' ', 'word']
+    for _ in range(3000):
+        text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 14)))
+        assert _characters(tokenize_inline(text)) == _reference(text), text
+
+
+def test_no_empty_or_adjacent_plain_runs():
+    rng = random.Random(7)
+    for _ in range(500):
+        text = ''.join(rng.choice(['*', '_', '`', 'x', ' ']) for _ in range(20))
+        runs = tokenize_inline(text)
+        assert all(run.text for run in runs)
+        plain = InlineRun('')[1:]
+        assert not any(a[1:] == b[1:] == plain for a, b in zip(runs, runs[1:])), text
@@ -0,0 +1,47 @@
+import pytest
+
+from mdconvert import layout
+
+MISSING = 'No Such Font Family'
+BOX = layout.Box(4 * 914400, 914400)  # 4in x 1in
+
+
+@pytest.fixture(autouse=True)
+def fresh_warning():
+    layout._warn_fallback.cache_clear()
+    yield
+    layout._warn_fallback.cache_clear()
+
+
+def test_fit_scale_shrinks_long_text():
+    short = (layout.paragraph('Quarterly results', 24),)
+    long = (layout.paragraph('Quarterly results for every clinic in the northern region ' * 2, 24),)
+    huge = (layout.paragraph('word ' * 500, 24),)
+    assert layout.fit_scale(short, BOX, MISSING) == 1.0
+    assert layout.MIN_SCALE <= layout.fit_scale(long, BOX, MISSING) < 1.0
+    assert layout.fit_scale(huge, BOX, MISSING) is None
+
+
+def test_scaled_rounds_to_half_points():
+    para, = layout.scaled((layout.paragraph('x', 11),), 0.85)
+    assert para.runs[0].size == 9.5
+
+
+def test_no_warning_when_text_fits(capsys):
+    layout.fit_scale((layout.paragraph('Fits easily', 12),), BOX, MISSING)
+    assert capsys.readouterr().err == ''
+
+
+def test_warns_once_when_shrinking_with_estimates(capsys):
+    for words in (40, 50, 60):
+        layout.fit_scale((layout.paragraph('word ' * words, 24),), BOX, MISSING)
+    assert capsys.readouterr().err.count(f'No font file for {MISSING}') == 1
+
+
+def test_font_file_metrics_are_not_estimates():
+    path = layout._font_files().get('dejavusans')
+    if path is None:
+        pytest.skip('DejaVu Sans is not installed')
+    font = layout.load_font(path)
+    assert not font.fallback
+    assert font.width('W') > font.width('i') > 0
@@ -0,0 +1,88 @@
+import re
+import zipfile
+
+import pytest
+
+from mdconvert import docx_render, ooxml_render
+from mdconvert.inline import InlineRun, tokenize_inline
+from mdconvert.links import MAX_BOOKMARK, bookmark_name, slugify
+from mdconvert.package import DOCUMENT_PART, DOCUMENT_RELS_PART
+from mdconvert.themes import THEMES
+
+THEME = THEMES['cto']
+DOC = """# Guide
+
+- [Setup](#setup)
+- [Setup again](#setup-1)
+- [Q&A: "why?"](#qa-why)
+
+## Setup
+
+See [the site](https://example.com/?a=1&b=2) and [the site again](https://example.com/?a=1&b=2).
+
+## Setup
+
+Also [docs](https://docs.example.com).
+
+## Q&A: "why?"
+
+Back to [the top](#guide).
+"""
+
+
+@pytest.mark.parametrize('text, runs', [
+    ('[site](https://example.com)', [InlineRun('site', link='https://example.com')]),
+    ('see [the **setup**](#setup).', [InlineRun('see '), InlineRun('the ', link='#setup'),
+                                      InlineRun('setup', bold=True, link='#setup'), InlineRun('.')]),
+    ('**[bold link](#a)**', [InlineRun('bold link', bold=True, link='#a')]),
+    ('`[a](b)`', [InlineRun('[a](b)', code=True)]),
+    ('![img](x.png)', [InlineRun('![img](x.png)')]),
+])
+def test_links(text, runs):
+    assert tokenize_inline(text) == runs
+
+
+@pytest.mark.parametrize('heading, slug', [
+    ('Getting Started', 'getting-started'),
+    ('Q&A: "why?"', 'qa-why'),
+    ('  API v2.1 — Notes ', 'api-v21--notes'),
+])
+def test_slugify(heading, slug):
+    assert slugify(heading) == slug
+
+
+def test_bookmark_names_fit_word():
+    assert bookmark_name('getting-started') == '_getting_started'
+    long, unicode = bookmark_name('a' * 60), bookmark_name('überblick')
+    assert len(long) <= MAX_BOOKMARK and len(unicode) <= MAX_BOOKMARK
+    assert re.fullmatch(r'_[a-z0-9_]+', long) and re.fullmatch(r'_[a-z0-9_]+', unicode)
+    assert bookmark_name('a' * 60) != bookmark_name('a' * 61)
+
+
+def _document(path):
+    with zipfile.ZipFile(path) as archive:
+        return archive.read(DOCUMENT_PART).decode('utf-8'), archive.read(DOCUMENT_RELS_PART).decode('utf-8')
+
+
+@pytest.mark.parametrize('convert', [
+    docx_render.convert_markdown,
+    ooxml_render.convert_markdown,
+    lambda md, out, theme: ooxml_render.convert_markdown(md, out, theme, workers=2),
+], ids=['python-docx', 'ooxml', 'parallel'])
+def test_anchor_links_reach_heading_bookmarks(tmp_path, convert):
+    md = tmp_path / 'doc.md'
+    md.write_text(DOC, encoding='utf-8')
+    convert(str(md), str(tmp_path / 'out.docx'), THEME)
+    body, rels = _document(tmp_path / 'out.docx')
+
+    bookmarks = re.findall(r'<w:bookmarkStart w:id="(\d+)" w:name="([^"]*)"/>', body)
+    assert [name for _, name in bookmarks] == ['_guide', '_setup', '_setup_1', '_qa_why']
+    assert len({bookmark_id for bookmark_id, _ in bookmarks}) == len(bookmarks)
+    assert body.count('<w:bookmarkEnd ') == len(bookmarks)
+    anchors = re.findall(r'<w:hyperlink w:anchor="([^"]*)"', body)
+    assert anchors == ['_setup', '_setup_1', '_qa_why', '_guide']
+
+    # One relationship per distinct URL, however many links use it
+    assert re.findall(r'<w:hyperlink r:id="([^"]*)"', body) == ['rIdLink1', 'rIdLink1', 'rIdLink2']
+    assert rels.count('TargetMode="External"') == 2
+    assert 'Target="https://example.com/?a=1&amp;b=2"' in rels
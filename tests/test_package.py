@@ -0,0 +1,75 @@
+import struct
+import zipfile
+
+import docx
+import pytest
+
+from mdconvert import docx_render, ooxml_render, package
+from mdconvert.package import COMPRESSION_PROFILES, DOCUMENT_RELS_PART, PackageZip
+from mdconvert.stream import stream_markdown
+from mdconvert.themes import THEMES
+
+THEME = THEMES['user-manual']
+WRITERS = {
+    'python-docx': docx_render.convert_markdown,
+    'ooxml': ooxml_render.convert_markdown,
+    'parallel': lambda md, out, theme, **kw: ooxml_render.convert_markdown(md, out, theme, workers=2, **kw),
+    'stream': stream_markdown,
+}
+
+
+def _parts(path):
+    with zipfile.ZipFile(path) as archive:
+        assert archive.testzip() is None
+        return {name: archive.read(name) for name in archive.namelist()}
+
+
+def _local_extra(path, name):
+    """The extra field of name's local header"""
+    with zipfile.ZipFile(path) as archive:
+        offset = archive.getinfo(name).header_offset
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        header = f.read(30)
+        name_length, extra_length = struct.unpack('<2H', header[26:])
+        f.seek(name_length, 1)
+        return f.read(extra_length)
+
+
+@pytest.mark.parametrize('compression', sorted(COMPRESSION_PROFILES))
+@pytest.mark.parametrize('writer', sorted(WRITERS))
+def test_profiles_round_trip(sample_md, tmp_path, writer, compression):
+    WRITERS[writer](sample_md, str(tmp_path / 'default.docx'), THEME)
+    WRITERS[writer](sample_md, str(tmp_path / 'other.docx'), THEME, compression=compression)
+    assert _parts(tmp_path / 'other.docx') == _parts(tmp_path / 'default.docx')
+    expected, actual = (docx.Document(str(tmp_path / name)) for name in ('default.docx', 'other.docx'))
+    assert [p.text for p in actual.paragraphs] == [p.text for p in expected.paragraphs]
+
+
+def test_streamed_parts_have_no_zip64_extra(sample_md, tmp_path):
+    stream_markdown(sample_md, str(tmp_path / 'out.docx'), THEME)
+    assert _local_extra(tmp_path / 'out.docx', 'word/document.xml') == b''
+
+
+def test_streamed_part_widened_for_zip64(tmp_path, monkeypatch):
+    monkeypatch.setattr(package, '_ZIP64_LIMIT', 1000)
+    big = bytes(range(256)) * 40
+    with PackageZip(str(tmp_path / 'out.zip'), 'store') as output:
+        output.write_all([('first.xml', b'<a/>')])
+        with output.open('big.bin') as out:
+            out.write(big[:3000])
+            out.write(big[3000:])
+        output.write_all([('last.xml', b'<b/>')])
+    assert _parts(tmp_path / 'out.zip') == {'first.xml': b'<a/>', 'big.bin': big, 'last.xml': b'<b/>'}
+    assert struct.unpack('<HHQQ', _local_extra(tmp_path / 'out.zip', 'big.bin')) == (1, 16, len(big), len(big))
+
+
+def test_relationships_match_python_docx(tmp_path):
+    md = tmp_path / 'links.md'
+    md.write_text('See [a](https://example.com/?a=1&b="2"), [b](https://example.com/x&y) '
+                  'and [a again](https://example.com/?a=1&b="2").\n', encoding='utf-8')
+    docx_render.convert_markdown(str(md), str(tmp_path / 'a.docx'), THEME)
+    ooxml_render.convert_markdown(str(md), str(tmp_path / 'b.docx'), THEME)
+    rels = _parts(tmp_path / 'b.docx')[DOCUMENT_RELS_PART]
+    assert rels == _parts(tmp_path / 'a.docx')[DOCUMENT_RELS_PART]
+    assert rels.count(b'TargetMode="External"') == 2
@@ -0,0 +1,31 @@
+import pytest
+
+from mdconvert import docx_render, ooxml_render
+from mdconvert.cache import SectionCache, cache_entries
+from mdconvert.themes import THEMES
+
+from conftest import REPO_DOCS, repo_doc
+
+
+def _read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+@pytest.mark.parametrize('name', REPO_DOCS)
+@pytest.mark.parametrize('backend', [docx_render, ooxml_render], ids=['python-docx', 'ooxml'])
+def test_parallel_is_byte_identical(tmp_path, backend, name):
+    theme = THEMES['cto']
+    backend.convert_markdown(repo_doc(name), str(tmp_path / 'serial.docx'), theme)
+    backend.convert_markdown(repo_doc(name), str(tmp_path / 'parallel.docx'), theme, workers=2)
+    assert _read(tmp_path / 'parallel.docx') == _read(tmp_path / 'serial.docx')
+
+
+def test_parallel_with_cached_sections(sample_md, tmp_path):
+    theme = THEMES['executive']
+    cache = SectionCache(str(tmp_path / 'cache'))
+    docx_render.convert_markdown(sample_md, str(tmp_path / 'serial.docx'), theme)
+    for output in ('cold.docx', 'warm.docx'):
+        docx_render.convert_markdown(sample_md, str(tmp_path / output), theme, cache=cache, workers=2)
+        assert _read(tmp_path / output) == _read(tmp_path / 'serial.docx')
+    assert cache_entries(cache.directory)
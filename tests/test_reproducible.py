@@ -0,0 +1,37 @@
+import os
+import time
+
+import pytest
+
+from mdconvert import docx_render, ooxml_render
+from mdconvert.deck import build_deck
+from mdconvert.themes import THEMES
+
+from conftest import REPO
+
+THEME = THEMES['executive']
+
+
+def _build_twice(tmp_path, build, suffix):
+    first, second = str(tmp_path / f'first{suffix}'), str(tmp_path / f'second{suffix}')
+    build(first)
+    # Make a timestamp leak show up as a difference
+    time.sleep(2.1)
+    build(second)
+    with open(first, 'rb') as f, open(second, 'rb') as g:
+        assert f.read() == g.read()
+
+
+@pytest.mark.parametrize('build', [
+    lambda md, out: docx_render.convert_markdown(md, out, THEME),
+    lambda md, out: ooxml_render.convert_markdown(md, out, THEME),
+    lambda md, out: ooxml_render.convert_markdown(md, out, THEME, workers=2),
+], ids=['python-docx', 'ooxml', 'parallel'])
+def test_docx_builds_are_byte_identical(sample_md, tmp_path, build):
+    _build_twice(tmp_path, lambda out: build(sample_md, out), '.docx')
+
+
+def test_deck_builds_are_byte_identical(tmp_path):
+    spec = os.path.join(REPO, 'decks', 'executive.json')
+    _build_twice(tmp_path, lambda out: build_deck(spec, out), '.pptx')
+
@@ -0,0 +1,85 @@
+import pytest
+
+from mdconvert import docx_render, ooxml_render
+from mdconvert.blocks import read_blocks
+from mdconvert.search import DocumentIndex, SearchIndex, merge_indexes, read_documents, write_index
+from mdconvert.themes import THEMES
+
+from conftest import REPO_DOCS, repo_doc
+
+
+def _index(md_file):
+    document = DocumentIndex(md_file)
+    document.add(read_blocks(md_file))
+    return document
+
+
+def _postings(document):
+    return {term: list(postings) for term, postings in document.postings.items()}
+
+
+def test_write_read_round_trip(sample_md, tmp_path):
+    document = _index(sample_md)
+    path = str(tmp_path / 'sample.search')
+    document.save(path)
+    with SearchIndex(path) as index:
+        assert index.document_count == 1
+        assert index.section_count == len(document.sections)
+        assert index.term_count == len(document.postings)
+        (restored,) = read_documents(index)
+    assert restored.path == sample_md
+    assert restored.sections == document.sections
+    assert _postings(restored) == _postings(document)
+
+
+def test_merge_round_trip(tmp_path):
+    documents = [_index(repo_doc(name)) for name in REPO_DOCS]
+    paths = []
+    for number, document in enumerate(documents):
+        paths.append(str(tmp_path / f'{number}.search'))
+        document.save(paths[-1])
+    merged = str(tmp_path / 'all.search')
+    merge_indexes(paths, merged)
+    with SearchIndex(merged) as index:
+        assert [index.document(number) for number in range(index.document_count)] == [
+            repo_doc(name) for name in REPO_DOCS]
+        restored = read_documents(index)
+    for expected, actual in zip(documents, restored):
+        assert actual.sections == expected.sections
+        assert _postings(actual) == _postings(expected)
+
+    # Writing what was read gives the same bytes back
+    again = str(tmp_path / 'again.search')
+    write_index(restored, again)
+    with open(merged, 'rb') as f, open(again, 'rb') as g:
+        assert f.read() == g.read()
+
+
+def test_queries(sample_md, tmp_path):
+    path = str(tmp_path / 'sample.search')
+    _index(sample_md).save(path)
+    with SearchIndex(path) as index:
+        (hit,) = index.search('nested item')
+        assert (hit.anchor, hit.title) == ('lists', 'Lists')
+        # The last word matches as a prefix, as when typing
+        assert [hit.title for hit in index.search('closing wor')] == ['Deeper heading']
+        assert index.search('"words closing"') == []
+        assert [hit.title for hit in index.search('"closing words"')] == ['Deeper heading']
+        assert index.search('no-such-term') == []
+        assert index.search('') == []
+        # Text before the first heading is titled with the document's path
+        assert [hit.title for hit in index.search('intro')] == [sample_md]
+
+
+@pytest.mark.parametrize('convert', [
+    lambda md, out, search: docx_render.convert_markdown(md, out, THEMES['cto'], search=search),
+    lambda md, out, search: ooxml_render.convert_markdown(md, out, THEMES['cto'], search=search),
+    lambda md, out, search: ooxml_render.convert_markdown(md, out, THEMES['cto'], workers=2, search=search),
+], ids=['python-docx', 'ooxml', 'parallel'])
+def test_conversion_feeds_the_same_index(tmp_path, convert):
+    md_file = repo_doc('USER_MANUAL.md')
+    document = DocumentIndex(md_file)
+    convert(md_file, str(tmp_path / 'out.docx'), document)
+    expected = _index(md_file)
+    assert document.sections == expected.sections
+    assert _postings(document) == _postings(expected)
@@ -0,0 +1,83 @@
+import time
+
+import pytest
+from pptx import Presentation
+
+from mdconvert.blocks import read_blocks
+from mdconvert.slides import CONTINUED, SLIDE_HEIGHT, SLIDE_WIDTH, SlideRenderer, TextItem, convert_markdown
+from mdconvert.themes import THEMES
+
+from conftest import REPO_DOCS, repo_doc
+
+THEME = THEMES['executive']
+
+
+def _deck(tmp_path, text):
+    md = tmp_path / 'doc.md'
+    md.write_text(text, encoding='utf-8')
+    convert_markdown(str(md), str(tmp_path / 'doc.pptx'), THEME)
+    return list(Presentation(str(tmp_path / 'doc.pptx')).slides)
+
+
+def _title(slide):
+    # Slides use the blank layout; the title is the first text box
+    return slide.shapes[0].text_frame.text
+
+
+def _body_texts(slide):
+    return [p.text for shape in list(slide.shapes)[1:] if shape.has_text_frame for p in shape.text_frame.paragraphs]
+
+
+def test_slide_builds_are_byte_identical(tmp_path):
+    first, second = str(tmp_path / 'first.pptx'), str(tmp_path / 'second.pptx')
+    convert_markdown(repo_doc('EXECUTIVE_SUMMARY.md'), first, THEME)
+    # Make a timestamp leak show up as a difference
+    time.sleep(2.1)
+    convert_markdown(repo_doc('EXECUTIVE_SUMMARY.md'), second, THEME)
+    with open(first, 'rb') as f, open(second, 'rb') as g:
+        assert f.read() == g.read()
+
+
+@pytest.mark.parametrize('name', REPO_DOCS)
+def test_every_shape_stays_on_its_slide(tmp_path, name):
+    output = str(tmp_path / 'deck.pptx')
+    convert_markdown(repo_doc(name), output, THEME)
+    for number, slide in enumerate(Presentation(output).slides, 1):
+        for shape in slide.shapes:
+            assert shape.left + shape.width <= SLIDE_WIDTH, (number, shape.name)
+            assert shape.top + shape.height <= SLIDE_HEIGHT, (number, shape.name)
+
+
+def test_long_sections_continue_without_splitting_paragraphs(tmp_path):
+    paragraphs = [f'Paragraph {n}' + ' with several words of filler text' * 3 for n in range(40)]
+    slides = _deck(tmp_path, '# Deck\n\n## Topic\n\n' + '\n\n'.join(paragraphs) + '\n')
+    titles = [_title(slide) for slide in slides]
+    assert titles[:3] == ['Deck', 'Topic', 'Topic' + CONTINUED] and len(titles) > 3
+    assert set(titles[2:]) == {'Topic' + CONTINUED}
+    assert [text for slide in slides[1:] for text in _body_texts(slide)] == paragraphs
+
+
+def test_tables_split_between_rows_under_their_header(tmp_path):
+    rows = ''.join(f'| row {n} | value {n} |\n' for n in range(60))
+    slides = _deck(tmp_path, '## Data\n\n| Name | Value |\n|------|-------|\n' + rows)
+    tables = [shape.table for slide in slides for shape in slide.shapes if shape.has_table]
+    assert len(tables) > 1
+    seen = []
+    for table in tables:
+        cells = [[cell.text for cell in row.cells] for row in table.rows]
+        assert cells[0] == ['Name', 'Value']
+        seen.extend(cells[1:])
+    assert seen == [[f'row {n}', f'value {n}'] for n in range(60)]
+
+
+def test_headings_are_not_left_at_the_bottom(tmp_path):
+    md = tmp_path / 'doc.md'
+    md.write_text('## Topic\n\n' + ''.join(f'### Part {n}\n\nSome text for part {n}.\n\n' for n in range(30)),
+                  encoding='utf-8')
+    renderer = SlideRenderer(THEME)
+    renderer.render(read_blocks(str(md)))
+    slides = renderer.slides()
+    assert len(slides) > 1
+    for slide in slides[:-1]:
+        last = slide.items[-1]
+        assert not (isinstance(last, TextItem) and last.style == 'heading'), slide.title
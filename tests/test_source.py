@@ -0,0 +1,55 @@
+import pytest
+
+from mdconvert.blocks import read_blocks
+from mdconvert.cache import split_sections
+from mdconvert.source import SourceIndex, parse_span
+
+from conftest import REPO_DOCS, SAMPLE, repo_doc
+
+
+def _write(tmp_path, text, newline='\n'):
+    path = tmp_path / 'doc.md'
+    path.write_bytes(text.replace('\n', newline).encode('utf-8'))
+    return str(path)
+
+
+def _assert_agrees(md_file):
+    blocks = read_blocks(md_file)
+    with SourceIndex(md_file) as index:
+        assert len(index) == len(blocks)
+        assert [token.kind for token in index.tokens()] == [block.kind for block in blocks]
+        assert index.blocks() == blocks
+        sections = split_sections(blocks)
+        assert list(index.sections()) == sections
+        assert [parse_span(md_file, *span) for span in index.section_spans()] == sections
+
+
+@pytest.mark.parametrize('newline', ['\n', '\r\n', '\r'])
+def test_index_matches_read_blocks(tmp_path, newline):
+    _assert_agrees(_write(tmp_path, SAMPLE, newline))
+
+
+@pytest.mark.parametrize('text', [
+    '',
+    '\n',
+    '\n\n# Title\n',
+    '# Only a heading',
+    'no heading\n\nat all\n',
+    '```\nunterminated fence\n# not a heading\n',
+    '# A\n\n\n## B\n\n\n',
+])
+def test_index_matches_read_blocks_edge_cases(tmp_path, text):
+    _assert_agrees(_write(tmp_path, text))
+
+
+@pytest.mark.parametrize('name', REPO_DOCS)
+def test_index_matches_read_blocks_repo_docs(name):
+    _assert_agrees(repo_doc(name))
+
+
+def test_single_section(tmp_path):
+    md_file = _write(tmp_path, SAMPLE)
+    sections = split_sections(read_blocks(md_file))
+    with SourceIndex(md_file) as index:
+        assert index.section(len(sections) - 1) == sections[-1]
+        assert index.section(1) == sections[1]
@@ -0,0 +1,56 @@
+import os
+import zipfile
+
+import pytest
+
+from mdconvert.docx_render import convert_markdown
+from mdconvert.stream import stream_markdown
+from mdconvert.themes import THEMES
+
+from conftest import REPO_DOCS, repo_doc
+
+THEME = THEMES['cto']
+
+
+def _parts(path):
+    with zipfile.ZipFile(path) as archive:
+        return {name: archive.read(name) for name in archive.namelist()}
+
+
+@pytest.mark.parametrize('flush_blocks', [1, 7, 10000])
+def test_stream_matches_python_docx(sample_md, tmp_path, flush_blocks):
+    convert_markdown(sample_md, str(tmp_path / 'a.docx'), THEME)
+    stream_markdown(sample_md, str(tmp_path / 'c.docx'), THEME, flush_blocks=flush_blocks)
+    assert _parts(tmp_path / 'c.docx') == _parts(tmp_path / 'a.docx')
+
+
+@pytest.mark.parametrize('name', REPO_DOCS)
+def test_stream_matches_python_docx_on_repo_docs(tmp_path, name):
+    convert_markdown(repo_doc(name), str(tmp_path / 'a.docx'), THEME)
+    stream_markdown(repo_doc(name), str(tmp_path / 'c.docx'), THEME)
+    assert _parts(tmp_path / 'c.docx') == _parts(tmp_path / 'a.docx')
+
+
+def test_failed_conversion_keeps_previous_output(sample_md, tmp_path):
+    output = str(tmp_path / 'out.docx')
+    stream_markdown(sample_md, output, THEME)
+    with open(output, 'rb') as f:
+        previous = f.read()
+
+    # Invalid UTF-8 well after the first flush, so part of the body is already written
+    bad = tmp_path / 'bad.md'
+    bad.write_bytes(b'# Title\n\n' + b'A paragraph.\n\n' * 5000 + b'\xff broken\n')
+    with pytest.raises(UnicodeDecodeError):
+        stream_markdown(str(bad), output, THEME)
+
+    with open(output, 'rb') as f:
+        assert f.read() == previous
+    assert sorted(os.listdir(tmp_path)) == ['bad.md', 'out.docx', 'sample.md']
+
+
+def test_failed_first_conversion_leaves_nothing(tmp_path):
+    bad = tmp_path / 'bad.md'
+    bad.write_bytes(b'# Title\n\xff\n')
+    with pytest.raises(UnicodeDecodeError):
+        stream_markdown(str(bad), str(tmp_path / 'out.docx'), THEME)
+    assert os.listdir(tmp_path) == ['bad.md']
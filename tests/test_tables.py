@@ -0,0 +1,54 @@
+import docx
+import pytest
+
+from mdconvert import docx_render, ooxml_render
+from mdconvert.blocks import Table, parse_blocks, split_table_row
+from mdconvert.themes import THEMES
+
+TABLE = """| Name | Role | Notes |
+|------|------|-------|
+| Ann | Admin | |
+| Bob |
+| | | |
+| Cy | Nurse | extra | cells |
+|  | Clerk \\| part-time | x |
+"""
+
+
+@pytest.mark.parametrize('line, cells', [
+    ('| a | b |', ['a', 'b']),
+    ('| a | |', ['a', '']),
+    ('|  | b |', ['', 'b']),
+    ('a | b', ['a', 'b']),
+    ('| a \\| b | c |', ['a | b', 'c']),
+    ('| a | b \\|', ['a', 'b |']),
+])
+def test_split_table_row(line, cells):
+    assert split_table_row(line) == cells
+
+
+def test_rows_fit_the_header():
+    (table,) = [block for block in parse_blocks(TABLE) if block.kind == 'table']
+    assert table == Table(['Name', 'Role', 'Notes'], [
+        ['Ann', 'Admin', ''],
+        ['Bob', '', ''],
+        ['Cy', 'Nurse', 'extra'],
+        ['', 'Clerk | part-time', 'x'],
+    ])
+
+
+@pytest.mark.parametrize('convert', [docx_render.convert_markdown, ooxml_render.convert_markdown],
+                         ids=['python-docx', 'ooxml'])
+def test_rendered_cells_stay_in_their_columns(tmp_path, convert):
+    md_file = tmp_path / 'table.md'
+    md_file.write_text(TABLE, encoding='utf-8')
+    convert(str(md_file), str(tmp_path / 'table.docx'), THEMES['cto'])
+    (table,) = docx.Document(str(tmp_path / 'table.docx')).tables
+    assert [[cell.text for cell in row.cells] for row in table.rows] == [
+        ['Name', 'Role', 'Notes'],
+        ['Ann', 'Admin', ''],
+        ['Bob', '', ''],
+        ['Cy', 'Nurse', 'extra'],
+        ['', 'Clerk | part-time', 'x'],
+    ]
+    assert table.style.name == 'Markdown Table'
@@ -0,0 +1,80 @@
+import re
+import zipfile
+
+from pptx import Presentation
+
+from mdconvert.blocks import read_blocks
+from mdconvert.html_render import write_html
+from mdconvert.links import bookmark_name
+from mdconvert.outline import write_outline
+from mdconvert.package import DOCUMENT_PART
+from mdconvert.targets import convert_targets, output_paths
+from mdconvert.themes import THEMES
+
+from conftest import repo_doc
+
+THEME = THEMES['executive']
+DOC = """# Release <Notes>
+
+Shipped in **March**.
+
+## Changes
+
+- first & foremost
+  - nested [link](https://example.com/?a=1&b=2)
+1. numbered
+
+| Area | State |
+|------|-------|
+| API | done |
+
+## Changes
+
+> A *quote* back to [the top](#release-notes).
+"""
+
+
+def _doc(tmp_path):
+    md = tmp_path / 'notes.md'
+    md.write_text(DOC, encoding='utf-8')
+    return str(md)
+
+
+def test_html_page(tmp_path):
+    write_html(read_blocks(_doc(tmp_path)), str(tmp_path / 'notes.html'), THEME)
+    html = (tmp_path / 'notes.html').read_text(encoding='utf-8')
+    assert '<title>Release &lt;Notes&gt;</title>' in html
+    assert re.findall(r'<h\d id="([^"]*)"', html) == ['release-notes', 'changes', 'changes-1']
+    assert ('<ul><li>first &amp; foremost<ul><li>nested <a href="https://example.com/?a=1&amp;b=2">link</a>'
+            '</li></ul></li></ul>') in html
+    assert '<ol><li>numbered</li></ol>' in html
+    assert '<td>API</td><td>done</td>' in html
+    assert '<blockquote><p>A <em>quote</em> back to <a href="#release-notes">the top</a>.</p></blockquote>' in html
+
+
+def test_outline_slides(tmp_path):
+    write_outline(read_blocks(_doc(tmp_path)), str(tmp_path / 'notes.pptx'), THEME)
+    slides = list(Presentation(str(tmp_path / 'notes.pptx')).slides)
+    assert [slide.shapes.title.text for slide in slides] == ['Release <Notes>', 'Changes', 'Changes']
+    assert slides[0].placeholders[1].text_frame.text == 'Shipped in March.'
+    bullets = [(p.level, ''.join(run.text for run in p.runs)) for p in slides[1].placeholders[1].text_frame.paragraphs]
+    assert bullets == [(0, 'first & foremost'), (1, 'nested link'), (0, 'numbered'), (0, 'API — done')]
+    link = next(run for p in slides[1].placeholders[1].text_frame.paragraphs for run in p.runs if run.text == 'link')
+    assert link.hyperlink.address == 'https://example.com/?a=1&b=2'
+
+
+def test_every_format_from_one_parse(tmp_path):
+    md = repo_doc('EXECUTIVE_SUMMARY.md')
+    outputs = output_paths(md, ['docx', 'html', 'pptx'], str(tmp_path))
+    results = convert_targets(md, outputs, 'executive', workers=2)
+    assert [result.ok for result in results] == [True, True, True], [result.error for result in results]
+    assert [result.output for result in results] == list(outputs.values())
+
+    # HTML heading ids are the slugs the Word bookmarks are named after
+    html = open(outputs['html'], encoding='utf-8').read()
+    with zipfile.ZipFile(outputs['docx']) as archive:
+        body = archive.read(DOCUMENT_PART).decode('utf-8')
+    ids = re.findall(r'<h\d id="([^"]*)"', html)
+    bookmarks = re.findall(r'<w:bookmarkStart w:id="\d+" w:name="([^"]*)"', body)
+    assert ids and [bookmark_name(slug) for slug in ids] == bookmarks
+    assert len(Presentation(outputs['pptx']).slides) > 1
@@ -0,0 +1,28 @@
+import io
+
+import docx
+
+from mdconvert.package import save_document
+from mdconvert.template import load_template
+from mdconvert.themes import THEMES
+
+
+def test_clones_are_independent():
+    base = load_template(THEMES['cto'])
+    first, second = base.document(), base.document()
+    first.add_paragraph('only in the first', style='Heading 1')
+    first.part.relate_to('https://example.com', 'http://schemas.openxmlformats.org/officeDocument/2006/'
+                         'relationships/hyperlink', is_external=True)
+    assert [p.text for p in first.paragraphs][-1] == 'only in the first'
+    assert 'only in the first' not in [p.text for p in second.paragraphs]
+    assert len(second.part.rels) == len(base.document().part.rels) < len(first.part.rels)
+    assert first.part.package is not second.part.package
+
+
+def test_clone_saves_like_the_template():
+    base = load_template(THEMES['executive'])
+    buffer = io.BytesIO()
+    save_document(base.document(), buffer)
+    doc = docx.Document(io.BytesIO(buffer.getvalue()))
+    assert doc.sections[0].left_margin == base.document().sections[0].left_margin
+    assert {style.style_id for style in doc.styles} >= set(base.style_ids.values())
@@ -0,0 +1,58 @@
+import os
+
+import pytest
+
+from mdconvert.batch import Options, init_worker
+from mdconvert.watch import Watcher
+
+
+@pytest.fixture
+def watcher(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for name in ('a.md', 'b.md'):
+        (tmp_path / name).write_text(f'# {name}\n\nText.\n', encoding='utf-8')
+    init_worker(Options(use_cache=False))
+    watcher = Watcher(['*.md'], out_dir='out')
+    watcher.rescan()
+    return watcher
+
+
+def _touch(path, text, offset):
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(text)
+    # A later mtime than any output written so far, whatever the clock's resolution
+    stamp = os.stat(path).st_mtime + offset
+    os.utime(path, (stamp, stamp))
+
+
+def test_missing_outputs_are_stale(watcher):
+    assert sorted(watcher.stale()) == ['a.md', 'b.md']
+    results = watcher.build(watcher.stale())
+    assert all(result.ok for result in results)
+    assert watcher.stale() == []
+    assert watcher.poll(debounce=0) == []
+
+
+def test_only_the_saved_source_is_rebuilt(watcher):
+    watcher.build(watcher.stale())
+    _touch('a.md', '\nMore.\n', 10)
+    assert watcher.stale() == ['a.md']
+    settled = watcher.poll(debounce=0)
+    assert settled == ['a.md']
+    (result,) = watcher.build(settled)
+    assert result.ok and result.input == 'a.md'
+    assert watcher.poll(debounce=0) == []
+
+
+def test_changes_wait_for_the_debounce(watcher):
+    _touch('b.md', '\nMore.\n', 10)
+    assert watcher.poll(debounce=60) == []
+    assert 'b.md' in watcher.pending
+    assert watcher.poll(debounce=0) == ['b.md']
+
+
+def test_rescan_picks_up_new_files(watcher, tmp_path):
+    (tmp_path / 'c.md').write_text('# C\n', encoding='utf-8')
+    watcher.rescan()
+    assert 'c.md' in watcher.jobs
+    assert 'c.md' in watcher.stale()